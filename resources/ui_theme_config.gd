@@ -62,18 +62,16 @@ static func load_theme() -> UiThemeConfig:
 	return UiThemeConfig.new()
 
 
-## [自定义] 返回模态面板用的 StyleBoxTexture（程序生成纹理），供暂停、设置、结算等界面复用。
+## [自定义] 返回模态面板用的 StyleBoxTexture（预烘焙图集或程序生成纹理），供暂停、设置、结算等界面复用。
 ## 边框色与背景色一致，无白边。
 func get_modal_panel_stylebox() -> StyleBox:
-	var tex := VisualAssetRegistry.make_panel_frame_texture(
+	var style := VisualAssetRegistry.make_panel_frame_stylebox(
 		Vector2i(64, 64),
 		modal_panel_bg,
 		modal_panel_bg,
 		2,
 		8
 	)
-	var style := StyleBoxTexture.new()
-	style.texture = tex
 	style.expand_margin_left = stylebox_expand_margin
 	style.expand_margin_right = stylebox_expand_margin
 	style.expand_margin_top = stylebox_expand_margin
@@ -88,15 +86,13 @@ func get_scaled_font_size(base_size: int) -> int:
 
 ## [自定义] 返回指定背景色的面板 StyleBoxTexture，供背包 ContentPanel/DetailPanel 等区分使用。
 func get_panel_stylebox_for_bg(bg_color: Color) -> StyleBox:
-	var tex := VisualAssetRegistry.make_panel_frame_texture(
+	var style := VisualAssetRegistry.make_panel_frame_stylebox(
 		Vector2i(64, 64),
 		bg_color,
 		modal_panel_border,
 		2,
 		8
 	)
-	var style := StyleBoxTexture.new()
-	style.texture = tex
 	style.expand_margin_left = stylebox_expand_margin
 	style.expand_margin_right = stylebox_expand_margin
 	style.expand_margin_top = stylebox_expand_margin
@@ -106,15 +102,13 @@ func get_panel_stylebox_for_bg(bg_color: Color) -> StyleBox:
 
 ## [自定义] 返回无可见边框的面板 StyleBox（边框色与背景色一致），供背包等去除白边使用。
 func get_panel_stylebox_borderless(bg_color: Color) -> StyleBox:
-	var tex := VisualAssetRegistry.make_panel_frame_texture(
+	var style := VisualAssetRegistry.make_panel_frame_stylebox(
 		Vector2i(64, 64),
 		bg_color,
 		bg_color,
 		2,
 		8
 	)
-	var style := StyleBoxTexture.new()
-	style.texture = tex
 	style.expand_margin_left = stylebox_expand_margin
 	style.expand_margin_right = stylebox_expand_margin
 	style.expand_margin_top = stylebox_expand_margin
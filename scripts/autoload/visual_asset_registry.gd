@@ -1,39 +1,271 @@
 extends Node
 
-# 视觉资源工具：纯色贴图、面板框纹理生成、纹理路径缓存。
+# 视觉资源工具：纯色贴图、面板框纹理（优先取 ui_bake.py 预烘焙图集）、纹理路径缓存。
 # 纹理路径、地形色块等已解耦至各实现类/场景独立配置。
 
 var _texture_cache: Dictionary = {}  # path -> Texture2D，避免重复 load
-var _color_texture_cache: Dictionary = {}  # "r,g,b,a:w:h" -> Texture2D，占位图复用
+var _color_texture_cache: Dictionary = {}  # "r,g,b,a:WxH" -> Texture2D，占位图复用
+var _panel_texture_cache: Dictionary = {}  # 面板框键 -> Texture2D，运行时生成的面板框复用
+
+## UI 预烘焙图集（scripts/tools/ui_bake.py 生成）：主题用到的面板框与纯色占位图画在一张图集中，
+## 索引按与 make_color_texture 相同的 "r,g,b,a:WxH" 键（面板框为 "背景/边框/边框宽:WxH"）给出区域。
+const UI_BAKED_INDEX_PATH := "res://assets/ui_baked/ui_baked.json"
+var _ui_baked_index: Dictionary = {}
+var _ui_baked_atlas: Texture2D = null
+var _ui_baked_loaded: bool = false
+
+## 多尺寸派生图索引（scripts/tools/asset_pipeline.py 的 variants 阶段生成）：源路径 -> {"WxH": 派生图路径}
+const VARIANTS_INDEX_PATH := "res://assets/variants/index.json"
+var _variants_index: Dictionary = {}
+var _variants_loaded: bool = false
+
+## 资源索引（scripts/tools/asset_pipeline.py index 生成）：res 路径 -> {size, sha256, alpha_bbox, atlas?, trim?, frames?}
+## 存在时 assets/ 下 PNG 是否存在由索引 O(1) 判断，不再逐个 ResourceLoader.exists 探测。
+const ASSET_INDEX_PATH := "res://assets/asset_index.json"
+var _asset_index: Dictionary = {}
+var _asset_index_loaded: bool = false
+var _pending_loads: Dictionary = {}  # path -> true，已提交后台线程加载、尚未取回
+var _index_current: Dictionary = {}  # path -> bool，索引条目是否仍描述磁盘上的文件（加载时判定一次）
 
 ## 按路径缓存加载纹理，避免同一 icon 重复 load 阻塞主线程。
+## 已通过 preload_textures 提交后台加载的路径直接取回结果。
+## 经 trim 阶段裁边的 PNG 包一层带 margin 的 AtlasTexture，尺寸与摆放同裁边前。
+## 已打入图集（pack_atlas.py）的小图返回指向图集区域的 AtlasTexture，同组共用一张 GPU 纹理。
 func get_texture_cached(path: String) -> Texture2D:
 	if path.is_empty():
 		return null
 	if _texture_cache.has(path):
 		return _texture_cache[path]
-	if not ResourceLoader.exists(path):
+	if not has_asset(path):
 		return null
-	var tex := load(path) as Texture2D
+	var tex: Texture2D = _atlas_texture(path)
+	if tex != null:
+		_texture_cache[path] = tex
+		return tex
+	if _pending_loads.has(path):
+		_pending_loads.erase(path)
+		tex = ResourceLoader.load_threaded_get(path) as Texture2D
+	else:
+		tex = load(path) as Texture2D
 	if tex != null:
+		_index_current[path] = _matches_index(path, tex)
+		if _index_current[path]:
+			tex = _restore_trim(tex, get_asset_info(path).get("trim", {}))
 		_texture_cache[path] = tex
 	return tex
 
 
+## 资源索引中的图集区域（pack_atlas.py 区域表经 index 并入）：AtlasTexture 指向图集，margin 补回裁边；
+## 无记录、图集缺失或编辑器中源 PNG 已在索引之后改动时返回 null，由调用方加载原图。
+func _atlas_texture(path: String) -> Texture2D:
+	var info := get_asset_info(path)
+	var entry = info.get("atlas", {})
+	if typeof(entry) != TYPE_DICTIONARY or entry.is_empty():
+		return null
+	if OS.has_feature("editor") and FileAccess.file_exists(path) and FileAccess.get_sha256(path) != str(info.get("sha256", "")):
+		return null
+	var region: Array = entry.get("region", [])
+	var atlas := get_texture_cached(str(entry.get("atlas", "")))
+	if atlas == null or region.size() != 4:
+		return null
+	var tex := AtlasTexture.new()
+	tex.atlas = atlas
+	tex.region = Rect2(region[0], region[1], region[2], region[3])
+	var margin: Array = entry.get("margin", [])
+	if margin.size() == 4:
+		tex.margin = Rect2(margin[0], margin[1], margin[2], margin[3])
+	tex.filter_clip = true
+	return tex
+
+
+## 索引条目是否仍对应当前文件：trim / compact 之后又重新导出的 PNG 尺寸与哈希都会变，其 trim、frames 记录随之失效。
+## 编辑器中比对文件 sha256；导出版本中原 PNG 不随包发布，退而比对纹理尺寸与索引中的 size。
+func _matches_index(path: String, tex: Texture2D) -> bool:
+	var info := get_asset_info(path)
+	if info.is_empty():
+		return false
+	if OS.has_feature("editor") and FileAccess.file_exists(path):
+		return FileAccess.get_sha256(path) == str(info.get("sha256", ""))
+	var size: Array = info.get("size", [])
+	return size.size() == 2 and Vector2i(tex.get_size()) == Vector2i(int(size[0]), int(size[1]))
+
+
+## trim 记录 {source_size, offset}：margin 补回被裁掉的透明边，只绘制裁边后的像素。
+func _restore_trim(tex: Texture2D, trim: Dictionary) -> Texture2D:
+	var source_size: Array = trim.get("source_size", [])
+	var offset: Array = trim.get("offset", [])
+	if source_size.size() != 2 or offset.size() != 2:
+		return tex
+	var size := tex.get_size()
+	var restored := AtlasTexture.new()
+	restored.atlas = tex
+	restored.region = Rect2(Vector2.ZERO, size)
+	restored.margin = Rect2(offset[0], offset[1], source_size[0] - size.x, source_size[1] - size.y)
+	return restored
+
+
+## 路径是否存在：assets/ 下的 PNG 查资源索引（无索引时回退 ResourceLoader.exists），其余路径直接探测。
+func has_asset(path: String) -> bool:
+	_ensure_asset_index()
+	if not _asset_index.is_empty() and path.begins_with("res://assets/") and path.ends_with(".png"):
+		if _asset_index.has(path):
+			return true
+		# 编辑器中新增 PNG 后未重新生成索引时仍可加载，并提示重新运行 index
+		if OS.has_feature("editor") and ResourceLoader.exists(path):
+			push_warning("资源索引未包含 %s，请运行 python scripts/tools/asset_pipeline.py index" % path)
+			return true
+		return false
+	return ResourceLoader.exists(path)
+
+
+## 资源索引条目（size、sha256、alpha_bbox，打入图集的还有 atlas，裁过边的还有 trim，帧去重过的精灵图还有 frames）；不在索引中返回空字典。
+func get_asset_info(path: String) -> Dictionary:
+	_ensure_asset_index()
+	return _asset_index.get(path, {})
+
+
+## 精灵图帧表（asset_pipeline.py compact 阶段）：{frame_size, frames[状态行][方向列] -> 横条中的帧序号}；未压缩的精灵图返回空字典。
+func get_sheet_frames(path: String) -> Dictionary:
+	if not _index_current.has(path) and get_texture_cached(path) == null:
+		return {}
+	# 精灵图在 compact 之后被导出脚本重写回网格时帧表已过期，按网格取帧
+	if not _index_current.get(path, false):
+		return {}
+	var frames = get_asset_info(path).get("frames", {})
+	return frames if typeof(frames) == TYPE_DICTIONARY else {}
+
+
+## 精灵图中 (方向列, 状态行) 的帧区域：有帧表时取横条中的唯一帧，否则按 frame_size 网格计算。
+## frames 为 get_sheet_frames 的结果，由调用方在设置纹理时取一次，逐帧更新时不再查索引。
+func get_sheet_region(frames: Dictionary, direction: int, state: int, frame_size: Vector2i) -> Rect2:
+	var table: Array = frames.get("frames", [])
+	if state < table.size() and direction < (table[state] as Array).size():
+		var size: Array = frames.get("frame_size", [frame_size.x, frame_size.y])
+		return Rect2(int(table[state][direction]) * int(size[0]), 0, int(size[0]), int(size[1]))
+	return Rect2(direction * frame_size.x, state * frame_size.y, frame_size.x, frame_size.y)
+
+
+## 索引中以 prefix 开头的全部 PNG 路径，如 "res://assets/enemies/"，用于按目录批量预加载。
+func get_indexed_paths(prefix: String) -> Array:
+	_ensure_asset_index()
+	var result: Array = []
+	for path in _asset_index.keys():
+		if str(path).begins_with(prefix):
+			result.append(path)
+	return result
+
+
+## 批量提交后台线程加载（ResourceLoader.load_threaded_request），之后 get_texture_cached 直接取回，
+## 避免波次生成时在主线程同步 load。不存在或已缓存的路径忽略。
+func preload_textures(paths: Array) -> void:
+	for p in paths:
+		var path := str(p)
+		if _texture_cache.has(path) or _pending_loads.has(path) or not has_asset(path):
+			continue
+		if ResourceLoader.load_threaded_request(path, "Texture2D") == OK:
+			_pending_loads[path] = true
+
+
+func _ensure_asset_index() -> void:
+	if _asset_index_loaded:
+		return
+	_asset_index_loaded = true
+	var data := _load_json_dict(ASSET_INDEX_PATH)
+	var assets = data.get("assets", {})
+	if typeof(assets) == TYPE_DICTIONARY:
+		_asset_index = assets
+
+
+## 按显示尺寸取纹理：从派生图索引中选长边不小于 target_px 的最小版本，避免 UI 每帧缩放大图。
+## 无索引或无合适派生图时返回原图（行为同 get_texture_cached）。
+func get_texture_for_size(path: String, target_px: int) -> Texture2D:
+	return get_texture_cached(_pick_variant(path, target_px))
+
+
+func _pick_variant(path: String, target_px: int) -> String:
+	_ensure_variants_index()
+	var entries: Dictionary = _variants_index.get(path, {})
+	var best := path
+	var best_edge := 0
+	for key in entries.keys():
+		var parts := str(key).split("x")
+		if parts.size() != 2:
+			continue
+		var edge := maxi(int(parts[0]), int(parts[1]))
+		if edge >= target_px and (best_edge == 0 or edge < best_edge):
+			best = str(entries[key])
+			best_edge = edge
+	return best
+
+
+func _ensure_variants_index() -> void:
+	if _variants_loaded:
+		return
+	_variants_loaded = true
+	_variants_index = _load_json_dict(VARIANTS_INDEX_PATH)
+
+
+func _load_json_dict(path: String) -> Dictionary:
+	if not FileAccess.file_exists(path):
+		return {}
+	var file := FileAccess.open(path, FileAccess.READ)
+	if file == null:
+		return {}
+	var parsed = JSON.parse_string(file.get_as_text())
+	if typeof(parsed) != TYPE_DICTIONARY:
+		return {}
+	return parsed
+
+
+func _ensure_ui_baked() -> void:
+	if _ui_baked_loaded:
+		return
+	_ui_baked_loaded = true
+	var data := _load_json_dict(UI_BAKED_INDEX_PATH)
+	if data.is_empty():
+		return
+	_ui_baked_atlas = get_texture_cached(str(data.get("atlas", "")))
+	if _ui_baked_atlas != null:
+		_ui_baked_index = data
+
+
+## 预烘焙图集中 kind（"swatches" / "panels"）下 key 的区域；未烘焙时返回空 Rect2。
+func _ui_baked_region(kind: String, key: String) -> Rect2:
+	_ensure_ui_baked()
+	var table: Dictionary = _ui_baked_index.get(kind, {})
+	var rect: Array = table.get(key, [])
+	if rect.size() != 4:
+		return Rect2()
+	return Rect2(rect[0], rect[1], rect[2], rect[3])
+
+
+func _color_key(color: Color) -> String:
+	return "%d,%d,%d,%d" % [int(color.r * 255), int(color.g * 255), int(color.b * 255), int(color.a * 255)]
+
+
 ## 生成指定颜色与尺寸的纯色贴图，用于图标/占位符回退。同色同尺寸复用缓存。
+## 预烘焙图集中有该键时返回指向图集区域的 AtlasTexture，不再新建 Image。
 func make_color_texture(color: Color, size: Vector2i = Vector2i(24, 24)) -> Texture2D:
-	var key := "%d,%d,%d,%d:%dx%d" % [int(color.r * 255), int(color.g * 255), int(color.b * 255), int(color.a * 255), size.x, size.y]
+	var key := "%s:%dx%d" % [_color_key(color), size.x, size.y]
 	if _color_texture_cache.has(key):
 		return _color_texture_cache[key]
-	var img := Image.create(maxi(1, size.x), maxi(1, size.y), false, Image.FORMAT_RGBA8)
-	img.fill(color)
-	var tex := ImageTexture.create_from_image(img)
+	var tex: Texture2D = null
+	var region := _ui_baked_region("swatches", key)
+	if region.has_area():
+		var atlas_tex := AtlasTexture.new()
+		atlas_tex.atlas = _ui_baked_atlas
+		atlas_tex.region = region
+		tex = atlas_tex
+	else:
+		var img := Image.create(maxi(1, size.x), maxi(1, size.y), false, Image.FORMAT_RGBA8)
+		img.fill(color)
+		tex = ImageTexture.create_from_image(img)
 	_color_texture_cache[key] = tex
 	return tex
 
 
 ## 生成可拉伸的面板框纹理（九宫格用），配合 StyleBoxTexture 的 expand_margin 使用。
-## 绘制圆角矩形边框与填充，返回 ImageTexture。
+## 绘制矩形边框与填充（整块 fill + 内部 fill_rect），同参数复用缓存，返回 ImageTexture。
 func make_panel_frame_texture(
 	size: Vector2i = Vector2i(48, 48),
 	bg_color: Color = Color(0.08, 0.09, 0.12, 0.85),
@@ -43,13 +275,42 @@ func make_panel_frame_texture(
 ) -> Texture2D:
 	var w := maxi(32, size.x)
 	var h := maxi(32, size.y)
+	var bw := mini(border_width, int(mini(w, h) / 2.0))
+	var key := _panel_key(bg_color, border_color, bw, w, h)
+	if _panel_texture_cache.has(key):
+		return _panel_texture_cache[key]
 	var img := Image.create(w, h, false, Image.FORMAT_RGBA8)
+	# 先整块填边框色，再填内部背景（九宫格拉伸时边角保持，中间拉伸）
+	img.fill(border_color if bw > 0 else bg_color)
+	if bw > 0 and w > bw * 2 and h > bw * 2:
+		img.fill_rect(Rect2i(bw, bw, w - bw * 2, h - bw * 2), bg_color)
+	var tex := ImageTexture.create_from_image(img)
+	_panel_texture_cache[key] = tex
+	return tex
+
+
+## 面板框 StyleBoxTexture：预烘焙图集中有该面板时直接以图集 + region_rect 绘制，否则用 make_panel_frame_texture。
+## （StyleBoxTexture 按纹理 RID 绘制九宫格，不识别 AtlasTexture 的区域，因此用 region_rect 指定。）
+## 调用方按需再设置 expand_margin / content_margin。
+func make_panel_frame_stylebox(
+	size: Vector2i = Vector2i(48, 48),
+	bg_color: Color = Color(0.08, 0.09, 0.12, 0.85),
+	border_color: Color = Color(0.25, 0.26, 0.30, 1.0),
+	border_width: int = 2,
+	corner_radius: int = 6
+) -> StyleBoxTexture:
+	var w := maxi(32, size.x)
+	var h := maxi(32, size.y)
 	var bw := mini(border_width, int(mini(w, h) / 2.0))
-	# 先填充背景色
-	img.fill(bg_color)
-	# 绘制矩形边框（九宫格拉伸时边角保持，中间拉伸）
-	for y in range(h):
-		for x in range(w):
-			if x < bw or x >= w - bw or y < bw or y >= h - bw:
-				img.set_pixel(x, y, border_color)
-	return ImageTexture.create_from_image(img)
+	var style := StyleBoxTexture.new()
+	var region := _ui_baked_region("panels", _panel_key(bg_color, border_color, bw, w, h))
+	if region.has_area():
+		style.texture = _ui_baked_atlas
+		style.region_rect = region
+	else:
+		style.texture = make_panel_frame_texture(size, bg_color, border_color, border_width, corner_radius)
+	return style
+
+
+func _panel_key(bg_color: Color, border_color: Color, border_width: int, w: int, h: int) -> String:
+	return "%s/%s/%d:%dx%d" % [_color_key(bg_color), _color_key(border_color), border_width, w, h]
@@ -53,12 +53,12 @@ func _apply_collision_radius() -> void:
 		(collision_shape.shape as CircleShape2D).radius = collision_radius
 
 
-## [自定义] 设置子弹外观。动态加载：texture_path 来自 @export，ResourceLoader.exists 校验后 load()，失败则 PixelGenerator。
+## [自定义] 设置子弹外观。texture_path 来自 @export，经 VisualAssetRegistry 缓存与资源索引加载（打入图集时取图集区域），失败则 PixelGenerator。
 func _apply_bullet_appearance() -> void:
 	# 优先 texture_path，空则按 bullet_type/hit_player 回退 PixelGenerator。
 	var tex: Texture2D = null
-	if texture_path != "" and ResourceLoader.exists(texture_path):
-		tex = load(texture_path) as Texture2D
+	if texture_path != "":
+		tex = VisualAssetRegistry.get_texture_cached(texture_path)
 	if tex != null:
 		sprite.texture = tex
 		sprite.modulate = bullet_color if bullet_type != "" else Color.WHITE
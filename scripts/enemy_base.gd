@@ -26,6 +26,7 @@ const ELEMENT_AMOUNT_HUGE := 20
 @export var frame_size: Vector2i = Vector2i(18, 18)  # 每帧像素尺寸
 @export var sheet_columns: int = 8  # 精灵图列数（8 方向）
 @export var sheet_rows: int = 3  # 精灵图行数（站立、行走1、行走2）
+var _sheet_frames: Dictionary = {}  # 帧去重后的精灵图帧表（VisualAssetRegistry.get_sheet_frames），空则按网格取帧
 # 敌人类型：0=melee, 1=ranged, 2=tank, 3=boss, 4=aquatic, 5=dasher，用于死亡动画与 PixelGenerator 回退
 @export var enemy_type: int = 0
 # 敌人 id（如 slime、elite_goblin）：若设置则从 EnemyDefs 加载数值并用 generate_enemy_sprite_by_id 生成纹理
@@ -148,19 +149,20 @@ func set_player(node: Node2D) -> void:
 
 
 func set_enemy_texture(type_hint: int = -1) -> void:
-	# 优先 texture_sheet，失败则 texture_single；enemy_id 非空时用 generate_enemy_sprite_by_id；否则回退 PixelGenerator(enemy_type)。
+	# 优先 texture_sheet，失败则 texture_single（经 VisualAssetRegistry 缓存与资源索引，无逐次探测）；enemy_id 非空时用 generate_enemy_sprite_by_id；否则回退 PixelGenerator(enemy_type)。
 	if not sprite:
 		return
 	var tex: Texture2D = null
-	if texture_sheet != "" and ResourceLoader.exists(texture_sheet):
-		tex = load(texture_sheet) as Texture2D
+	if texture_sheet != "":
+		tex = VisualAssetRegistry.get_texture_cached(texture_sheet)
 	if tex != null:
 		sprite.texture = tex
 		sprite.region_enabled = true
-		sprite.region_rect = Rect2(0, 0, frame_size.x, frame_size.y)
+		_sheet_frames = VisualAssetRegistry.get_sheet_frames(texture_sheet)
+		sprite.region_rect = VisualAssetRegistry.get_sheet_region(_sheet_frames, 0, 0, frame_size)
 		return
-	if texture_single != "" and ResourceLoader.exists(texture_single):
-		tex = load(texture_single) as Texture2D
+	if texture_single != "":
+		tex = VisualAssetRegistry.get_texture_cached(texture_single)
 	if tex != null:
 		sprite.texture = tex
 		sprite.region_enabled = false
@@ -176,8 +178,6 @@ func _update_direction_sprite() -> void:
 	# 8 方向 x 3 行（站立、行走帧1、行走帧2）：根据 velocity 与时间切换，实现肉眼可见的行走动画。
 	if not sprite or not sprite.region_enabled:
 		return
-	var frame_w := frame_size.x
-	var frame_h := frame_size.y
 	if velocity.length_squared() > 16.0:
 		var angle := velocity.angle()
 		_last_direction_index = wrapi(roundi((angle + PI) / (PI / 4.0)), 0, 8)
@@ -185,7 +185,7 @@ func _update_direction_sprite() -> void:
 	var row := 0
 	if velocity.length_squared() > 16.0:
 		row = 1 + (int(Time.get_ticks_msec() / 150.0) % 2)
-	sprite.region_rect = Rect2(_last_direction_index * frame_w, row * frame_h, frame_w, frame_h)
+	sprite.region_rect = VisualAssetRegistry.get_sheet_region(_sheet_frames, _last_direction_index, row, frame_size)
 
 
 func apply_knockback(dir: Vector2, force: float) -> void:
@@ -531,7 +531,7 @@ func _get_element_icon_texture(element_key: String) -> Texture2D:
 			path = "res://assets/magic/icon_physical.png"
 		_:
 			return VisualAssetRegistry.make_color_texture(Color(0.7, 0.7, 0.7, 1.0), Vector2i(4, 4))
-	if path != "" and ResourceLoader.exists(path):
+	if path != "":
 		var tex := VisualAssetRegistry.get_texture_cached(path)
 		if tex != null:
 			return tex
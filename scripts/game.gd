@@ -69,6 +69,18 @@ const TERRAIN_TILE_SHALLOW_WATER := 3
 const TERRAIN_TILE_DEEP_WATER := 4
 const TERRAIN_TILE_OBSTACLE := 5
 const TERRAIN_TILE_BOUNDARY := 6
+# 程序化地形图集（scripts/tools/terrain_gen.py 生成）：地板噪声变体 + 草/水 blob 自动拼接瓦片，缺失时沿用上面的 7 块图集
+const BIOME_INDEX_PATH := "res://assets/terrain/biome_atlas.json"
+const BIOME_SOURCE_ID := 1
+const BIOME_FLOOR_NAMES := ["flat", "seaside", "mountain"]  # 下标同 TERRAIN_FLOOR_ROW_*
+# blob 掩码第 i 位对应的邻格：N, NE, E, SE, S, SW, W, NW（与 terrain_gen.py 一致）
+const BLOB_NEIGHBORS := [
+	Vector2i(0, -1), Vector2i(1, -1), Vector2i(1, 0), Vector2i(1, 1),
+	Vector2i(0, 1), Vector2i(-1, 1), Vector2i(-1, 0), Vector2i(-1, -1)
+]
+var _biome_index: Dictionary = {}  # biome_atlas.json：floors 名 -> 变体坐标列表，blob 名 -> {掩码: 坐标}
+var _biome_layer: TileMapLayer  # blob 叠加层，画在地板之上
+var _blob_cells: Dictionary = {}  # Vector2i -> 地形名，地形全部放置后统一按邻域拼接
 var _pending_start_weapon_options: Array[Dictionary] = []  # 开局武器选择候选
 var _pending_shop_weapon_options: Array[Dictionary] = []  # 波次后商店武器候选
 var _waves_initialized := false  # 波次管理器是否已 setup
@@ -93,6 +105,8 @@ var _mobile_move := Vector2.ZERO
 ## [系统] 节点入树时调用，生成玩家与地形、挂接波次/HUD 信号、打开开局商店。
 func _ready() -> void:
 	AudioManager.play_game_bgm()
+	# 敌人贴图提前提交后台加载，首波生成时不在主线程同步 load
+	VisualAssetRegistry.preload_textures(VisualAssetRegistry.get_indexed_paths("res://assets/enemies/"))
 	# 先创建玩家，再初始化依赖玩家引用的系统。
 	_spawn_player()
 	_terrain_container = Node2D.new()
@@ -1084,6 +1098,7 @@ func _spawn_terrain_map() -> void:
 	_water_spawn_rects.clear()
 	_water_spawn_rects.append_array(water_occupied)
 	_playable_region = region
+	_apply_blob_autotiles()
 	_spawn_world_bounds(region)
 	call_deferred("_bake_navigation")
 	# 地图刷新完成，启动预生成倒计时；倒计时结束后 wave_manager 生成第 1 批敌人。
@@ -1331,6 +1346,9 @@ func _bake_navigation() -> void:
 func _setup_terrain_tilemap() -> void:
 	# 创建 TileSet 与单层 TileMapLayer，先铺满默认地形，再覆盖草/水/障碍。
 	_terrain_layer = null
+	_biome_layer = null
+	_biome_index = {}
+	_blob_cells.clear()
 	var atlas := TileSetAtlasSource.new()
 	var tex_path := "res://assets/terrain/terrain_atlas.png"
 	if not ResourceLoader.exists(tex_path):
@@ -1353,6 +1371,7 @@ func _setup_terrain_tilemap() -> void:
 	var tileset := TileSet.new()
 	tileset.tile_size = Vector2i(TERRAIN_TILE_SIZE, TERRAIN_TILE_SIZE)
 	tileset.add_source(atlas, 0)
+	_setup_biome_source(tileset)
 	var terrain_root := Node2D.new()
 	terrain_root.name = "TerrainTileMap"
 	_terrain_layer = TileMapLayer.new()
@@ -1360,21 +1379,100 @@ func _setup_terrain_tilemap() -> void:
 	_terrain_layer.tile_set = tileset
 	_terrain_layer.z_index = -100
 	terrain_root.add_child(_terrain_layer)
+	if not _biome_index.is_empty():
+		_biome_layer = TileMapLayer.new()
+		_biome_layer.name = "BiomeLayer"
+		_biome_layer.tile_set = tileset
+		_biome_layer.z_index = -99
+		terrain_root.add_child(_biome_layer)
 	_terrain_container.add_child(terrain_root)
 
 
+## [自定义] 加载 terrain_gen.py 生成的 biome 图集为 TileSet 的第 2 个 source，并为索引中的全部坐标建瓦片。
+## 索引或纹理缺失、瓦片尺寸不符时不添加（_biome_index 为空），地形沿用 terrain_atlas。
+func _setup_biome_source(tileset: TileSet) -> void:
+	if not FileAccess.file_exists(BIOME_INDEX_PATH):
+		return
+	var parsed = JSON.parse_string(FileAccess.get_file_as_string(BIOME_INDEX_PATH))
+	if typeof(parsed) != TYPE_DICTIONARY or int(parsed.get("tile_size", 0)) != TERRAIN_TILE_SIZE:
+		return
+	var tex_path := str(parsed.get("atlas", ""))
+	if tex_path.is_empty() or not ResourceLoader.exists(tex_path):
+		return
+	var tex: Texture2D = load(tex_path) as Texture2D
+	if tex == null:
+		return
+	var source := TileSetAtlasSource.new()
+	source.texture = tex
+	source.texture_region_size = Vector2i(TERRAIN_TILE_SIZE, TERRAIN_TILE_SIZE)
+	var coords: Array = []
+	for group in ["floors", "blob"]:
+		var entries: Dictionary = parsed.get(group, {})
+		for key in entries:
+			var value = entries[key]
+			coords.append_array(value if value is Array else (value as Dictionary).values())
+	for c in coords:
+		var cell := Vector2i(int(c[0]), int(c[1]))
+		if not source.has_tile(cell):
+			source.create_tile(cell)
+	tileset.add_source(source, BIOME_SOURCE_ID)
+	_biome_index = parsed
+
+
 ## [自定义] 将世界坐标 rect 覆盖的 TileMapLayer 格子涂为指定 tile（覆盖已有地板）。
 func _paint_terrain_rect(rect: Rect2, tile_type: int) -> void:
 	# 将世界坐标 rect 覆盖的 TileMapLayer 格子涂为指定 tile（覆盖已有地板）。
+	# 有 biome 叠加层时草/水只记录格子，由 _apply_blob_autotiles 按邻域选瓦片，地板保持不变。
 	if _terrain_layer == null:
 		return
 	var source_id := 0
 	var atlas_coords := Vector2i(tile_type, 0)
+	var blob_name := ""
+	if _biome_layer != null:
+		match tile_type:
+			TERRAIN_TILE_GRASS:
+				blob_name = "grass"
+			TERRAIN_TILE_SHALLOW_WATER:
+				blob_name = "shallow_water"
+			TERRAIN_TILE_DEEP_WATER:
+				blob_name = "deep_water"
 	var cell_start := Vector2i(floori(rect.position.x / float(TERRAIN_TILE_SIZE)), floori(rect.position.y / float(TERRAIN_TILE_SIZE)))
 	var cell_end := Vector2i(ceili(rect.end.x / float(TERRAIN_TILE_SIZE)), ceili(rect.end.y / float(TERRAIN_TILE_SIZE)))
 	for cx in range(cell_start.x, cell_end.x):
 		for cy in range(cell_start.y, cell_end.y):
-			_terrain_layer.set_cell(Vector2i(cx, cy), source_id, atlas_coords)
+			var cell := Vector2i(cx, cy)
+			if not blob_name.is_empty():
+				_blob_cells[cell] = blob_name
+				continue
+			_blob_cells.erase(cell)
+			_terrain_layer.set_cell(cell, source_id, atlas_coords)
+
+
+## [自定义] 草地/水域格子按 8 邻域同类掩码选 blob 瓦片画到叠加层，相连区域边缘无缝衔接；无 biome 图集时不做任何事。
+func _apply_blob_autotiles() -> void:
+	if _biome_layer == null:
+		return
+	var blob: Dictionary = _biome_index.get("blob", {})
+	for cell in _blob_cells:
+		var terrain: String = _blob_cells[cell]
+		var mask := 0
+		for i in range(BLOB_NEIGHBORS.size()):
+			if _blob_cells.get(cell + BLOB_NEIGHBORS[i], "") == terrain:
+				mask |= 1 << i
+		var tiles: Dictionary = blob.get(terrain, {})
+		var coords = tiles.get(str(_canonical_blob_mask(mask)))
+		if coords is Array and coords.size() == 2:
+			_biome_layer.set_cell(cell, BIOME_SOURCE_ID, Vector2i(int(coords[0]), int(coords[1])))
+
+
+## [自定义] 去掉相邻两边未同时连通的对角位（256 种组合归并为图集中的 47 种），同 terrain_gen.canonical_mask。
+func _canonical_blob_mask(mask: int) -> int:
+	for corner in [1, 3, 5, 7]:
+		var side_a := 1 << ((corner + 7) % 8)
+		var side_b := 1 << ((corner + 1) % 8)
+		if mask & (1 << corner) and not (mask & side_a and mask & side_b):
+			mask &= ~(1 << corner)
+	return mask
 
 
 ## [自定义] 可移动地面：优先用 TileMapLayer 铺满，支持风格化像素图；无 TileMapLayer 时回退 Polygon2D。
@@ -1389,10 +1487,17 @@ func _spawn_walkable_floor(region: Rect2, default_terrain_type: String = "flat",
 	floor_row = mini(floor_row, _terrain_atlas_rows - 1)
 	if _terrain_layer != null:
 		var source_id := 0
+		# biome 图集存在时按格坐标哈希选噪声变体，同一格每次相同、相邻格不成规律
+		var floors: Dictionary = _biome_index.get("floors", {})
+		var variants: Array = floors.get(BIOME_FLOOR_NAMES[floor_row], [])
 		var cell_start := Vector2i(floori(region.position.x / float(TERRAIN_TILE_SIZE)), floori(region.position.y / float(TERRAIN_TILE_SIZE)))
 		var cell_end := Vector2i(ceili(region.end.x / float(TERRAIN_TILE_SIZE)), ceili(region.end.y / float(TERRAIN_TILE_SIZE)))
 		for cx in range(cell_start.x, cell_end.x):
 			for cy in range(cell_start.y, cell_end.y):
+				if not variants.is_empty():
+					var c: Array = variants[absi((cx * 73856093) ^ (cy * 19349663)) % variants.size()]
+					_terrain_layer.set_cell(Vector2i(cx, cy), BIOME_SOURCE_ID, Vector2i(int(c[0]), int(c[1])))
+					continue
 				var tile_x := TERRAIN_TILE_FLOOR_A if ((cx + cy) % 2 == 0) else TERRAIN_TILE_FLOOR_B
 				_terrain_layer.set_cell(Vector2i(cx, cy), source_id, Vector2i(tile_x, floor_row))
 		return
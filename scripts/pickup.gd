@@ -23,13 +23,13 @@ func _ready() -> void:
 	collision_mask = 1
 	var tex: Texture2D = null
 	if pickup_type == "heal":
-		if texture_heal != "" and ResourceLoader.exists(texture_heal):
-			tex = load(texture_heal) as Texture2D
+		if texture_heal != "":
+			tex = VisualAssetRegistry.get_texture_cached(texture_heal)
 		if tex == null:
 			tex = PixelGenerator.generate_pickup_sprite(true)
 	else:
-		if texture_coin != "" and ResourceLoader.exists(texture_coin):
-			tex = load(texture_coin) as Texture2D
+		if texture_coin != "":
+			tex = VisualAssetRegistry.get_texture_cached(texture_coin)
 		if tex == null:
 			tex = PixelGenerator.generate_pickup_sprite(false)
 		_apply_coin_visual_by_value()
@@ -89,13 +89,13 @@ func configure_for_spawn(p_type: String, val: int) -> void:
 	value = maxi(1, val)
 	var tex: Texture2D = null
 	if pickup_type == "heal":
-		if texture_heal != "" and ResourceLoader.exists(texture_heal):
-			tex = load(texture_heal) as Texture2D
+		if texture_heal != "":
+			tex = VisualAssetRegistry.get_texture_cached(texture_heal)
 		if tex == null:
 			tex = PixelGenerator.generate_pickup_sprite(true)
 	else:
-		if texture_coin != "" and ResourceLoader.exists(texture_coin):
-			tex = load(texture_coin) as Texture2D
+		if texture_coin != "":
+			tex = VisualAssetRegistry.get_texture_cached(texture_coin)
 		if tex == null:
 			tex = PixelGenerator.generate_pickup_sprite(false)
 		_apply_coin_visual_by_value()
@@ -2,97 +2,27 @@ class_name PixelGenerator
 extends RefCounted
 
 # 像素资源生成器（无美术资源版本）：
-# - 使用 Image 逐像素绘制
-# - 运行时生成 Texture2D
+# - 形状由 scripts/tools/export_pixel_assets.py 定义，经 draw_ops.py 编译为绘制指令规格（res://resources/pixel_draw_ops.json）
+# - 运行时按规格逐个 Image.fill_rect 生成 Texture2D，不再逐像素 set_pixel
 # - 提供玩家/敌人/子弹/UI 面板基础图块
 
-static func generate_player_sprite(color_scheme: int) -> Texture2D:
-	var img := Image.create(24, 24, false, Image.FORMAT_RGBA8)
-	img.fill(Color(0, 0, 0, 0))
+const DRAW_OPS_PATH := "res://resources/pixel_draw_ops.json"
+const ENEMY_SPRITE_NAMES := ["enemy_melee", "enemy_ranged", "enemy_tank", "enemy_boss", "enemy_aquatic", "enemy_dasher"]
+const ENEMY_SHAPE_COUNT := 8
+const BULLET_TYPES := ["pistol", "shotgun", "rifle", "laser", "firearm", "orb"]
 
-	var body_color := Color(0.20, 0.70, 1.0) if color_scheme == 0 else Color(1.0, 0.55, 0.20)
-	var dark_color := body_color.darkened(0.25)
+static var _draw_ops: Dictionary = {}
+static var _draw_ops_loaded := false
 
-	# head
-	for x in range(8, 16):
-		for y in range(3, 10):
-			img.set_pixel(x, y, body_color)
-	# body
-	for x in range(6, 18):
-		for y in range(10, 21):
-			img.set_pixel(x, y, body_color)
-	# arms
-	for x in range(3, 6):
-		for y in range(11, 18):
-			img.set_pixel(x, y, dark_color)
-	for x in range(18, 21):
-		for y in range(11, 18):
-			img.set_pixel(x, y, dark_color)
 
-	return ImageTexture.create_from_image(img)
+static func generate_player_sprite(color_scheme: int) -> Texture2D:
+	return _spec_texture("player_scheme_0" if color_scheme == 0 else "player_scheme_1")
 
 
 static func generate_enemy_sprite(enemy_type: int) -> Texture2D:
-	var img := Image.create(18, 18, false, Image.FORMAT_RGBA8)
-	img.fill(Color(0, 0, 0, 0))
-
-	if enemy_type == 0:
-		# 近战敌人：红色方块 + 角
-		var color := Color(0.85, 0.20, 0.20)
-		for x in range(3, 15):
-			for y in range(3, 15):
-				img.set_pixel(x, y, color)
-		# simple horns
-		img.set_pixel(4, 2, color)
-		img.set_pixel(13, 2, color)
-	elif enemy_type == 1:
-		# 远程敌人：紫色菱形 + 白色眼睛
-		var color2 := Color(0.70, 0.18, 0.85)
-		for x in range(1, 17):
-			for y in range(1, 17):
-				if abs(x - 8) + abs(y - 8) <= 7:
-					img.set_pixel(x, y, color2)
-		# eye
-		img.set_pixel(7, 7, Color.WHITE)
-		img.set_pixel(8, 7, Color.WHITE)
-	elif enemy_type == 2:
-		# 坦克敌人：深绿色重甲方块。
-		var color3 := Color(0.20, 0.65, 0.25)
-		var edge := color3.darkened(0.28)
-		for x in range(2, 16):
-			for y in range(2, 16):
-				img.set_pixel(x, y, color3 if x > 2 and x < 15 and y > 2 and y < 15 else edge)
-	elif enemy_type == 4:
-		# 水中敌人：青色鱼形。
-		var color_aqua := Color(0.20, 0.75, 0.85)
-		for x in range(4, 14):
-			for y in range(5, 13):
-				img.set_pixel(x, y, color_aqua)
-		for y in range(6, 12):
-			img.set_pixel(2, y, color_aqua)
-		for y in range(7, 11):
-			img.set_pixel(15, y, color_aqua)
-	elif enemy_type == 5:
-		# 冲刺敌人：橙色菱形流线型。
-		var color_dash := Color(1.0, 0.45, 0.15)
-		for x in range(1, 17):
-			for y in range(1, 17):
-				if abs(x - 8) + abs(y - 8) <= 6:
-					img.set_pixel(x, y, color_dash)
-		img.set_pixel(8, 8, color_dash.lightened(0.2))
-	else:
-		# Boss：深红核心 + 白色光点。
-		var color4 := Color(0.70, 0.12, 0.18)
-		for x in range(0, 18):
-			for y in range(0, 18):
-				if abs(x - 8.5) + abs(y - 8.5) <= 9:
-					img.set_pixel(x, y, color4)
-		img.set_pixel(8, 8, Color.WHITE)
-		img.set_pixel(9, 8, Color.WHITE)
-		img.set_pixel(8, 9, Color.WHITE)
-		img.set_pixel(9, 9, Color.WHITE)
-
-	return ImageTexture.create_from_image(img)
+	# 0=近战 1=远程 2=坦克 3=Boss 4=水中 5=冲刺；未知类型按 Boss 绘制
+	var index := enemy_type if enemy_type >= 0 and enemy_type < ENEMY_SPRITE_NAMES.size() else 3
+	return _spec_texture(ENEMY_SPRITE_NAMES[index])
 
 
 ## [自定义] 按 enemy_id 生成占位像素图，供新敌人使用；缺失时回退 generate_enemy_sprite(enemy_type)。
@@ -149,139 +79,26 @@ static func generate_enemy_sprite_by_id(enemy_id: String) -> Texture2D:
 
 
 static func _generate_enemy_by_shape(color: Color, shape_type: int) -> Texture2D:
-	var img := Image.create(18, 18, false, Image.FORMAT_RGBA8)
-	img.fill(Color(0, 0, 0, 0))
-	var dark := color.darkened(0.25)
-	var cx := 8.5
-	var cy := 8.5
-	match shape_type:
-		0:
-			# 方形
-			for x in range(3, 15):
-				for y in range(3, 15):
-					img.set_pixel(x, y, color)
-		1:
-			# 菱形
-			for x in range(1, 17):
-				for y in range(1, 17):
-					if abs(x - cx) + abs(y - cy) <= 7:
-						img.set_pixel(x, y, color)
-		2:
-			# 重甲方块
-			for x in range(2, 16):
-				for y in range(2, 16):
-					img.set_pixel(x, y, dark if (x <= 2 or x >= 15 or y <= 2 or y >= 15) else color)
-		3:
-			# 圆形（Boss 用）
-			var r := 9.0
-			for x in range(18):
-				for y in range(18):
-					if Vector2(x - cx, y - cy).length() <= r:
-						img.set_pixel(x, y, color)
-		4:
-			# 鱼形
-			for x in range(4, 14):
-				for y in range(5, 13):
-					img.set_pixel(x, y, color)
-			for y in range(6, 12):
-				img.set_pixel(2, y, color)
-			for y in range(7, 11):
-				img.set_pixel(15, y, color)
-		5:
-			# 流线菱形
-			for x in range(1, 17):
-				for y in range(1, 17):
-					if abs(x - cx) + abs(y - cy) <= 6:
-						img.set_pixel(x, y, color)
-		6:
-			# 六边形
-			for x in range(2, 16):
-				for y in range(2, 16):
-					var dx: float = abs(x - cx)
-					var dy: float = abs(y - cy)
-					if dx + dy * 0.6 <= 7:
-						img.set_pixel(x, y, color)
-		7:
-			# 椭圆（蛇形）
-			for x in range(2, 16):
-				for y in range(5, 13):
-					if (x - cx) * (x - cx) / 36.0 + (y - cy) * (y - cy) / 16.0 <= 1.0:
-						img.set_pixel(x, y, color)
-		_:
-			for x in range(3, 15):
-				for y in range(3, 15):
-					img.set_pixel(x, y, color)
-	return ImageTexture.create_from_image(img)
+	var shape := shape_type if shape_type >= 0 and shape_type < ENEMY_SHAPE_COUNT else 0
+	return _spec_texture("enemy_shape_%d" % shape, {"body": color, "dark": color.darkened(0.25)}, color)
 
 
 static func generate_bullet_sprite(is_enemy: bool = false) -> Texture2D:
-	var img := Image.create(4, 4, false, Image.FORMAT_RGBA8)
-	img.fill(Color(0, 0, 0, 0))
 	# 我方子弹偏黄，敌方子弹偏红，战场识别更直观。
-	var c := Color(1.0, 0.3, 0.3) if is_enemy else Color(1.0, 1.0, 0.4)
-	for x in range(4):
-		for y in range(4):
-			if abs(x - 1.5) + abs(y - 1.5) <= 2:
-				img.set_pixel(x, y, c)
-	return ImageTexture.create_from_image(img)
+	return _spec_texture("bullet_enemy" if is_enemy else "bullet_player")
 
 
 static func generate_bullet_sprite_by_type(type: String, color: Color, size: Vector2i = Vector2i.ZERO) -> Texture2D:
-	# 按 bullet_type 生成不同形状与颜色的子弹贴图。
-	var w := size.x
-	var h := size.y
-	match type:
-		"pistol":
-			w = 4
-			h = 4
-		"shotgun":
-			w = 6
-			h = 6
-		"rifle":
-			w = 8
-			h = 2
-		"laser":
-			w = 12
-			h = 2
-		"firearm":
-			w = 4
-			h = 4
-		"orb":
-			w = 8
-			h = 8
-		_:
-			w = 4 if w <= 0 else w
-			h = 4 if h <= 0 else h
-	var img := Image.create(w, h, false, Image.FORMAT_RGBA8)
-	img.fill(Color(0, 0, 0, 0))
-	if type == "orb":
-		# 法球：圆形
-		var r := (minf(w, h) - 1) * 0.5
-		for x in range(w):
-			for y in range(h):
-				if Vector2(x - (w - 1) * 0.5, y - (h - 1) * 0.5).length() <= r:
-					img.set_pixel(x, y, color)
-	elif type == "pistol" or type == "firearm" or type == "":
-		for x in range(w):
-			for y in range(h):
-				if abs(x - (w - 1) * 0.5) + abs(y - (h - 1) * 0.5) <= 2:
-					img.set_pixel(x, y, color)
-	elif type == "shotgun":
-		var r := (minf(w, h) - 1) * 0.5
-		for x in range(w):
-			for y in range(h):
-				if Vector2(x - (w - 1) * 0.5, y - (h - 1) * 0.5).length() <= r:
-					img.set_pixel(x, y, color)
-	elif type == "rifle" or type == "laser":
-		# 细长条：沿宽度方向
-		for x in range(w):
-			for y in range(h):
-				img.set_pixel(x, y, color)
-	else:
-		for x in range(w):
-			for y in range(h):
-				if abs(x - (w - 1) * 0.5) + abs(y - (h - 1) * 0.5) <= 2:
-					img.set_pixel(x, y, color)
+	# 按 bullet_type 生成不同形状与颜色的子弹贴图；未知类型按 firearm 菱形绘制，指定 size 时居中放入该尺寸画布。
+	var known := BULLET_TYPES.has(type)
+	var img := draw_sprite("bullet_" + (type if known else "firearm"), {"body": color})
+	if img == null:
+		return _solid_texture(size if size.x > 0 and size.y > 0 else Vector2i(4, 4), color)
+	if not known and size.x > 0 and size.y > 0 and Vector2i(img.get_width(), img.get_height()) != size:
+		var canvas := Image.create(size.x, size.y, false, Image.FORMAT_RGBA8)
+		var offset := (size - img.get_size()) / 2
+		canvas.blit_rect(img, Rect2i(Vector2i.ZERO, img.get_size()), offset)
+		img = canvas
 	return ImageTexture.create_from_image(img)
 
 
@@ -292,23 +109,53 @@ static func generate_panel_texture(size: Vector2i, color: Color) -> Texture2D:
 
 
 static func generate_pickup_sprite(is_heal: bool) -> Texture2D:
-	var img := Image.create(8, 8, false, Image.FORMAT_RGBA8)
-	img.fill(Color(0, 0, 0, 0))
-	if is_heal:
-		var c := Color(0.95, 0.20, 0.35)
-		for x in range(2, 6):
-			img.set_pixel(x, 1, c)
-			img.set_pixel(x, 6, c)
-		for y in range(2, 6):
-			img.set_pixel(1, y, c)
-			img.set_pixel(6, y, c)
-		for x in range(2, 6):
-			for y in range(2, 6):
-				img.set_pixel(x, y, c)
-	else:
-		var c2 := Color(1.0, 0.85, 0.22)
-		for x in range(1, 7):
-			for y in range(1, 7):
-				if abs(x - 3.5) + abs(y - 3.5) <= 4:
-					img.set_pixel(x, y, c2)
+	return _spec_texture("pickup_heal" if is_heal else "pickup_coin")
+
+
+## 按规格名绘制精灵：透明画布上对每个矩形调用一次 fill_rect。roles 覆盖角色色（如 {"body": color}），
+## 未给出的角色使用规格中的默认色。规格缺失或无此名称时返回 null。
+static func draw_sprite(sprite_name: String, roles: Dictionary = {}) -> Image:
+	var spec: Dictionary = _get_draw_ops().get(sprite_name, {})
+	var size: Array = spec.get("size", [])
+	if size.size() != 2:
+		return null
+	var img := Image.create(int(size[0]), int(size[1]), false, Image.FORMAT_RGBA8)
+	var role_names: Array = spec.get("roles", [])
+	var defaults: Array = spec.get("colors", [])
+	var colors: Array[Color] = []
+	for i in range(mini(role_names.size(), defaults.size())):
+		var c: Array = defaults[i]
+		colors.append(roles.get(role_names[i], Color8(int(c[0]), int(c[1]), int(c[2]), int(c[3]))))
+	var rects: Array = spec.get("rects", [])
+	for i in range(0, rects.size() - 4, 5):
+		var role := int(rects[i + 4])
+		if role < colors.size():
+			img.fill_rect(Rect2i(int(rects[i]), int(rects[i + 1]), int(rects[i + 2]), int(rects[i + 3])), colors[role])
+	return img
+
+
+## 规格绘制为纹理；规格缺失时退化为 fallback 色的纯色方块并提示重新生成。
+static func _spec_texture(sprite_name: String, roles: Dictionary = {}, fallback: Color = Color.MAGENTA) -> Texture2D:
+	var img := draw_sprite(sprite_name, roles)
+	if img == null:
+		push_warning("绘制指令规格缺少 %s，请运行 python scripts/tools/draw_ops.py" % sprite_name)
+		return _solid_texture(Vector2i(16, 16), fallback)
 	return ImageTexture.create_from_image(img)
+
+
+static func _solid_texture(size: Vector2i, color: Color) -> Texture2D:
+	var img := Image.create(size.x, size.y, false, Image.FORMAT_RGBA8)
+	img.fill(color)
+	return ImageTexture.create_from_image(img)
+
+
+static func _get_draw_ops() -> Dictionary:
+	if _draw_ops_loaded:
+		return _draw_ops
+	_draw_ops_loaded = true
+	if not FileAccess.file_exists(DRAW_OPS_PATH):
+		return _draw_ops
+	var parsed = JSON.parse_string(FileAccess.get_file_as_string(DRAW_OPS_PATH))
+	if typeof(parsed) == TYPE_DICTIONARY and typeof(parsed.get("sprites")) == TYPE_DICTIONARY:
+		_draw_ops = parsed["sprites"]
+	return _draw_ops
@@ -24,6 +24,7 @@ signal request_area_targeting(slot: int, magic_def: Dictionary, instance: MagicB
 @export var frame_size: Vector2i = Vector2i(24, 24)  # 每帧像素尺寸
 @export var sheet_columns: int = 8  # 精灵图列数（8 方向）
 @export var sheet_rows: int = 3  # 精灵图行数（站立、行走1、行走2）
+var _sheet_frames: Dictionary = {}  # 帧去重后的精灵图帧表（VisualAssetRegistry.get_sheet_frames），空则按网格取帧
 
 var current_health := 100
 var current_mana := 50.0  # 当前魔力
@@ -483,8 +484,6 @@ func _update_direction_sprite() -> void:
 	# 8 方向 x 3 行（站立、行走帧1、行走帧2）：根据 velocity 与时间切换，实现肉眼可见的行走动画。
 	if not sprite or not sprite.region_enabled:
 		return
-	var frame_w := frame_size.x
-	var frame_h := frame_size.y
 	if velocity.length_squared() > 16.0:
 		var angle := velocity.angle()
 		_last_direction_index = wrapi(roundi((angle + PI) / (PI / 4.0)), 0, 8)
@@ -492,10 +491,10 @@ func _update_direction_sprite() -> void:
 	var row := 0
 	if velocity.length_squared() > 16.0:
 		row = 1 + (int(Time.get_ticks_msec() / 150.0) % 2)
-	sprite.region_rect = Rect2(_last_direction_index * frame_w, row * frame_h, frame_w, frame_h)
+	sprite.region_rect = VisualAssetRegistry.get_sheet_region(_sheet_frames, _last_direction_index, row, frame_size)
 
 
-## [自定义] 更新角色精灵图。动态加载：sheet_path/single_path 来自 @export，ResourceLoader.exists 校验后 load()，
+## [自定义] 更新角色精灵图。sheet_path/single_path 来自 @export，经 VisualAssetRegistry 缓存与资源索引加载（无逐次探测），
 ## 失败则尝试另一路径，再失败则回退 PixelGenerator 生成。
 func _update_sprite(color_scheme: int) -> void:
 	# 角色贴图：优先 texture_sheet，失败则 texture_single，再回退 PixelGenerator。
@@ -504,15 +503,16 @@ func _update_sprite(color_scheme: int) -> void:
 	var sheet_path := texture_sheet if color_scheme == 0 else texture_sheet_1
 	var single_path := texture_single if color_scheme == 0 else texture_single_1
 	var tex: Texture2D = null
-	if sheet_path != "" and ResourceLoader.exists(sheet_path):
-		tex = load(sheet_path) as Texture2D
+	if sheet_path != "":
+		tex = VisualAssetRegistry.get_texture_cached(sheet_path)
 	if tex != null:
 		sprite.texture = tex
 		sprite.region_enabled = true
-		sprite.region_rect = Rect2(0, 0, frame_size.x, frame_size.y)
+		_sheet_frames = VisualAssetRegistry.get_sheet_frames(sheet_path)
+		sprite.region_rect = VisualAssetRegistry.get_sheet_region(_sheet_frames, 0, 0, frame_size)
 		return
-	if single_path != "" and ResourceLoader.exists(single_path):
-		tex = load(single_path) as Texture2D
+	if single_path != "":
+		tex = VisualAssetRegistry.get_texture_cached(single_path)
 	if tex != null:
 		sprite.texture = tex
 		sprite.region_enabled = false
@@ -779,8 +779,8 @@ func _refresh_weapon_visuals() -> void:
 		var color_hint_any = weapon_node.color_hint
 		var color_hint: Color = color_hint_any if color_hint_any is Color else Color(0.8, 0.8, 0.8, 1.0)
 		var tex: Texture2D = null
-		if weapon_node.icon_path != "" and ResourceLoader.exists(weapon_node.icon_path):
-			tex = load(weapon_node.icon_path) as Texture2D
+		if weapon_node.icon_path != "":
+			tex = VisualAssetRegistry.get_texture_cached(weapon_node.icon_path)
 		if tex == null:
 			tex = VisualAssetRegistry.make_color_texture(color_hint, Vector2i(10, 10))
 		icon.texture = tex
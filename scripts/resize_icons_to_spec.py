@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
 """
-将指定武器/道具/魔法图标 PNG 缩放到 96x96，覆盖原文件。
-仅处理下方 ICON_FILES 列表中的文件，避免误改其他资源。
+按 scripts/icon_spec.json 将武器/道具/魔法图标 PNG 缩放到各分类规格尺寸，覆盖原文件。
+仅处理配置中各分类 files（glob，相对项目根目录）匹配且未被 exclude 排除的文件，避免误改其他资源。
+- 像素风小图（长边 < painted_min_size）使用分类的 pixel_art_filter（nearest/box）
+- 绘制风大图（如 1024×1024 AI 生成图）先用 Image.reduce 整数倍快速降采样，再用 painted_filter（lanczos）缩放
+- 源哈希缓存（配置 cache）：文件内容与分类规格都未变化时直接跳过，不解码
 依赖：pip install Pillow
-运行：在项目根目录执行 python scripts/resize_icons_to_spec.py
+运行：在项目根目录执行 python scripts/resize_icons_to_spec.py [--config PATH] [--jobs N] [--profile REPORT.jsonl]
+--profile 逐文件记录解码/缩放/编码/写盘耗时（另有 --cprofile、--profile-top，见 tools/asset_profile.py）
 """
-from pathlib import Path
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
 
 try:
     from PIL import Image
@@ -13,58 +24,138 @@ except ImportError:
     print("请先安装 Pillow: pip install Pillow")
     raise
 
-TARGET_SIZE = 96
+sys.path.insert(0, str(Path(__file__).resolve().parent / "tools"))
+from asset_profile import AssetProfiler, StageTimer, add_profile_args
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CONFIG = PROJECT_ROOT / "scripts" / "icon_spec.json"
+
+FILTERS = {
+    "nearest": Image.Resampling.NEAREST,
+    "box": Image.Resampling.BOX,
+    "bilinear": Image.Resampling.BILINEAR,
+    "lanczos": Image.Resampling.LANCZOS,
+}
+
+
+def load_config(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def spec_key(spec: dict, painted_min_size: int) -> str:
+    """分类规格指纹：尺寸、滤波器或判定阈值变化时缓存失效。"""
+    keys = ("size", "pixel_art_filter", "painted_filter")
+    return json.dumps([spec.get(k) for k in keys] + [spec.get("painted_min_size", painted_min_size)])
+
+
+def collect_files(config: dict) -> list:
+    """展开各分类 glob，返回 [(相对路径, 分类名)]；同一文件只归属第一个匹配的分类。"""
+    seen = {}
+    for name, spec in config["categories"].items():
+        excluded = {p for pat in spec.get("exclude", []) for p in PROJECT_ROOT.glob(pat)}
+        for pat in spec["files"]:
+            for path in sorted(PROJECT_ROOT.glob(pat)):
+                if path.is_file() and path not in excluded:
+                    seen.setdefault(path.relative_to(PROJECT_ROOT).as_posix(), name)
+    return sorted(seen.items())
+
+
+def category_for(rel: str, categories: dict) -> str | None:
+    """单个文件（相对项目根目录）在 categories（名 → 含 files/exclude 的规格）中所属的分类名，
+    规则与 collect_files 一致；不属于任何分类时返回 None。"""
+    path = PurePosixPath(rel)
+    for name, spec in categories.items():
+        if any(path.match(pat) for pat in spec["files"]) and not any(path.match(pat) for pat in spec.get("exclude", [])):
+            return name
+    return None
+
+
+def resize_image(img: Image.Image, size: int, spec: dict, painted_min_size: int) -> Image.Image:
+    """按规格缩放到 size×size。大图先整数倍 reduce（保留约 2 倍余量供最终滤波），再用 painted_filter。"""
+    if max(img.size) < spec.get("painted_min_size", painted_min_size):
+        return img.resize((size, size), FILTERS[spec.get("pixel_art_filter", "nearest")])
+    factor = min(img.width, img.height) // (size * 2)
+    if factor >= 2:
+        img = img.reduce(factor)
+    return img.resize((size, size), FILTERS[spec.get("painted_filter", "lanczos")])
+
+
+def process_file(rel: str, spec: dict, painted_min_size: int) -> tuple:
+    """处理单个文件，返回 (状态, 说明, 输出字节哈希, 各阶段耗时, 源像素数)；状态为 resized / skipped。"""
+    path = PROJECT_ROOT / rel
+    size = spec["size"]
+    timer = StageTimer()
+    with timer.stage("decode"), Image.open(path) as src:
+        # Image.open 只读文件头，尺寸已达标时无需解码像素
+        if src.size == (size, size):
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            return "skipped", "already %dx%d" % src.size, digest, timer.stages, size * size
+        # JPEG 等格式可在解码阶段直接按比例缩小；PNG 上为空操作
+        src.draft("RGBA", (size * 2, size * 2))
+        img = src.convert("RGBA")
+    with timer.stage("resize"):
+        out = resize_image(img, size, spec, painted_min_size)
+    with timer.stage("encode"):
+        buf = io.BytesIO()
+        out.save(buf, "PNG")
+        data = buf.getvalue()
+    with timer.stage("write"):
+        path.write_bytes(data)
+    note = "%dx%d -> %dx%d" % (img.width, img.height, size, size)
+    return "resized", note, hashlib.sha256(data).hexdigest(), timer.stages, img.width * img.height
+
+
+def _process_args(args: tuple) -> tuple:
+    return process_file(*args)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="按分类规格缩放图标 PNG")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG, help="规格配置文件（默认 scripts/icon_spec.json）")
+    parser.add_argument("--jobs", type=int, default=0, metavar="N", help="并行进程数，0 表示按 CPU 核数（默认 0）")
+    add_profile_args(parser)
+    opts = parser.parse_args(argv)
+    profiler = AssetProfiler.from_args(opts)
+    profiler.start()
+    config = load_config(opts.config)
+    painted_min_size = config.get("painted_min_size", 256)
+    cache_path = PROJECT_ROOT / config.get("cache", "assets/.resize_cache.json")
+    cache = json.loads(cache_path.read_text(encoding="utf-8")) if cache_path.is_file() else {}
 
-ICON_FILES = [
-    "assets/weapons/blade_short.png",
-    "assets/weapons/dagger.png",
-    "assets/weapons/spear.png",
-    "assets/weapons/chainsaw.png",
-    "assets/weapons/hammer_heavy.png",
-    "assets/weapons/pistol_basic.png",
-    "assets/weapons/shotgun_wide.png",
-    "assets/weapons/rifle_long.png",
-    "assets/weapons/wand_focus.png",
-    "assets/weapons/sniper.png",
-    "assets/weapons/orb_wand.png",
-    "assets/ui/upgrade_icons/icon_hp.png",
-    "assets/ui/upgrade_icons/icon_mana.png",
-    "assets/ui/upgrade_icons/icon_armor.png",
-    "assets/ui/upgrade_icons/icon_speed.png",
-    "assets/ui/upgrade_icons/icon_melee.png",
-    "assets/ui/upgrade_icons/icon_ranged.png",
-    "assets/ui/upgrade_icons/icon_regen.png",
-    "assets/ui/upgrade_icons/icon_lifesteal.png",
-    "assets/ui/upgrade_icons/icon_mana_regen.png",
-    "assets/magic/icon_fire.png",
-    "assets/magic/icon_ice.png",
-    "assets/magic/icon_lightning.png",
-    "assets/magic/icon_poison.png",
-    "assets/magic/icon_physical.png",
-]
-
-
-def main() -> None:
     ok_count = 0
     skip_count = 0
-    for rel in ICON_FILES:
-        path = PROJECT_ROOT / rel
-        if not path.is_file():
-            print("Skip (not found):", rel)
+    tasks = []
+    for rel, category in collect_files(config):
+        spec = config["categories"][category]
+        entry = cache.get(rel)
+        key = spec_key(spec, painted_min_size)
+        # 缓存命中：内容与规格都与上次处理结果一致，跳过且不解码
+        if entry and entry.get("spec") == key and entry.get("hash") == hashlib.sha256((PROJECT_ROOT / rel).read_bytes()).hexdigest():
+            print("Skip (cached):", rel)
             skip_count += 1
             continue
-        img = Image.open(path).convert("RGBA")
-        w, h = img.size
-        if w == TARGET_SIZE and h == TARGET_SIZE:
-            print("Skip (already %dx%d):" % (w, h), rel)
+        tasks.append((rel, spec, painted_min_size))
+
+    workers = min(opts.jobs if opts.jobs > 0 else (os.cpu_count() or 1), max(len(tasks), 1))
+    if workers <= 1:
+        results = [_process_args(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_process_args, tasks))
+    for (rel, spec, _), (status, note, digest, stages, pixels) in zip(tasks, results):
+        cache[rel] = {"spec": spec_key(spec, painted_min_size), "hash": digest}
+        profiler.add(rel, stages, pixels, (PROJECT_ROOT / rel).stat().st_size if status == "resized" else 0,
+                     status=status)
+        if status == "resized":
+            print("Resized (%s):" % note, rel)
+            ok_count += 1
+        else:
+            print("Skip (%s):" % note, rel)
             skip_count += 1
-            continue
-        out = img.resize((TARGET_SIZE, TARGET_SIZE), Image.Resampling.LANCZOS)
-        out.save(path, "PNG")
-        print("Resized to %dx%d:" % (TARGET_SIZE, TARGET_SIZE), rel)
-        ok_count += 1
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(dict(sorted(cache.items())), indent=1) + "\n", encoding="utf-8")
     print("Done. Resized: %d, skipped: %d" % (ok_count, skip_count))
+    profiler.finish()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""alpha 通道规范化、裁边与纯色背景去除：按整条通道（Pillow band 运算）处理，替代逐像素 getpixel/putpixel。
+供 export_pixel_assets.py、make_opaque.py、asset_pipeline.py 与 pack_atlas.py 共用。"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# alpha 查找表：0 保持 0（全透明），1..255 一律提升到 255（完全不透明）
+_OPAQUE_LUT = [0] + [255] * 255
+
+
+def force_opaque(img: Image.Image) -> Image.Image:
+    """将非空白像素的 alpha 设为 255，透明像素保持原样（含其 RGB 值）。
+
+    - RGBA / LA：仅对 A 通道做查找表映射，其余通道原样保留，返回同模式副本
+    - P（含 transparency）、PA、RGBa 等：先转 RGBA 再处理，与原 make_opaque 的 convert("RGBA") 一致
+    - RGB / L 等无 alpha 模式：原样返回副本
+    """
+    if img.mode in ("P", "PA", "RGBa", "La") or (img.mode not in ("RGBA", "LA") and "transparency" in img.info):
+        img = img.convert("RGBA")
+    if img.mode not in ("RGBA", "LA"):
+        return img.copy()
+    from PIL import Image
+
+    bands = list(img.split())
+    bands[-1] = bands[-1].point(_OPAQUE_LUT)
+    out = Image.merge(img.mode, bands)
+    # 保留 info（如 icc_profile），保证保存结果与逐像素版本字节一致
+    out.info = img.info.copy()
+    return out
+
+
+def has_partial_alpha(img: Image.Image) -> bool:
+    """alpha 直方图检查：存在 1..254 的半透明像素时返回 True，即 force_opaque 会改变该图。
+
+    完全不透明、仅 0/255 二值 alpha 或无 alpha 通道的图返回 False，可原样跳过。
+    """
+    if img.mode in ("P", "PA", "RGBa", "La") or (img.mode not in ("RGBA", "LA") and "transparency" in img.info):
+        img = img.convert("RGBA")
+    if img.mode not in ("RGBA", "LA"):
+        return False
+    hist = img.getchannel("A").histogram()
+    return any(hist[1:255])
+
+
+def alpha_bbox(img: Image.Image) -> tuple | None:
+    """非透明像素的包围盒 (x0, y0, x1, y1)（右下开区间），由 alpha 通道 getbbox 在 C 层一次算出；全透明返回 None。
+    无 alpha 的图返回整图。"""
+    if img.mode in ("P", "PA", "RGBa", "La") or (img.mode not in ("RGBA", "LA") and "transparency" in img.info):
+        img = img.convert("RGBA")
+    if img.mode not in ("RGBA", "LA"):
+        return (0, 0, img.width, img.height)
+    return img.getchannel("A").getbbox()
+
+
+def trim_box(img: Image.Image, padding: int = 0) -> tuple | None:
+    """裁边区域：alpha 包围盒四周各扩 padding 像素并限制在图内；全透明返回 None。"""
+    box = alpha_bbox(img)
+    if box is None:
+        return None
+    x0, y0, x1, y1 = box
+    return (max(x0 - padding, 0), max(y0 - padding, 0), min(x1 + padding, img.width), min(y1 + padding, img.height))
+
+
+# 四边描边中与中位色相差不超过容差的像素占比不低于此值时，视为近似纯色背景
+BG_UNIFORM_RATIO = 0.9
+
+
+def _border_strip(img: Image.Image) -> Image.Image:
+    """四边 1 像素描边拼成一行（w*2 + h*2 像素），用于统计背景色。"""
+    from PIL import Image
+
+    w, h = img.size
+    strip = Image.new(img.mode, (2 * w + 2 * h, 1))
+    strip.paste(img.crop((0, 0, w, 1)), (0, 0))
+    strip.paste(img.crop((0, h - 1, w, h)), (w, 0))
+    strip.paste(img.crop((0, 0, 1, h)).transpose(Image.Transpose.ROTATE_90), (2 * w, 0))
+    strip.paste(img.crop((w - 1, 0, w, h)).transpose(Image.Transpose.ROTATE_90), (2 * w + h, 0))
+    return strip
+
+
+def _max_channel_diff(rgb: Image.Image, color: tuple) -> Image.Image:
+    """逐像素与 color 的最大通道差（L 模式），整图 ImageChops 运算。"""
+    from PIL import Image, ImageChops
+
+    r, g, b = ImageChops.difference(rgb, Image.new("RGB", rgb.size, color)).split()
+    return ImageChops.lighter(ImageChops.lighter(r, g), b)
+
+
+def _count_above(band: Image.Image, threshold: int) -> int:
+    return sum(band.histogram()[threshold + 1:])
+
+
+def border_background(img: Image.Image, tolerance: int) -> tuple | None:
+    """估计近似纯色背景：四边描边的逐通道中位色。
+
+    描边已基本全透明（本就是透明背景）或颜色不均匀（主体贴边、渐变背景）时返回 None，表示不应去背景。
+    """
+    strip = _border_strip(img.convert("RGBA"))
+    total = strip.width
+    if strip.getchannel("A").histogram()[0] >= total * BG_UNIFORM_RATIO:
+        return None
+    rgb = strip.convert("RGB")
+    color = []
+    for hist in (rgb.getchannel(c).histogram() for c in "RGB"):
+        acc = 0
+        for value, n in enumerate(hist):
+            acc += n
+            if acc * 2 >= total:
+                color.append(value)
+                break
+    color = tuple(color)
+    if _count_above(_max_channel_diff(rgb, color), tolerance) > total * (1 - BG_UNIFORM_RATIO):
+        return None
+    return color
+
+
+def remove_background(img: Image.Image, color: tuple, tolerance: int) -> Image.Image:
+    """去掉与四边连通、且与 color 相差不超过 tolerance 的像素（alpha 置 0），返回 RGBA 副本。
+
+    只去除从边框连通进来的背景区域，主体内部的同色像素（如白色高光）保留。连通区域用形态学重建求得：
+    从描边上的背景像素出发，反复做四邻域膨胀（十字卷积核，和饱和到 255）并与背景候选取交，直到不再变化，
+    全部为整图 C 层运算。卷积不改写最外一圈像素，而描边上的候选本就都是种子。
+    """
+    from PIL import Image, ImageChops, ImageFilter
+
+    rgba = img.convert("RGBA")
+    w, h = rgba.size
+    candidate = _max_channel_diff(rgba.convert("RGB"), color).point([255] * (tolerance + 1) + [0] * (255 - tolerance))
+    seed = Image.new("L", rgba.size, 0)
+    for box in ((0, 0, w, 1), (0, h - 1, w, h), (0, 0, 1, h), (w - 1, 0, w, h)):
+        seed.paste(candidate.crop(box), box[:2])
+    grow = ImageFilter.Kernel((3, 3), [0, 1, 0, 1, 1, 1, 0, 1, 0], scale=1)
+    for _ in range(w * h):
+        grown = ImageChops.darker(seed.filter(grow), candidate)
+        if ImageChops.difference(grown, seed).getbbox() is None:
+            break
+        seed = grown
+    rgba.putalpha(ImageChops.subtract(rgba.getchannel("A"), seed))
+    return rgba
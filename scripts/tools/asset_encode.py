@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""资源编码：像素美术颜色很少，能无损转为索引色（P 模式 + tRNS 调色板 alpha）时优先写索引 PNG。
+量化结果逐字节校验，任何颜色丢失都回退为 RGBA；两者都用 optimize=True 编码并取较小者。
+
+另有可插拔的编码后端（get_encoder），规格字符串形如 "名称" 或 "名称:键=值,键=值"：
+    png                               默认：索引色 / RGBA 取较小者，optimize=True（同 encode_png）
+    png:level=1,strategy=rle,indexed=0 指定 zlib 级别 0..9 与压缩策略（default/filtered/huffman/rle/fixed）
+    webp[:method=6]                   无损 WebP（Godot 可直接导入），method 0..6 越大越慢、越小
+    raw                               原始 RGBA 转储（"RGBA" + 宽高 uint32 LE + 像素），用于测试夹具
+asset_pipeline.py encoders 用各后端编码 assets/ 下全部 PNG 并报告体积、编码与解码耗时。"""
+
+from __future__ import annotations
+
+import io
+import struct
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# 非 optimize 模式下的 zlib 压缩级别；optimize=True 时 Pillow 固定使用 9 并额外搜索最优参数
+PNG_COMPRESS_LEVEL = 9
+
+
+def to_indexed(img: Image.Image) -> Image.Image | None:
+    """将不超过 256 色的 RGBA 图无损转为 P 模式（调色板含 alpha），有损或颜色过多时返回 None。"""
+    from PIL import Image
+
+    rgba = img.convert("RGBA") if img.mode != "RGBA" else img
+    colors = rgba.getcolors(256)
+    if colors is None:
+        return None
+    indexed = rgba.quantize(colors=len(colors), method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+    # 量化器不保证精确保色，回转后逐字节比对
+    if indexed.convert("RGBA").tobytes() != rgba.tobytes():
+        return None
+    return indexed
+
+
+def _png_bytes(img: Image.Image, optimize: bool) -> bytes:
+    buf = io.BytesIO()
+    if optimize:
+        img.save(buf, "PNG", optimize=True)
+    else:
+        img.save(buf, "PNG", compress_level=PNG_COMPRESS_LEVEL)
+    return buf.getvalue()
+
+
+def encode_png(img: Image.Image, optimize: bool = True) -> bytes:
+    """编码为 PNG 字节：可无损索引化时在索引色与 RGBA 中取较小者，否则写 RGBA。"""
+    data = _png_bytes(img, optimize)
+    indexed = to_indexed(img) if img.mode in ("RGBA", "RGB", "LA", "L") else None
+    if indexed is not None:
+        indexed_data = _png_bytes(indexed, optimize)
+        # 极小图（如 4x4 子弹）调色板与 tRNS 块开销可能超过节省，此时保留 RGBA
+        if len(indexed_data) < len(data):
+            return indexed_data
+    return data
+
+
+def baseline_png_size(img: Image.Image) -> int:
+    """Pillow 默认参数（32 位 RGBA、zlib 默认级别）编码后的字节数，用作节省量报告基准。"""
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return len(buf.getvalue())
+
+
+class Encoder(NamedTuple):
+    """编码后端：spec 为规格字符串，suffix 为输出文件后缀；encode(img) -> 字节，decode(字节) -> RGBA 图。"""
+    spec: str
+    suffix: str
+    encode: Callable
+    decode: Callable
+
+
+# zlib 压缩策略名 → Pillow PNG 的 compress_type（即 zlib strategy）；PNG 行过滤器由 Pillow 按行自适应选择，不单独暴露
+ZLIB_STRATEGIES = {"default": 0, "filtered": 1, "huffman": 2, "rle": 3, "fixed": 4}
+RAW_MAGIC = b"RGBA"
+
+
+def _decode_image(data: bytes) -> Image.Image:
+    """PNG / WebP 字节完整解码并展开为 RGBA（与引擎导入后的 RGBA8 纹理对应）。"""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as img:
+        return img.convert("RGBA")
+
+
+def _png_encoder(level: int | None = None, strategy: str = "default", indexed: bool = True) -> Callable:
+    def encode(img: Image.Image) -> bytes:
+        if level is None and strategy == "default":
+            return encode_png(img) if indexed else _png_bytes(img, True)
+        params = {"compress_level": 9 if level is None else level, "compress_type": ZLIB_STRATEGIES[strategy]}
+        candidates = [img]
+        if indexed and img.mode in ("RGBA", "RGB", "LA", "L"):
+            candidates.append(to_indexed(img))
+        best = None
+        for candidate in candidates:
+            if candidate is None:
+                continue
+            buf = io.BytesIO()
+            candidate.save(buf, "PNG", **params)
+            if best is None or buf.tell() < len(best):
+                best = buf.getvalue()
+        return best
+    return encode
+
+
+def _webp_encoder(method: int = 6) -> Callable:
+    def encode(img: Image.Image) -> bytes:
+        buf = io.BytesIO()
+        # exact=True 保留全透明像素的 RGB，解码结果与源图逐字节一致
+        img.convert("RGBA").save(buf, "WEBP", lossless=True, quality=100, method=method, exact=True)
+        return buf.getvalue()
+    return encode
+
+
+def _raw_encode(img: Image.Image) -> bytes:
+    rgba = img.convert("RGBA")
+    return RAW_MAGIC + struct.pack("<II", rgba.width, rgba.height) + rgba.tobytes()
+
+
+def _raw_decode(data: bytes) -> Image.Image:
+    from PIL import Image
+
+    if data[:4] != RAW_MAGIC:
+        raise ValueError("不是 RGBA 转储")
+    w, h = struct.unpack("<II", data[4:12])
+    return Image.frombytes("RGBA", (w, h), data[12:])
+
+
+def _parse_params(spec: str) -> tuple:
+    name, _, rest = spec.partition(":")
+    params = {}
+    for item in filter(None, (part.strip() for part in rest.split(","))):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"编码参数应为 键=值: {item!r}（{spec}）")
+        params[key.strip()] = value.strip()
+    return name.strip(), params
+
+
+def get_encoder(spec: str = "png") -> Encoder:
+    """按规格字符串构造编码后端，未知名称或参数时 ValueError。"""
+    name, params = _parse_params(spec)
+    try:
+        if name == "png":
+            strategy = params.pop("strategy", "default")
+            if strategy not in ZLIB_STRATEGIES:
+                raise ValueError(f"未知 zlib 策略 {strategy!r}（可用: {', '.join(ZLIB_STRATEGIES)}）")
+            level = int(params.pop("level")) if "level" in params else None
+            if level is not None and not 0 <= level <= 9:
+                raise ValueError(f"zlib 级别须为 0..9: {level}")
+            indexed = params.pop("indexed", "1") not in ("0", "false", "no")
+            encoder = Encoder(spec, ".png", _png_encoder(level, strategy, indexed), _decode_image)
+        elif name == "webp":
+            method = int(params.pop("method", 6))
+            if not 0 <= method <= 6:
+                raise ValueError(f"WebP method 须为 0..6: {method}")
+            encoder = Encoder(spec, ".webp", _webp_encoder(method), _decode_image)
+        elif name == "raw":
+            encoder = Encoder(spec, ".rgba", _raw_encode, _raw_decode)
+        else:
+            raise ValueError(f"未知编码后端 {name!r}（可用: png、webp、raw）")
+    except KeyError as e:
+        raise ValueError(f"编码参数缺少值: {e}（{spec}）") from None
+    if params:
+        raise ValueError(f"{name} 不支持参数: {', '.join(params)}（{spec}）")
+    return encoder
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""导出构建清单：记录每个资源任务的内容哈希，供增量导出跳过未变化的资源。
+清单位于 assets/.export_manifest.json（以 . 开头，Godot 编辑器不会导入）。
+另提供资源索引 assets/asset_index.json 的单条目计算与导出后的条目刷新（asset_pipeline.py index 共用）。"""
+
+import functools
+import hashlib
+import inspect
+import io
+import json
+import types
+from pathlib import Path
+
+MANIFEST_NAME = ".export_manifest.json"
+ASSET_INDEX_NAME = "asset_index.json"
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _code_names(code: types.CodeType) -> list:
+    """收集函数体（含嵌套函数/推导式）引用的全局名。"""
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.extend(_code_names(const))
+    return names
+
+
+def _fingerprint(fn, seen: set, parts: list) -> None:
+    """递归收集生成函数及其引用的辅助函数源码、模块级数据常量，作为任务指纹的一部分。
+
+    被装饰器包装的函数（如 functools.lru_cache）按 __wrapped__ 解包后再收集，否则其源码与依赖会被漏掉。
+    """
+    fn = inspect.unwrap(fn)
+    if fn in seen:
+        return
+    seen.add(fn)
+    parts.append(f"{fn.__module__}.{fn.__qualname__}\n{inspect.getsource(fn)}")
+    for name in sorted(set(_code_names(fn.__code__))):
+        obj = fn.__globals__.get(name)
+        if callable(obj) and hasattr(obj, "__wrapped__"):
+            obj = inspect.unwrap(obj)
+        if isinstance(obj, types.FunctionType):
+            _fingerprint(obj, seen, parts)
+        elif isinstance(obj, (dict, list, tuple, int, float, str)):
+            # 形状表、配色表等数据常量改动也应使任务失效
+            parts.append(f"{name}={obj!r}")
+
+
+@functools.lru_cache(maxsize=None)
+def generator_fingerprint(generator) -> str:
+    """生成函数指纹（同一进程内缓存，多个任务共用同一生成函数时只解析一次源码）。"""
+    parts = []
+    _fingerprint(generator, set(), parts)
+    return sha256_bytes("\n".join(parts).encode("utf-8"))
+
+
+def job_hash(generator, args: tuple, make_opaque: bool, tool_version: str, inputs: tuple = ()) -> str:
+    """资源任务哈希：生成函数（及其依赖）源码 + 参数 + 工具版本 + 不透明标记 + 输入文件内容。
+
+    inputs 为相对项目根目录的路径；缺失的输入记为 missing，出现后任务即失效。
+    """
+    parts = [f"tool_version={tool_version}", f"args={args!r}", f"make_opaque={make_opaque}",
+             generator_fingerprint(generator)]
+    for rel in inputs:
+        path = PROJECT_ROOT / rel
+        parts.append(f"input {rel}=" + (sha256_bytes(path.read_bytes()) if path.is_file() else "missing"))
+    return sha256_bytes("\n".join(parts).encode("utf-8"))
+
+
+class BuildManifest:
+    """资源路径（相对 root）→ {"job": 任务哈希, "output": 输出文件哈希}。"""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.path = root / MANIFEST_NAME
+        self.entries = {}
+        if self.path.is_file():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8")).get("assets", {})
+            except (OSError, ValueError):
+                # 清单损坏时视为空清单，全部重建
+                self.entries = {}
+
+    def is_fresh(self, rel: str, job: str) -> bool:
+        """任务哈希一致且磁盘文件字节与上次写入一致时返回 True（可跳过渲染与写入）。"""
+        entry = self.entries.get(rel)
+        if entry is None or entry.get("job") != job:
+            return False
+        path = self.root / rel
+        return path.is_file() and sha256_bytes(path.read_bytes()) == entry.get("output")
+
+    def record(self, rel: str, job: str, data: bytes) -> None:
+        self.entries[rel] = {"job": job, "output": sha256_bytes(data)}
+
+    def prune(self, keep: set) -> list:
+        """移除不在 keep 中的条目；对应文件若仍是本工具上次写出的内容则一并删除。返回被移除的路径。"""
+        removed = []
+        for rel in sorted(set(self.entries) - keep):
+            path = self.root / rel
+            if path.is_file() and sha256_bytes(path.read_bytes()) == self.entries[rel].get("output"):
+                path.unlink()
+            del self.entries[rel]
+            removed.append(rel)
+        return removed
+
+    def save(self) -> None:
+        data = {"assets": dict(sorted(self.entries.items()))}
+        self.path.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
+
+
+def png_index_entry(raw: bytes) -> dict:
+    """PNG 字节的资源索引条目：尺寸、内容 sha256、alpha 包围盒 [x0, y0, x1, y1)（全透明为 null）。"""
+    from PIL import Image
+
+    from alpha_ops import alpha_bbox
+
+    with Image.open(io.BytesIO(raw)) as img:
+        size = list(img.size)
+        bbox = alpha_bbox(img)
+    return {"size": size, "sha256": sha256_bytes(raw), "alpha_bbox": list(bbox) if bbox else None}
+
+
+def refresh_asset_index(root: Path, written: dict) -> int:
+    """导出重写文件后更新 root/asset_index.json 中已有的对应条目（written 为相对 root 的路径 → 写出字节）。
+
+    尺寸、哈希、alpha 包围盒按新内容重算；trim、frames 只对 trim / compact 阶段的输出有效，导出写回的是
+    未裁边的网格精灵图，一并删除（需要时重新运行 process --stages trim,compact 与 index）。
+    无索引时不处理，返回更新的条目数。
+    """
+    path = root / ASSET_INDEX_NAME
+    if not path.is_file():
+        return 0
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assets = data.get("assets", {})
+    updated = 0
+    for rel, raw in written.items():
+        key = "res://assets/" + rel
+        entry = assets.get(key)
+        if entry is None or entry.get("sha256") == sha256_bytes(raw):
+            continue
+        for stale in ("trim", "frames"):
+            entry.pop(stale, None)
+        entry.update(png_index_entry(raw))
+        updated += 1
+    if updated:
+        path.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
+    return updated
@@ -0,0 +1,888 @@
+#!/usr/bin/env python3
+"""资源工具统一入口：一次遍历 assets/、每个 PNG 只解码一次，按阶段列表在内存中依次处理，最后只写一次盘。
+
+运行: python scripts/tools/asset_pipeline.py <子命令> [选项]
+  process --stages resize,opaque[,trim][,compact][,variants][,encode]  组合流水线（默认 resize,opaque）
+  opaque                                   等价于 process --stages opaque（替代 make_opaque.py 的全树扫描）
+  resize                                   等价于 process --stages resize（按 scripts/icon_spec.json）
+  export ...                               转交 export_pixel_assets.py（参数原样传递）
+  atlas ...                                转交 pack_atlas.py（参数原样传递）
+  verify [--diff-dir DIR]                  内存渲染全部导出资源并与已提交的 assets/ 逐像素比对，有差异时退出码 1
+  ingest SRC... --dest DIR                 大尺寸生成图（如 1024×1024）批量入库：缩小解码、去近似纯色背景、缩放到规格尺寸、
+                                           不透明化；有界进程池 + 在途任务上限，数百张的批次内存占用也不随批次增长
+  index                                    写出资源索引 assets/asset_index.json（尺寸、内容哈希、alpha 包围盒、图集区域）
+  encoders [--encoder SPEC ...]            用各编码后端（asset_encode.get_encoder）编码 assets/ 下全部 PNG 并解码回来，
+                                           报告总字节数、编码 / 解码耗时，并校验无损；[--repeat N] [--by-dir] [--json OUT]
+process 类子命令共用: [--include GLOB] [--exclude GLOB] [--jobs N] [--dry-run] [--config PATH] [--profile REPORT.jsonl]
+
+阶段（按给定顺序作用于内存中的同一张图）:
+  resize  属于 icon_spec.json 分类且尺寸不符的文件缩放到规格尺寸（规则同 resize_icons_to_spec.py）
+  opaque  含半透明像素的文件将非空白像素设为不透明（规则同 make_opaque.py）
+  trim    icon_spec.json trim.include 中的文件裁掉四周全透明边（保留 trim.padding 像素），原尺寸与偏移记入 assets/trim_index.json
+  compact 8 方向 × 3 状态精灵图去重：相同帧只存一份、排成横条，帧表（方向 × 状态 → 帧）记入 assets/sheet_index.json
+  variants 按 icon_spec.json 的 variants 分组，由当前图一次生成多尺寸派生图到 assets/variants/ 并更新尺寸索引
+  encode  只能放在最后：未被前面阶段修改的文件也用优化编码重写（仅在变小时写盘）
+任一阶段修改了图像时，用 asset_encode.encode_png（无损索引色 / optimize）编码后写盘一次。
+默认先 resize 后 opaque：Lanczos 缩放会在边缘重新产生半透明像素，放在 opaque 之前才能保证输出不透明。
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
+
+TOOLS_DIR = Path(__file__).resolve().parent
+# scripts/resize_icons_to_spec.py 不在 tools 目录，按路径导入
+sys.path.insert(0, str(TOOLS_DIR.parent))
+
+from asset_profile import AssetProfiler, StageTimer, add_profile_args  # noqa: E402
+from asset_select import is_generated, select_pngs  # noqa: E402
+
+PROJECT_ROOT = TOOLS_DIR.parent.parent
+ASSETS = PROJECT_ROOT / "assets"
+DEFAULT_CONFIG = PROJECT_ROOT / "scripts" / "icon_spec.json"
+DEFAULT_STAGES = "resize,opaque"
+ASSET_INDEX = ASSETS / "asset_index.json"
+# 记录 AI 重生成/手工替换资源的文档：表格中列出的 PNG 不再由导出脚本负责，verify 默认跳过
+REPLACED_ASSETS_DOC = PROJECT_ROOT / "docs" / "PIXELLAB_REPLACED_ASSETS.md"
+
+
+class AssetContext:
+    """流水线中单个文件的状态：相对 assets/ 的路径、内存中的图像、配置与各阶段留下的说明。
+
+    outputs 为阶段产生的派生文件 [(相对 assets/ 的路径, 图像)]；meta 为阶段元数据（汇总后写入索引等）。
+    """
+
+    def __init__(self, rel: str, img, config: dict):
+        self.rel = rel
+        self.img = img
+        self.config = config
+        self.notes = []
+        self.outputs = []
+        self.meta = {}
+
+    @property
+    def project_rel(self) -> str:
+        return "assets/" + self.rel
+
+
+def stage_resize(ctx: AssetContext) -> str | None:
+    from resize_icons_to_spec import category_for, resize_image
+
+    category = category_for(ctx.project_rel, ctx.config["categories"])
+    if category is None:
+        return None
+    spec = ctx.config["categories"][category]
+    size = spec["size"]
+    if ctx.img.size == (size, size):
+        return None
+    old = ctx.img.size
+    ctx.img = resize_image(ctx.img.convert("RGBA"), size, spec, ctx.config.get("painted_min_size", 256))
+    return "resize %dx%d -> %dx%d" % (old + ctx.img.size)
+
+
+def stage_opaque(ctx: AssetContext) -> str | None:
+    from alpha_ops import force_opaque, has_partial_alpha
+
+    if not has_partial_alpha(ctx.img):
+        return None
+    ctx.img = force_opaque(ctx.img)
+    return "opaque"
+
+
+def stage_trim(ctx: AssetContext) -> str | None:
+    """裁到 alpha 包围盒（四周各留 padding）；全透明或已无可裁边时不改动。偏移记入 ctx.meta["trim"]。
+
+    只裁 trim.include 列出的文件（需为经 VisualAssetRegistry.get_texture_cached 加载的资源，才能按 trim 索引补回
+    原尺寸与偏移；直接 load() 的贴图、图集等裁了会错位）。icon_spec.json 分类内的图标有固定规格尺寸、
+    trim.exclude（精灵表、地形块等）按格切分，即使匹配 include 也不裁。
+    """
+    from alpha_ops import trim_box
+    from resize_icons_to_spec import category_for
+
+    tconf = ctx.config.get("trim", {})
+    path = PurePosixPath(ctx.project_rel)
+    if not any(path.match(p) for p in tconf.get("include", [])):
+        return None
+    if category_for(ctx.project_rel, ctx.config["categories"]) or any(path.match(p) for p in tconf.get("exclude", [])):
+        return None
+    box = trim_box(ctx.img, tconf.get("padding", 0))
+    if box is None or box == (0, 0, ctx.img.width, ctx.img.height):
+        return None
+    ctx.meta["trim"] = {"source_size": list(ctx.img.size), "offset": [box[0], box[1]]}
+    ctx.img = ctx.img.crop(box)
+    return "trim %dx%d -> %dx%d" % (ctx.meta["trim"]["source_size"][0], ctx.meta["trim"]["source_size"][1],
+                                    ctx.img.width, ctx.img.height)
+
+
+def load_trim_index(config: dict) -> dict:
+    """res 路径 → {source_size, offset, sha256}；sha256 为裁边后写出文件的哈希。"""
+    path = PROJECT_ROOT / config.get("trim", {}).get("index", "assets/trim_index.json")
+    return json.loads(path.read_text(encoding="utf-8")) if path.is_file() else {}
+
+
+def write_trim_index(config: dict, metas: dict, dry_run: bool) -> None:
+    """合并本次裁边结果。若输入正是上次裁边写出的文件（哈希一致），偏移在原记录上累加，原尺寸保持最初值。"""
+    path = PROJECT_ROOT / config.get("trim", {}).get("index", "assets/trim_index.json")
+    index = load_trim_index(config)
+    for rel, meta in metas.items():
+        trim = meta.get("trim")
+        if trim is None:
+            continue
+        key = res_path(rel)
+        prev = index.get(key)
+        if prev and prev.get("sha256") == meta.get("input_sha256"):
+            trim = {"source_size": prev["source_size"],
+                    "offset": [prev["offset"][0] + trim["offset"][0], prev["offset"][1] + trim["offset"][1]]}
+        index[key] = {**trim, "sha256": meta["output_sha256"]}
+    index = {k: v for k, v in sorted(index.items()) if (PROJECT_ROOT / k[len("res://"):]).is_file()}
+    if not dry_run:
+        path.write_text(json.dumps(index, indent=1) + "\n", encoding="utf-8")
+    print(f"trim 索引: {len(index)} 个文件 -> {path.relative_to(PROJECT_ROOT).as_posix()}" + ("  [dry-run]" if dry_run else ""))
+
+
+def stage_compact(ctx: AssetContext) -> str | None:
+    """精灵图帧去重：按 sheet_builder 的 8 方向 × 3 状态网格切格，唯一帧排成横条，帧表记入 ctx.meta["compact"]。
+
+    只处理 compact.include 匹配的文件；已是横条（格子非正方形）或没有重复帧时不改动。
+    压缩后的精灵图需按资源索引中的帧表取 region（VisualAssetRegistry.get_sheet_region），不能再按网格计算。
+    """
+    from sheet_builder import compact_sheet
+
+    path = PurePosixPath(ctx.project_rel)
+    if not any(path.match(p) for p in ctx.config.get("compact", {}).get("include", [])):
+        return None
+    result = compact_sheet(ctx.img)
+    if result is None:
+        return None
+    strip, frames = result
+    cells = sum(len(row) for row in frames)
+    count = strip.width // strip.height
+    if count == cells:
+        return None
+    old = ctx.img.size
+    ctx.img = strip
+    ctx.meta["compact"] = {"frame_size": [strip.height, strip.height], "frames": frames}
+    return "compact %dx%d -> %dx%d（%d 格 -> %d 帧）" % (old + strip.size + (cells, count))
+
+
+def load_compact_index(config: dict) -> dict:
+    """res 路径 → {frame_size, frames, sha256}；sha256 为压缩后写出文件的哈希。"""
+    path = PROJECT_ROOT / config.get("compact", {}).get("index", "assets/sheet_index.json")
+    return json.loads(path.read_text(encoding="utf-8")) if path.is_file() else {}
+
+
+def write_compact_index(config: dict, metas: dict, dry_run: bool) -> None:
+    """合并本次压缩结果；源文件已删除的条目一并移除。"""
+    path = PROJECT_ROOT / config.get("compact", {}).get("index", "assets/sheet_index.json")
+    index = load_compact_index(config)
+    for rel, meta in metas.items():
+        if "compact" in meta:
+            index[res_path(rel)] = {**meta["compact"], "sha256": meta["output_sha256"]}
+    index = {k: v for k, v in sorted(index.items()) if (PROJECT_ROOT / k[len("res://"):]).is_file()}
+    if not dry_run:
+        path.write_text(json.dumps(index, indent=1) + "\n", encoding="utf-8")
+    print(f"compact 索引: {len(index)} 个文件 -> {path.relative_to(PROJECT_ROOT).as_posix()}" + ("  [dry-run]" if dry_run else ""))
+
+
+def res_path(rel: str) -> str:
+    return "res://assets/" + rel
+
+
+def _assets_rel(project_rel: str) -> str:
+    """配置中相对项目根目录的 assets/ 子路径 → 相对 assets/ 的路径。"""
+    return PurePosixPath(project_rel).relative_to("assets").as_posix()
+
+
+def _variant_size(src_size: tuple, edge: int) -> tuple:
+    """长边缩放到 edge、保持宽高比的尺寸。"""
+    w, h = src_size
+    scale = edge / max(w, h)
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+
+def stage_variants(ctx: AssetContext) -> str | None:
+    """生成多尺寸派生图（不修改 ctx.img）。
+
+    sizes：长边目标尺寸；不大于原图的尺寸从大到小逐级由上一级缩得（金字塔），大于原图的用最近邻放大。
+    scales：整数倍最近邻放大（像素风精灵图）。派生图写到 variants.output 下同名子目录，命名 <名>_<W>x<H>.png。
+    """
+    from PIL import Image
+
+    from alpha_ops import force_opaque
+    from resize_icons_to_spec import FILTERS, category_for
+
+    vconf = ctx.config.get("variants")
+    group = category_for(ctx.project_rel, vconf["groups"]) if vconf else None
+    if group is None:
+        return None
+    spec = vconf["groups"][group]
+    src = ctx.img.convert("RGBA")
+    levels = []
+    prev = src
+    for edge in sorted(set(spec.get("sizes", [])), reverse=True):
+        size = _variant_size(src.size, edge)
+        if size == src.size:
+            continue
+        if max(size) > max(src.size):
+            levels.append(src.resize(size, Image.Resampling.NEAREST))
+        else:
+            prev = prev.resize(size, FILTERS[spec.get("filter", "lanczos")])
+            levels.append(prev)
+    for k in spec.get("scales", []):
+        levels.append(src.resize((src.width * k, src.height * k), Image.Resampling.NEAREST))
+    if spec.get("opaque"):
+        # 缩小滤波会在边缘产生半透明像素，与 opaque 阶段规则一致地处理
+        levels = [force_opaque(img) for img in levels]
+    out_dir = PurePosixPath(_assets_rel(vconf["output"])) / PurePosixPath(ctx.rel).parent
+    stem = PurePosixPath(ctx.rel).stem
+    index = {"%dx%d" % src.size: res_path(ctx.rel)}
+    for img in levels:
+        rel = (out_dir / f"{stem}_{img.width}x{img.height}.png").as_posix()
+        ctx.outputs.append((rel, img))
+        index["%dx%d" % img.size] = res_path(rel)
+    ctx.meta["variants"] = index
+    return None
+
+
+def write_variants_index(config: dict, metas: dict, dry_run: bool) -> None:
+    """合并本次处理文件的派生图条目到尺寸索引；删除已不在配置中的旧派生图。"""
+    vconf = config.get("variants")
+    if not vconf:
+        return
+    path = PROJECT_ROOT / vconf["index"]
+    index = json.loads(path.read_text(encoding="utf-8")) if path.is_file() else {}
+    for rel, meta in metas.items():
+        key = res_path(rel)
+        new = meta.get("variants")
+        for old_res in set(index.get(key, {}).values()) - set((new or {}).values()):
+            stale = PROJECT_ROOT / old_res[len("res://"):]
+            if not dry_run and stale.is_file():
+                stale.unlink()
+        if new is None:
+            index.pop(key, None)
+        else:
+            index[key] = dict(sorted(new.items(), key=lambda kv: [int(v) for v in kv[0].split("x")]))
+    # 源文件已删除的条目一并移除
+    index = {k: v for k, v in sorted(index.items()) if (PROJECT_ROOT / k[len("res://"):]).is_file()}
+    if not dry_run:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(index, indent=1) + "\n", encoding="utf-8")
+    print(f"variants 索引: {len(index)} 个源文件 -> {vconf['index']}" + ("  [dry-run]" if dry_run else ""))
+
+
+# 阶段名 → 处理函数：函数就地更新 ctx.img，修改了图像时返回说明文本，否则返回 None
+STAGES = {
+    "resize": stage_resize,
+    "opaque": stage_opaque,
+    "trim": stage_trim,
+    "compact": stage_compact,
+    "variants": stage_variants,
+}
+# 阶段名 → 汇总函数 (config, {相对路径: meta}, dry_run)：全部文件处理完后在主进程中执行一次
+FINALIZERS = {
+    "trim": write_trim_index,
+    "compact": write_compact_index,
+    "variants": write_variants_index,
+}
+# 终结阶段：不修改像素，只决定是否对未改动的文件也重新编码
+ENCODE_STAGE = "encode"
+
+
+def parse_stages(text: str) -> tuple:
+    """解析逗号分隔的阶段列表，返回 (图像阶段名列表, 是否含 encode)。"""
+    names = [s.strip() for s in text.split(",") if s.strip()]
+    recompress = ENCODE_STAGE in names
+    if recompress and names[-1] != ENCODE_STAGE:
+        raise SystemExit(f"{ENCODE_STAGE} 阶段只能放在最后: {text}")
+    names = [n for n in names if n != ENCODE_STAGE]
+    unknown = [n for n in names if n not in STAGES]
+    if unknown:
+        raise SystemExit(f"未知阶段: {', '.join(unknown)}（可用: {', '.join(list(STAGES) + [ENCODE_STAGE])}）")
+    return names, recompress
+
+
+def process_file(rel: str, stages: list, recompress: bool, config: dict, dry_run: bool = False) -> tuple:
+    """解码一次、依次执行阶段、至多写盘一次。
+
+    返回 (状态, 原字节数, 新字节数, 说明列表, 各阶段耗时, 像素数, 阶段元数据)；状态为 modified / clean / error。
+    派生文件（ctx.outputs）内容与磁盘一致时不重写。
+    """
+    from PIL import Image
+
+    from asset_encode import encode_png
+
+    path = ASSETS / rel
+    timer = StageTimer()
+    try:
+        raw = path.read_bytes()
+        with timer.stage("decode"):
+            # 从已读入的字节解码：读盘一次，原字节数与"仅重新编码"比较都复用 raw
+            img = Image.open(io.BytesIO(raw))
+            img.load()
+        ctx = AssetContext(rel, img, config)
+        pixels = ctx.img.width * ctx.img.height
+        for name in stages:
+            with timer.stage(name):
+                note = STAGES[name](ctx)
+            if note:
+                ctx.notes.append(note)
+        new_size = len(raw)
+        if ctx.notes or recompress:
+            with timer.stage("encode"):
+                data = encode_png(ctx.img)
+            # 仅重新编码时只在确实变小时写盘，避免无谓地触发 Godot 重新导入
+            if ctx.notes or len(data) < len(raw):
+                if not ctx.notes:
+                    ctx.notes.append("encode")
+                new_size = len(data)
+                if "trim" in ctx.meta or "compact" in ctx.meta:
+                    ctx.meta["input_sha256"] = hashlib.sha256(raw).hexdigest()
+                    ctx.meta["output_sha256"] = hashlib.sha256(data).hexdigest()
+                if not dry_run:
+                    with timer.stage("write"):
+                        path.write_bytes(data)
+        written = 0
+        for out_rel, out_img in ctx.outputs:
+            with timer.stage("encode"):
+                data = encode_png(out_img)
+            out_path = ASSETS / out_rel
+            if out_path.is_file() and out_path.read_bytes() == data:
+                continue
+            written += 1
+            if not dry_run:
+                with timer.stage("write"):
+                    out_path.parent.mkdir(parents=True, exist_ok=True)
+                    out_path.write_bytes(data)
+        if written:
+            ctx.notes.append(f"派生文件 {written}/{len(ctx.outputs)}")
+        status = "modified" if ctx.notes else "clean"
+        return status, len(raw), new_size, ctx.notes, timer.stages, pixels, ctx.meta
+    except Exception as e:
+        return "error", 0, 0, [str(e)], timer.stages, 0, {}
+
+
+def _process_args(args: tuple) -> tuple:
+    return process_file(*args)
+
+
+def run_process(opts, stage_text: str) -> int:
+    from resize_icons_to_spec import load_config
+
+    stages, recompress = parse_stages(stage_text)
+    profiler = AssetProfiler.from_args(opts)
+    profiler.start()
+    if not ASSETS.exists():
+        print(f"assets 目录不存在: {ASSETS}")
+        return 1
+    config = load_config(opts.config)
+    # 派生输出不参与阶段处理（预烘焙图集等由 asset_select.SKIP_GLOBS 统一跳过）
+    skip_dirs = (_assets_rel(config["variants"]["output"]),) if config.get("variants") else ()
+    rels = select_pngs(opts.include, opts.exclude, skip_dirs)
+    tasks = [(rel, stages, recompress, config, opts.dry_run) for rel in rels]
+    workers = min(opts.jobs if opts.jobs > 0 else (os.cpu_count() or 1), max(len(tasks), 1))
+    t0 = time.perf_counter()
+    if workers <= 1:
+        results = [_process_args(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map 按提交顺序返回，日志顺序与文件排序一致
+            results = list(pool.map(_process_args, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    counts = {"modified": 0, "clean": 0, "error": 0}
+    old_total = new_total = 0
+    metas = {}
+    for rel, (status, old_size, new_size, notes, timings, pixels, meta) in zip(rels, results):
+        if status != "error":
+            metas[rel] = meta
+        counts[status] += 1
+        profiler.add(rel, timings, pixels, new_size if status == "modified" and not opts.dry_run else 0, status=status)
+        if status == "modified":
+            old_total += old_size
+            new_total += new_size
+            print(f"  {'将修改' if opts.dry_run else '已修改'} assets/{rel} [{'; '.join(notes)}] ({old_size} -> {new_size} B)")
+        elif status == "error":
+            print(f"  跳过 assets/{rel}: {notes[0]}")
+    print(f"[{','.join(stages + ([ENCODE_STAGE] if recompress else []))}] 扫描 {len(rels)} 个 PNG "
+          f"（{time.perf_counter() - t0:.2f}s）：修改 {counts['modified']}，未变 {counts['clean']}，出错 {counts['error']}；"
+          f"字节变化 {old_total} -> {new_total} ({new_total - old_total:+d} B)" + ("  [dry-run]" if opts.dry_run else ""))
+    for name in stages:
+        if name in FINALIZERS:
+            FINALIZERS[name](config, metas, opts.dry_run)
+    profiler.finish()
+    return 1 if counts["error"] else 0
+
+
+INGEST_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+# 入库工作进程每处理这么多张图后重建，避免长批次中解码缓冲的内存碎片逐渐累积
+INGEST_TASKS_PER_CHILD = 64
+
+
+def ingest_file(src: Path, dest: Path, spec: dict, painted_min_size: int, tolerance: int | None,
+                dry_run: bool = False) -> tuple:
+    """单张大图入库：缩小解码 → 去近似纯色背景 → 缩放到规格尺寸 → 不透明化 → 编码写盘。
+
+    返回 (状态, 说明列表, 写出字节数, 各阶段耗时, 源像素数)；状态为 written / clean / error。
+    tolerance 为 None 时不去背景。缩放在不透明化之前，理由同 process 的默认阶段顺序。
+    """
+    from PIL import Image
+
+    from alpha_ops import border_background, force_opaque, remove_background
+    from asset_encode import encode_png
+    from resize_icons_to_spec import FILTERS
+
+    size = spec["size"]
+    timer = StageTimer()
+    try:
+        with timer.stage("decode"), Image.open(src) as im:
+            pixels = im.width * im.height
+            painted = max(im.size) >= spec.get("painted_min_size", painted_min_size)
+            notes = ["%dx%d -> %dx%d" % (im.size + (size, size))]
+            # JPEG 解码时直接按 1/2～1/8 缩小（PNG/WebP 为空操作）
+            im.draft("RGB", (size * 2, size * 2))
+            img = im.convert("RGBA")
+        if painted:
+            # 绘制风大图先整数倍 reduce 到约 2 倍目标尺寸，后续阶段都在小图上进行，原尺寸像素随即释放
+            with timer.stage("reduce"):
+                factor = min(img.size) // (size * 2)
+                if factor >= 2:
+                    img = img.reduce(factor)
+        if tolerance is not None:
+            with timer.stage("background"):
+                color = border_background(img, tolerance)
+                if color is not None:
+                    img = remove_background(img, color, tolerance)
+                    notes.append("去背景 #%02x%02x%02x" % color)
+        with timer.stage("resize"):
+            name = spec.get("painted_filter", "lanczos") if painted else spec.get("pixel_art_filter", "nearest")
+            img = img.resize((size, size), FILTERS[name])
+        with timer.stage("opaque"):
+            img = force_opaque(img)
+        with timer.stage("encode"):
+            data = encode_png(img)
+        if dest.is_file() and dest.read_bytes() == data:
+            return "clean", notes, 0, timer.stages, pixels
+        if not dry_run:
+            with timer.stage("write"):
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                dest.write_bytes(data)
+        return "written", notes, len(data), timer.stages, pixels
+    except Exception as e:
+        return "error", [str(e)], 0, timer.stages, 0
+
+
+def _ingest_args(args: tuple) -> tuple:
+    return ingest_file(*args)
+
+
+def bounded_map(fn, tasks: list, workers: int, window: int):
+    """按提交顺序逐个产出 fn(task)；同时在途（已提交未取回）的任务不超过 window，
+    结果取回后即可释放，数百张图的批次内存占用与批次大小无关。"""
+    if workers <= 1:
+        for task in tasks:
+            yield fn(task)
+        return
+    from collections import deque
+
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=INGEST_TASKS_PER_CHILD) as pool:
+        pending = deque()
+        for task in tasks:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(pool.submit(fn, task))
+        while pending:
+            yield pending.popleft().result()
+
+
+def collect_sources(paths: list) -> list:
+    """展开命令行给出的文件/目录（目录取其下一层的图片），排序去重。"""
+    result = set()
+    for path in paths:
+        if path.is_dir():
+            result.update(p for p in path.iterdir() if p.is_file() and p.suffix.lower() in INGEST_SUFFIXES)
+        elif path.is_file():
+            result.add(path)
+        else:
+            print(f"  跳过不存在的路径: {path}")
+    return sorted(result)
+
+
+def _display_path(path: Path) -> str:
+    """项目内的路径显示为相对项目根目录，项目外的保持绝对路径。"""
+    return path.relative_to(PROJECT_ROOT).as_posix() if path.is_relative_to(PROJECT_ROOT) else str(path)
+
+
+def run_ingest(opts) -> int:
+    from resize_icons_to_spec import category_for, load_config
+
+    config = load_config(opts.config)
+    painted_min_size = config.get("painted_min_size", 256)
+    dest_dir = (opts.dest if opts.dest.is_absolute() else PROJECT_ROOT / opts.dest).resolve()
+    # 规格分类按相对项目根目录的输出路径匹配，项目外的输出目录无从查找，须显式给出尺寸
+    if not opts.size and not dest_dir.is_relative_to(PROJECT_ROOT):
+        raise SystemExit(f"输出目录 {dest_dir} 不在项目内，无法按 icon_spec.json 分类确定尺寸，请用 --size 指定")
+    profiler = AssetProfiler.from_args(opts)
+    profiler.start()
+    tolerance = None if opts.keep_background else opts.tolerance
+    tasks = []
+    for src in collect_sources(opts.sources):
+        dest = dest_dir / (src.stem + ".png")
+        if opts.size:
+            spec = {"size": opts.size}
+        else:
+            rel = dest.relative_to(PROJECT_ROOT).as_posix()
+            category = category_for(rel, config["categories"])
+            if category is None:
+                print(f"  跳过 {src.name}: {rel} 不属于 icon_spec.json 任何分类，请用 --size 指定")
+                continue
+            spec = config["categories"][category]
+        tasks.append((src, dest, spec, painted_min_size, tolerance, opts.dry_run))
+    workers = min(opts.jobs if opts.jobs > 0 else (os.cpu_count() or 1), max(len(tasks), 1))
+    window = opts.window or workers * 2
+    t0 = time.perf_counter()
+    counts = {"written": 0, "clean": 0, "error": 0}
+    for (src, dest, *_), (status, notes, nbytes, timings, pixels) in zip(
+            tasks, bounded_map(_ingest_args, tasks, workers, window)):
+        counts[status] += 1
+        rel = _display_path(dest)
+        profiler.add(src.name, timings, pixels, nbytes if not opts.dry_run else 0, status=status)
+        if status == "written":
+            print(f"  {'将写入' if opts.dry_run else '已写入'} {rel} <- {src.name} [{'; '.join(notes)}] ({nbytes} B)")
+        elif status == "error":
+            print(f"  跳过 {src.name}: {notes[0]}")
+    print(f"ingest: {len(tasks)} 张源图（{workers} 进程，在途上限 {window}，{time.perf_counter() - t0:.2f}s）："
+          f"写入 {counts['written']}，未变 {counts['clean']}，出错 {counts['error']}" + ("  [dry-run]" if opts.dry_run else ""))
+    profiler.finish()
+    return 1 if counts["error"] else 0
+
+
+def replaced_assets() -> set:
+    """从 PIXELLAB_REPLACED_ASSETS.md 表格中读取已替换资源的 ID（相对 assets/、去掉 .png）。"""
+    if not REPLACED_ASSETS_DOC.is_file():
+        return set()
+    text = REPLACED_ASSETS_DOC.read_text(encoding="utf-8")
+    return set(re.findall(r"^\|\s*assets/(\S+)\.png\s*\|", text, flags=re.MULTILINE))
+
+
+def _diff_mask(a, b):
+    """两张同尺寸 RGBA 图的差异遮罩（L 模式）：任一通道不同的像素非 0。整图 C 层运算，不逐像素循环。"""
+    from PIL import ImageChops
+
+    r, g, bl, al = ImageChops.difference(a, b).split()
+    return ImageChops.lighter(ImageChops.lighter(r, g), ImageChops.lighter(bl, al))
+
+
+def _diff_image(ref, mask):
+    """差异高亮图：已提交版本转灰并压暗作底，差异像素标红。"""
+    from PIL import Image
+
+    base = Image.merge("RGB", [ref.convert("L").point(lambda v: v // 3)] * 3).convert("RGBA")
+    base.paste((255, 0, 64, 255), (0, 0, base.width, base.height), mask.point([0] + [255] * 255))
+    return base
+
+
+def verify_asset(asset: str, diff_dir: Path | None = None, compact: dict | None = None) -> tuple:
+    """内存渲染单个资源并与已提交文件比对。compact 为该文件的帧去重记录，文件仍是压缩结果时先展开回网格再比对。
+
+    返回 (状态, 差异像素数, 差异包围盒, 说明)；状态为 ok / diff / size / missing / error。
+    """
+    from PIL import Image
+
+    import export_pixel_assets as exporter
+    from sheet_builder import expand_sheet
+
+    try:
+        img = exporter.render(asset).convert("RGBA")
+        path = ASSETS / f"{asset}.png"
+        if not path.is_file():
+            return "missing", 0, None, "未提交"
+        raw = path.read_bytes()
+        with Image.open(io.BytesIO(raw)) as src:
+            ref = src.convert("RGBA")
+        if compact and compact.get("sha256") == hashlib.sha256(raw).hexdigest():
+            ref = expand_sheet(ref, compact["frames"], *compact["frame_size"])
+        if ref.size != img.size:
+            return "size", img.width * img.height, None, "已提交 %dx%d，渲染 %dx%d" % (ref.size + img.size)
+        mask = _diff_mask(img, ref)
+        bbox = mask.getbbox()
+        if bbox is None:
+            return "ok", 0, None, ""
+        count = mask.width * mask.height - mask.histogram()[0]
+        note = ""
+        if diff_dir is not None:
+            out = diff_dir / f"{asset}.diff.png"
+            out.parent.mkdir(parents=True, exist_ok=True)
+            _diff_image(ref, mask).save(out)
+            note = str(out)
+        return "diff", count, bbox, note
+    except Exception as e:
+        return "error", 0, None, str(e)
+
+
+def _verify_args(args: tuple) -> tuple:
+    return verify_asset(*args)
+
+
+def run_verify(opts) -> int:
+    import export_pixel_assets as exporter
+
+    skipped = set() if opts.include_replaced else replaced_assets()
+    ids = []
+    for asset in exporter.asset_ids():
+        rel = f"{asset}.png"
+        if opts.include and not any(fnmatch.fnmatch(rel, pat) for pat in opts.include):
+            continue
+        if any(fnmatch.fnmatch(rel, pat) for pat in opts.exclude) or asset in skipped:
+            continue
+        ids.append(asset)
+    from resize_icons_to_spec import load_config
+
+    diff_dir = opts.diff_dir.resolve() if opts.diff_dir else None
+    compacts = load_compact_index(load_config(opts.config))
+    tasks = [(asset, diff_dir, compacts.get(res_path(f"{asset}.png"))) for asset in ids]
+    workers = min(opts.jobs if opts.jobs > 0 else (os.cpu_count() or 1), max(len(tasks), 1))
+    t0 = time.perf_counter()
+    if workers <= 1:
+        results = [_verify_args(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_verify_args, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    failed = 0
+    for asset, (status, count, bbox, note) in zip(ids, results):
+        if status == "ok":
+            continue
+        failed += 1
+        if status == "diff":
+            print(f"  DIFF    assets/{asset}.png: {count} px, bbox {bbox}" + (f" -> {note}" if note else ""))
+        else:
+            print(f"  {status.upper():<7} assets/{asset}.png: {note}")
+    print(f"verify: {len(ids)} 个资源（跳过已替换 {len(skipped & set(exporter.asset_ids()))}），"
+          f"不一致 {failed}（{time.perf_counter() - t0:.2f}s）")
+    return 1 if failed else 0
+
+
+def index_entry(rel: str) -> dict:
+    """单个 PNG 的索引条目：尺寸、内容 sha256、alpha 包围盒 [x0, y0, x1, y1)（全透明为 null）。"""
+    from asset_manifest import png_index_entry
+
+    return png_index_entry((ASSETS / rel).read_bytes())
+
+
+def _atlas_regions() -> tuple:
+    """读取 pack_atlas.py 写出的各分组区域表，返回 (小图 res 路径 → {atlas, region, margin?}, 路径 → 打包时源文件 sha256)。"""
+    from pack_atlas import ATLAS_DIR
+
+    regions = {}
+    sources = {}
+    for table in sorted(ATLAS_DIR.glob("*.json")):
+        data = json.loads(table.read_text(encoding="utf-8"))
+        margins = data.get("margins", {})
+        for src_res, region in data.get("regions", {}).items():
+            regions[src_res] = {"atlas": data["atlas"], "region": region}
+            if src_res in margins:
+                regions[src_res]["margin"] = margins[src_res]
+            sources[src_res] = data.get("sources", {}).get(src_res)
+    return regions, sources
+
+
+def run_index(opts) -> int:
+    """一次遍历 assets/ 生成资源索引，供 VisualAssetRegistry O(1) 判断路径是否存在并批量预加载。
+
+    预烘焙 UI 图集、地形图集等生成图集虽不参与阶段处理，也必须收录：索引存在时导出版本只加载索引中的 PNG，
+    缺了它们相应功能会静默退回运行时生成。已生成的图集被 --include / --exclude 滤掉时报错且不写出索引。
+    """
+    rels = select_pngs(opts.include, opts.exclude, skip_generated=False)
+    missing = [rel for rel in select_pngs([], [], skip_generated=False) if is_generated(rel) and rel not in rels]
+    if missing:
+        print(f"index: 生成图集未收录，不写出索引: {', '.join(missing)}")
+        return 1
+    workers = min(opts.jobs if opts.jobs > 0 else (os.cpu_count() or 1), max(len(rels), 1))
+    t0 = time.perf_counter()
+    if workers <= 1:
+        entries = [index_entry(rel) for rel in rels]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            entries = list(pool.map(index_entry, rels, chunksize=max(1, len(rels) // (workers * 4))))
+    from resize_icons_to_spec import load_config
+
+    regions, sources = _atlas_regions()
+    config = load_config(opts.config)
+    trims = load_trim_index(config)
+    compacts = load_compact_index(config)
+    assets = {}
+    for rel, entry in zip(rels, entries):
+        key = res_path(rel)
+        # 图集区域只对打包时的源文件有效（之后重新导出或裁边则忽略，需重新运行 pack_atlas.py）
+        if key in regions and sources[key] == entry["sha256"]:
+            entry["atlas"] = regions[key]
+        # 裁边记录只对仍是裁边结果的文件有效（之后被替换则忽略）
+        if key in trims and trims[key].get("sha256") == entry["sha256"]:
+            entry["trim"] = {"source_size": trims[key]["source_size"], "offset": trims[key]["offset"]}
+        if key in compacts and compacts[key].get("sha256") == entry["sha256"]:
+            entry["frames"] = {"frame_size": compacts[key]["frame_size"], "frames": compacts[key]["frames"]}
+        assets[key] = entry
+    out = opts.output.resolve()
+    out.write_text(json.dumps({"version": 1, "assets": assets}, indent=1) + "\n", encoding="utf-8")
+    print(f"index: {len(assets)} 个 PNG（图集区域 {sum('atlas' in e for e in assets.values())}）-> {out}"
+          f"（{time.perf_counter() - t0:.2f}s）")
+    return 0
+
+
+# encoders 子命令默认比较的后端：当前默认编码、未做索引色的 RGBA PNG、快速 zlib、无损 WebP 两档、原始 RGBA
+DEFAULT_BENCH_ENCODERS = ["png", "png:level=6,indexed=0", "png:level=1,strategy=rle", "webp", "webp:method=0", "raw"]
+
+
+def bench_file(rel: str, encoders: list, repeat: int) -> list:
+    """用每个后端编码 / 解码单个 PNG，返回 [(字节数, 编码秒, 解码秒, 是否无损)]；耗时取 repeat 次中的最小值。"""
+    from PIL import Image
+
+    with Image.open(ASSETS / rel) as src:
+        rgba = src.convert("RGBA")
+    expected = rgba.tobytes()
+    results = []
+    for encoder in encoders:
+        encode_s = decode_s = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            data = encoder.encode(rgba)
+            t1 = time.perf_counter()
+            decoded = encoder.decode(data)
+            t2 = time.perf_counter()
+            encode_s, decode_s = min(encode_s, t1 - t0), min(decode_s, t2 - t1)
+        results.append((len(data), encode_s, decode_s, decoded.tobytes() == expected))
+    return results
+
+
+def run_encoders(opts) -> int:
+    """编码后端基准：单进程逐文件测量（避免进程间争用影响耗时），按后端汇总；有非无损结果时退出码 1。"""
+    from asset_encode import get_encoder
+
+    specs = opts.encoder or DEFAULT_BENCH_ENCODERS
+    try:
+        encoders = [get_encoder(spec) for spec in specs]
+    except ValueError as e:
+        raise SystemExit(str(e))
+    rels = select_pngs(opts.include, opts.exclude)
+    t0 = time.perf_counter()
+    per_file = {rel: bench_file(rel, encoders, max(opts.repeat, 1)) for rel in rels}
+    source_bytes = sum((ASSETS / rel).stat().st_size for rel in rels)
+    groups = {"*": rels}
+    if opts.by_dir:
+        for rel in rels:
+            groups.setdefault(rel.split("/")[0] if "/" in rel else ".", []).append(rel)
+    report = {"files": len(rels), "source_bytes": source_bytes, "repeat": max(opts.repeat, 1), "encoders": {}}
+    print(f"encoders: {len(rels)} 个 PNG，磁盘上共 {source_bytes} B（编码 / 解码耗时取 {report['repeat']} 次最小值）")
+    print(f"  {'后端':<28}{'目录':<14}{'字节':>10}{'比例':>8}{'编码 ms':>10}{'解码 ms':>10}  无损")
+    failures = 0
+    for i, encoder in enumerate(encoders):
+        entry = {}
+        for group, members in groups.items():
+            rows = [per_file[rel][i] for rel in members]
+            size = sum(r[0] for r in rows)
+            base = source_bytes if group == "*" else sum((ASSETS / rel).stat().st_size for rel in members)
+            lossy = [rel for rel, r in zip(members, rows) if not r[3]]
+            entry[group] = {"bytes": size, "encode_ms": sum(r[1] for r in rows) * 1000,
+                            "decode_ms": sum(r[2] for r in rows) * 1000, "lossy": lossy}
+            ratio = f"{size / base:.2f}x" if base else "n/a"
+            print(f"  {encoder.spec:<28}{group:<14}{size:>10}{ratio:>8}{entry[group]['encode_ms']:>10.1f}"
+                  f"{entry[group]['decode_ms']:>10.1f}  {'是' if not lossy else f'否（{len(lossy)} 个）'}")
+        failures += len(entry["*"]["lossy"])
+        for rel in entry["*"]["lossy"]:
+            print(f"    LOSSY assets/{rel}")
+        report["encoders"][encoder.spec] = entry
+    if opts.json:
+        opts.json.write_text(json.dumps(report, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"报告 -> {opts.json}")
+    print(f"encoders: {len(encoders)} 个后端（{time.perf_counter() - t0:.2f}s）")
+    return 1 if failures else 0
+
+
+def _add_process_args(parser) -> None:
+    parser.add_argument("--include", action="append", default=[], metavar="GLOB",
+                        help="仅处理匹配的文件（相对 assets/，可重复，如 weapons/*.png）")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB", help="跳过匹配的文件（可重复）")
+    parser.add_argument("--jobs", type=int, default=0, metavar="N", help="并行进程数，0 表示按 CPU 核数（默认 0）")
+    parser.add_argument("--dry-run", action="store_true", help="只统计将被修改的文件，不写盘")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG, help="缩放规格配置（默认 scripts/icon_spec.json）")
+    add_profile_args(parser)
+
+
+# 转交子命令：子命令名 → (模块名, 说明)，其后的参数原样传给该模块的 main
+PASSTHROUGH = {
+    "export": ("export_pixel_assets", "转交 export_pixel_assets.py"),
+    "atlas": ("pack_atlas", "转交 pack_atlas.py"),
+}
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in PASSTHROUGH:
+        # 不经 argparse 解析，保证 --help 等参数到达目标脚本
+        module = __import__(PASSTHROUGH[argv[0]][0])
+        module.main(argv[1:])
+        return 0
+    parser = argparse.ArgumentParser(description="资源工具统一入口（单次遍历、单次解码的阶段流水线）")
+    sub = parser.add_subparsers(dest="command", required=True)
+    process = sub.add_parser("process", help="按 --stages 组合执行阶段")
+    process.add_argument("--stages", default=DEFAULT_STAGES,
+                         help=f"逗号分隔的阶段列表（默认 {DEFAULT_STAGES}；可用 {', '.join(list(STAGES) + [ENCODE_STAGE])}）")
+    _add_process_args(process)
+    for name in STAGES:
+        _add_process_args(sub.add_parser(name, help=f"仅执行 {name} 阶段"))
+    for name, (_, help_text) in PASSTHROUGH.items():
+        sub.add_parser(name, help=help_text)
+    verify = sub.add_parser("verify", help="内存渲染导出资源并与已提交的 assets/ 逐像素比对")
+    verify.add_argument("--include", action="append", default=[], metavar="GLOB", help="仅比对匹配的资源（相对 assets/）")
+    verify.add_argument("--exclude", action="append", default=[], metavar="GLOB", help="跳过匹配的资源（可重复）")
+    verify.add_argument("--jobs", type=int, default=0, metavar="N", help="并行进程数，0 表示按 CPU 核数（默认 0）")
+    verify.add_argument("--diff-dir", type=Path, metavar="DIR", help="为不一致的资源写出差异高亮图 DIR/<资源>.diff.png")
+    verify.add_argument("--include-replaced", action="store_true",
+                        help="也比对 PIXELLAB_REPLACED_ASSETS.md 中登记为已替换的资源")
+    verify.add_argument("--config", type=Path, default=DEFAULT_CONFIG, help="读取 compact 索引位置的配置（默认 scripts/icon_spec.json）")
+    index = sub.add_parser("index", help="生成资源索引（尺寸、哈希、alpha 包围盒、图集区域）")
+    index.add_argument("--include", action="append", default=[], metavar="GLOB", help="仅收录匹配的文件（相对 assets/）")
+    index.add_argument("--exclude", action="append", default=[], metavar="GLOB", help="跳过匹配的文件（可重复）")
+    index.add_argument("--jobs", type=int, default=0, metavar="N", help="并行进程数，0 表示按 CPU 核数（默认 0）")
+    index.add_argument("--output", type=Path, default=ASSET_INDEX, help="输出路径（默认 assets/asset_index.json）")
+    index.add_argument("--config", type=Path, default=DEFAULT_CONFIG, help="读取 trim / compact 索引位置的配置（默认 scripts/icon_spec.json）")
+    ingest = sub.add_parser("ingest", help="大尺寸生成图批量入库：缩小解码、去纯色背景、缩放到规格尺寸、不透明化")
+    ingest.add_argument("sources", nargs="+", type=Path, metavar="SRC", help="源图片文件或目录（目录取其下一层的 png/jpg/webp）")
+    ingest.add_argument("--dest", type=Path, required=True, help="输出目录（相对项目根目录，如 assets/weapons；项目外的目录须同时给出 --size），文件名取源文件名")
+    ingest.add_argument("--size", type=int, help="目标边长；默认按输出路径所属的 icon_spec.json 分类")
+    ingest.add_argument("--tolerance", type=int, default=24, help="背景色容差（最大通道差，默认 24）")
+    ingest.add_argument("--keep-background", action="store_true", help="不去背景（源图已是透明背景时）")
+    ingest.add_argument("--jobs", type=int, default=0, metavar="N", help="并行进程数，0 表示按 CPU 核数（默认 0）")
+    ingest.add_argument("--window", type=int, default=0, metavar="N", help="同时在途的任务上限，0 表示进程数的 2 倍")
+    ingest.add_argument("--dry-run", action="store_true", help="只处理并报告，不写盘")
+    ingest.add_argument("--config", type=Path, default=DEFAULT_CONFIG, help="缩放规格配置（默认 scripts/icon_spec.json）")
+    add_profile_args(ingest)
+    encoders = sub.add_parser("encoders", help="各编码后端的体积、编码 / 解码耗时基准，并校验无损")
+    encoders.add_argument("--encoder", action="append", default=[], metavar="SPEC",
+                          help=f"参与比较的后端（可重复；默认 {' '.join(DEFAULT_BENCH_ENCODERS)}）")
+    encoders.add_argument("--include", action="append", default=[], metavar="GLOB", help="仅测量匹配的文件（相对 assets/）")
+    encoders.add_argument("--exclude", action="append", default=[], metavar="GLOB", help="跳过匹配的文件（可重复）")
+    encoders.add_argument("--repeat", type=int, default=3, metavar="N", help="每个文件编码 / 解码的重复次数，耗时取最小值（默认 3）")
+    encoders.add_argument("--by-dir", action="store_true", help="另按 assets/ 下的一级目录分组汇总")
+    encoders.add_argument("--json", type=Path, metavar="OUT", help="把汇总结果写成 JSON")
+    opts = parser.parse_args(argv)
+    if opts.command == "encoders":
+        return run_encoders(opts)
+    if opts.command == "ingest":
+        return run_ingest(opts)
+    if opts.command == "verify":
+        return run_verify(opts)
+    if opts.command == "index":
+        return run_index(opts)
+    return run_process(opts, opts.stages if opts.command == "process" else opts.command)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""资源工具的逐资源性能剖析：记录每个资源各阶段（渲染/解码、不透明化、编码、写盘等）耗时、像素数与写出字节数，
+输出 JSON Lines 报告，可选 cProfile 转储，结束时打印最慢的 N 个资源与各阶段合计。
+
+export_pixel_assets.py、make_opaque.py、resize_icons_to_spec.py 共用：
+    --profile REPORT.jsonl  [--cprofile OUT.prof]  [--profile-top N]
+cProfile 只覆盖主进程，剖析函数级热点时配合 --jobs 1 使用；查看: python -m pstats OUT.prof
+"""
+
+import cProfile
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class StageTimer:
+    """单个资源的分阶段计时（秒），结果为普通 dict，可随进程池返回值传回主进程。"""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - t0
+
+
+def add_profile_args(parser) -> None:
+    parser.add_argument("--profile", type=Path, metavar="REPORT", help="写出逐资源耗时报告（JSON Lines）")
+    parser.add_argument("--cprofile", type=Path, metavar="OUT", help="同时将主进程 cProfile 统计转储到 OUT")
+    parser.add_argument("--profile-top", type=int, default=10, metavar="N", help="结束时列出最慢的 N 个资源（默认 10）")
+
+
+class AssetProfiler:
+    """收集逐资源记录；未指定 --profile / --cprofile 时所有方法为空操作。"""
+
+    def __init__(self, report: Path | None = None, cprofile_out: Path | None = None, top: int = 10):
+        self.report = report
+        self.cprofile_out = cprofile_out
+        self.top = top
+        self.records = []
+        self._profiler = None
+        self._t0 = 0.0
+
+    @classmethod
+    def from_args(cls, opts) -> "AssetProfiler":
+        return cls(opts.profile, opts.cprofile, opts.profile_top)
+
+    @property
+    def enabled(self) -> bool:
+        return self.report is not None or self.cprofile_out is not None
+
+    def start(self) -> None:
+        self._t0 = time.perf_counter()
+        if self.cprofile_out is not None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def add(self, asset: str, stages: dict, pixels: int = 0, nbytes: int = 0, **extra) -> None:
+        """记录一个资源：stages 为 阶段名 → 秒；extra 为附加字段（如 status）。"""
+        if not self.enabled:
+            return
+        record = {"asset": asset}
+        record.update(extra)
+        for name, seconds in stages.items():
+            record[f"{name}_ms"] = round(seconds * 1000, 3)
+        record["total_ms"] = round(sum(stages.values()) * 1000, 3)
+        record["pixels"] = pixels
+        record["bytes"] = nbytes
+        self.records.append(record)
+
+    def finish(self) -> None:
+        """写出报告、cProfile 转储，并打印最慢资源与各阶段合计。"""
+        if not self.enabled:
+            return
+        wall = time.perf_counter() - self._t0
+        if self._profiler is not None:
+            self._profiler.disable()
+            self.cprofile_out.parent.mkdir(parents=True, exist_ok=True)
+            self._profiler.dump_stats(self.cprofile_out)
+            print(f"cProfile stats written to {self.cprofile_out}")
+        if self.report is not None:
+            self.report.parent.mkdir(parents=True, exist_ok=True)
+            with self.report.open("w", encoding="utf-8") as f:
+                for record in self.records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            print(f"Profile report written to {self.report} ({len(self.records)} assets)")
+        self.print_summary(wall)
+
+    def print_summary(self, wall: float) -> None:
+        if not self.records:
+            return
+        stage_names = []
+        for record in self.records:
+            for key in record:
+                if key.endswith("_ms") and key != "total_ms" and key not in stage_names:
+                    stage_names.append(key)
+        totals = {name: sum(r.get(name, 0.0) for r in self.records) for name in stage_names}
+        print(f"Wall {wall * 1000:.1f} ms; per-stage totals: "
+              + ", ".join(f"{name[:-3]} {ms:.1f} ms" for name, ms in totals.items()))
+        slowest = sorted(self.records, key=lambda r: r["total_ms"], reverse=True)[: self.top]
+        header = f"{'asset':<44} {'total':>9}" + "".join(f" {name[:-3]:>9}" for name in stage_names)
+        print(f"Slowest {len(slowest)} assets (ms):")
+        print(header + f" {'pixels':>9} {'bytes':>9}")
+        for r in slowest:
+            row = f"{r['asset']:<44} {r['total_ms']:>9.2f}" + "".join(f" {r.get(n, 0.0):>9.2f}" for n in stage_names)
+            print(row + f" {r['pixels']:>9} {r['bytes']:>9}")
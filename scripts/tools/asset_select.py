@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""assets/ 下 PNG 的选择规则：asset_pipeline.py 各子命令与 make_opaque.py 共用，保证两者处理的文件集合一致。"""
+
+import fnmatch
+from pathlib import Path, PurePosixPath
+
+from ui_bake import UI_BAKED_DIR
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+ASSETS = PROJECT_ROOT / "assets"
+
+# 阶段处理跳过的生成图集（相对 assets/ 的 glob）：按像素坐标记录区域、
+# 刻意保留半透明像素（如 HUD 面板 0.85 alpha），裁边 / 不透明化 / 重编码都会使其失效
+SKIP_GLOBS = (
+    PurePosixPath(UI_BAKED_DIR).relative_to("assets").as_posix() + "/*",
+    "terrain/biome_atlas.png",  # terrain_gen.py 的 blob 叠加瓦片刻意半透明，叠在地板上才显出底色
+)
+
+
+def is_generated(rel: str) -> bool:
+    """相对 assets/ 的路径是否属于 SKIP_GLOBS 中的生成图集。"""
+    return any(fnmatch.fnmatch(rel, p) for p in SKIP_GLOBS)
+
+
+def select_pngs(include: list, exclude: list, skip_dirs: tuple = (), skip_generated: bool = True) -> list:
+    """一次遍历 assets/，按相对路径 glob 过滤，返回相对 assets/ 的路径，排序保证处理与输出顺序确定。
+    skip_dirs 为额外的派生输出目录（相对 assets/）；skip_generated 时跳过 SKIP_GLOBS（阶段处理用），
+    资源索引须收录这些图集，传 False。"""
+    result = []
+    for png in sorted(ASSETS.rglob("*.png")):
+        rel = png.relative_to(ASSETS).as_posix()
+        if any(rel.startswith(d + "/") for d in skip_dirs) or (skip_generated and is_generated(rel)):
+            continue
+        if include and not any(fnmatch.fnmatch(rel, pat) for pat in include):
+            continue
+        if any(fnmatch.fnmatch(rel, pat) for pat in exclude):
+            continue
+        result.append(rel)
+    return result
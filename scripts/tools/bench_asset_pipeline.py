@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""资源管线基准：各生成函数、敌人档位换色、force_opaque（96²/512²/1024²）、图标缩放与端到端导出的耗时，
+与 JSON 基线对比，任一用例变慢超过阈值即失败。
+
+独立运行:
+    python scripts/tools/bench_asset_pipeline.py                  # 与基线对比
+    python scripts/tools/bench_asset_pipeline.py --save-baseline  # 记录/更新基线
+    python scripts/tools/bench_asset_pipeline.py --threshold 0.5 --only force_opaque
+pytest 运行（基线随仓库提交；阈值放宽到 PYTEST_THRESHOLD 并允许 PYTEST_SLACK 的绝对抖动，以容忍不同机器的差异，
+BENCH_THRESHOLD / BENCH_SLACK_MS 环境变量可覆盖；无基线时本地跳过，CI 环境变量存在时失败）:
+    python -m pytest scripts/tools/bench_asset_pipeline.py
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = TOOLS_DIR / "bench_baseline.json"
+DEFAULT_THRESHOLD = 0.25  # 允许比基线慢 25%
+PYTEST_THRESHOLD = 1.0  # pytest 入口：允许慢到基线的 2 倍（基线来自提交者的机器）
+PYTEST_SLACK = 0.002  # pytest 入口：额外允许的绝对变慢（秒），亚毫秒级用例的调度抖动不计为回归
+
+# scripts/resize_icons_to_spec.py 不在 tools 目录，按路径导入
+sys.path.insert(0, str(TOOLS_DIR.parent))
+
+
+def _generator_cases() -> list:
+    """每个生成函数一个用例：依次渲染 build_jobs() 中使用该函数的全部任务。
+    每次运行前清空导出器的进程内缓存，测的是实际绘制而非缓存命中。"""
+    import export_pixel_assets as exporter
+
+    def run(jobs):
+        exporter.clear_render_caches()
+        return [job.generator(*job.args) for job in jobs]
+
+    by_generator = {}
+    for job in exporter.build_jobs():
+        by_generator.setdefault(job.generator.__name__, []).append(job)
+    cases = []
+    for name, jobs in by_generator.items():
+        cases.append((f"generator/{name}", lambda jobs=jobs: run(jobs)))
+    return cases
+
+
+def _palette_cases() -> list:
+    """调色板换色：全部敌人 × 全部档位的单帧与精灵图（基础图索引化后按进程缓存）。"""
+    import export_pixel_assets as exporter
+
+    def all_tiers():
+        for etype in range(len(exporter.ENEMY_NAMES)):
+            for tier in exporter.ENEMY_TIERS:
+                exporter.enemy_tier_sprite(etype, tier)
+                exporter.enemy_tier_sheet(etype, tier)
+
+    return [("palette_swap/enemy_tiers", all_tiers)]
+
+
+def _force_opaque_cases() -> list:
+    from alpha_ops import force_opaque
+    from bench_alpha_ops import synthetic_image
+
+    cases = []
+    for size in (96, 512, 1024):
+        img = synthetic_image(size, "RGBA")
+        cases.append((f"force_opaque/{size}", lambda img=img: force_opaque(img)))
+    return cases
+
+
+def _resize_cases() -> list:
+    """图标缩放路径：1024² 绘制风大图（reduce + Lanczos）与 64² 像素风小图（nearest）。"""
+    from bench_alpha_ops import synthetic_image
+    from resize_icons_to_spec import load_config, resize_image
+
+    config = load_config(TOOLS_DIR.parent / "icon_spec.json")
+    spec = config["categories"]["weapons"]
+    painted_min_size = config.get("painted_min_size", 256)
+    painted = synthetic_image(1024, "RGBA", seed=1)
+    pixel_art = synthetic_image(64, "RGBA", seed=2)
+    return [
+        ("resize/painted_1024", lambda: resize_image(painted, spec["size"], spec, painted_min_size)),
+        ("resize/pixel_art_64", lambda: resize_image(pixel_art, spec["size"], spec, painted_min_size)),
+    ]
+
+
+def _export_case() -> list:
+    """端到端：完整导出到临时目录（串行，含编码与写盘）。"""
+    import contextlib
+    import io
+
+    import export_pixel_assets as exporter
+
+    def run():
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+            exporter.main(["--out", tmp])
+
+    return [("export/full", run)]
+
+
+def all_cases() -> list:
+    return _generator_cases() + _palette_cases() + _force_opaque_cases() + _resize_cases() + _export_case()
+
+
+def measure(fn, repeat: int) -> float:
+    """预热一次后取 repeat 次中的最短耗时（秒），降低调度抖动的影响。"""
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_suite(only: list | None = None, repeat: int = 5) -> dict:
+    results = {}
+    for name, fn in all_cases():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        results[name] = measure(fn, repeat)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, slack: float = 0.0) -> list:
+    """返回超过阈值的回归 [(用例, 基线秒, 当前秒)]；基线中没有的新用例不计入。slack 为额外允许的绝对变慢（秒）。"""
+    regressions = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is not None and seconds > base * (1 + threshold) + slack:
+            regressions.append((name, base, seconds))
+    return regressions
+
+
+def load_baseline(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))["cases"] if path.is_file() else {}
+
+
+def save_baseline(path: Path, results: dict) -> None:
+    data = {"unit": "seconds", "cases": {k: round(v, 6) for k, v in sorted(results.items())}}
+    path.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
+
+
+def print_report(results: dict, baseline: dict) -> None:
+    print(f"{'case':<36} {'baseline(ms)':>12} {'current(ms)':>12} {'change':>8}")
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        base_s = f"{base * 1000:.2f}" if base is not None else "-"
+        change = f"{seconds / base - 1:+.0%}" if base else "new"
+        print(f"{name:<36} {base_s:>12} {seconds * 1000:>12.2f} {change:>8}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="资源管线基准与回归检测")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="基线 JSON 路径")
+    parser.add_argument("--save-baseline", action="store_true", help="将本次结果写为基线")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="允许变慢比例（默认 0.25）")
+    parser.add_argument("--repeat", type=int, default=5, help="每个用例计时次数（取最短）")
+    parser.add_argument("--only", action="append", metavar="PREFIX", help="只运行名称以 PREFIX 开头的用例（可重复）")
+    opts = parser.parse_args(argv)
+    results = run_suite(opts.only, opts.repeat)
+    baseline = load_baseline(opts.baseline)
+    print_report(results, baseline)
+    if opts.save_baseline:
+        # 只跑部分用例时保留其余用例的旧基线
+        save_baseline(opts.baseline, {**baseline, **results})
+        print(f"基线已写入 {opts.baseline}")
+        return 0
+    if not baseline:
+        print(f"未找到基线 {opts.baseline}，先运行 --save-baseline")
+        return 0
+    regressions = compare(results, baseline, opts.threshold)
+    for name, base, seconds in regressions:
+        print(f"REGRESSION {name}: {base * 1000:.2f} ms -> {seconds * 1000:.2f} ms (> +{opts.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+def test_no_regression():
+    """pytest 入口：有回归时失败；无基线时本地跳过，CI 中失败（基线应随仓库提交）。"""
+    import pytest
+
+    baseline = load_baseline(DEFAULT_BASELINE)
+    if not baseline:
+        message = f"no baseline at {DEFAULT_BASELINE}; run with --save-baseline and commit it"
+        if os.environ.get("CI"):
+            pytest.fail(message)
+        pytest.skip(message)
+    threshold = float(os.environ.get("BENCH_THRESHOLD", PYTEST_THRESHOLD))
+    slack = float(os.environ.get("BENCH_SLACK_MS", PYTEST_SLACK * 1000)) / 1000
+    regressions = compare(run_suite(repeat=3), baseline, threshold, slack)
+    assert not regressions, "; ".join(f"{n}: {b * 1000:.2f} -> {s * 1000:.2f} ms" for n, b, s in regressions)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
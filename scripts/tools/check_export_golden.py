@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""导出回归检查：内存渲染 export_pixel_assets.py 的全部资源，逐像素（RGBA 字节的 sha256）与已提交的
+金标 export_golden.json 比对。与 asset_pipeline.py verify 不同，比对对象不是 assets/ 下的文件，
+被 AI 重生成/手工替换的资源、被 trim / compact 改写过的文件都不影响结果，只检测绘制代码的输出变化。
+
+独立运行:
+    python scripts/tools/check_export_golden.py             # 比对，不一致时退出码 1
+    python scripts/tools/check_export_golden.py --update    # 有意修改绘制结果后重写金标
+pytest 运行（无金标时失败而非跳过）:
+    python -m pytest scripts/tools/check_export_golden.py
+"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent
+DEFAULT_GOLDEN = TOOLS_DIR / "export_golden.json"
+
+
+def pixel_digest(img) -> dict:
+    """图像的像素指纹：尺寸与 RGBA 字节的 sha256（与 PNG 编码参数无关）。"""
+    rgba = img.convert("RGBA")
+    return {"size": list(rgba.size), "sha256": hashlib.sha256(rgba.tobytes()).hexdigest()}
+
+
+def render_digests(workers: int = 1) -> dict:
+    """资源 ID → 像素指纹，按资源 ID 排序。"""
+    import export_pixel_assets as exporter
+
+    images = exporter.render_many(workers=workers)
+    return {asset: pixel_digest(images[asset]) for asset in sorted(images)}
+
+
+def load_golden(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))["assets"] if path.is_file() else {}
+
+
+def save_golden(path: Path, digests: dict) -> None:
+    path.write_text(json.dumps({"version": 1, "assets": digests}, indent=1) + "\n", encoding="utf-8")
+
+
+def compare(digests: dict, golden: dict) -> list:
+    """返回 [(资源 ID, 说明)]：像素或尺寸不同、金标中缺少、金标中有但已不再导出。"""
+    problems = []
+    for asset, digest in digests.items():
+        ref = golden.get(asset)
+        if ref is None:
+            problems.append((asset, "金标中没有该资源"))
+        elif ref["size"] != digest["size"]:
+            problems.append((asset, "尺寸 %dx%d -> %dx%d" % tuple(ref["size"] + digest["size"])))
+        elif ref["sha256"] != digest["sha256"]:
+            problems.append((asset, "像素不同"))
+    problems.extend((asset, "已不再导出") for asset in sorted(set(golden) - set(digests)))
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="导出资源逐像素回归检查")
+    parser.add_argument("--golden", type=Path, default=DEFAULT_GOLDEN, help="金标 JSON 路径")
+    parser.add_argument("--update", action="store_true", help="将当前渲染结果写为金标")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N", help="并行进程数（默认 1）")
+    opts = parser.parse_args(argv)
+    digests = render_digests(opts.jobs)
+    if opts.update:
+        save_golden(opts.golden, digests)
+        print(f"金标已写入 {opts.golden}（{len(digests)} 个资源）")
+        return 0
+    golden = load_golden(opts.golden)
+    if not golden:
+        print(f"未找到金标 {opts.golden}，先运行 --update")
+        return 1
+    problems = compare(digests, golden)
+    for asset, note in problems:
+        print(f"  DIFF    {asset}: {note}")
+    print(f"golden: {len(digests)} 个资源，不一致 {len(problems)}")
+    return 1 if problems else 0
+
+
+def test_export_matches_golden():
+    """pytest 入口：任一资源与金标不一致（或金标缺失）即失败。"""
+    golden = load_golden(DEFAULT_GOLDEN)
+    assert golden, f"no golden at {DEFAULT_GOLDEN}; run check_export_golden.py --update"
+    problems = compare(render_digests(), golden)
+    assert not problems, "; ".join(f"{asset}: {note}" for asset, note in problems)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""绘制指令规格：把 export_pixel_assets.py 中的精灵定义编译为按颜色角色分组的矩形列表，写入
+resources/pixel_draw_ops.json。pixel_generator.gd 运行时按规格调用少量 Image.fill_rect 生成回退纹理，
+不再逐像素 set_pixel，也不再在 GDScript 中手工复刻一遍形状。形状只在导出器中定义一次。
+
+规格格式（sprites 下每项）：
+    size   [w, h]
+    roles  角色名列表；colors 为对应的默认 RGBA（0..255）
+    rects  扁平整数列表，每 5 个一组 x, y, w, h, 角色下标；各角色像素互不重叠，绘制顺序无关
+    template  为 true 时运行时传入角色色（如按 enemy_id 的敌人形状、按颜色的子弹）
+
+运行:
+    python scripts/tools/draw_ops.py            # 重新编译并写出规格（内容未变时不重写）
+    python scripts/tools/draw_ops.py --check    # 一致性检查：规格按 fill_rect 语义渲染 vs 导出器渲染逐像素比对，规格过期也报错
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+SPEC_VERSION = 1
+SPEC_REL = "resources/pixel_draw_ops.json"
+
+# 模板一致性检查用的角色色：与模板默认色不同，能发现角色与像素对应错误
+TEMPLATE_CHECK_COLORS = [(0.88, 0.46, 0.95), (0.2, 0.7, 0.35), (1.0, 0.3, 0.3)]
+
+
+class SpriteDef(NamedTuple):
+    """一个可编译的精灵：render 生成导出器图像；palette 为角色 → RGBA（None 时按出现的颜色自动编号）。
+    template 精灵另有 render_with(colors) 按 (r, g, b) 0..1 浮点色重绘，供一致性检查。"""
+    render: Callable
+    palette: dict | None = None
+    render_with: Callable | None = None
+
+
+def template_colors(name: str, color: tuple) -> dict:
+    """模板精灵的角色色：color 为 0..1 浮点 RGB，与 GDScript 一样截断到 0..255；
+    敌人形状的 dark 同 Color.darkened(0.25)（各通道乘 0.75）。"""
+    colors = {"body": tuple(int(c * 255) for c in color) + (255,)}
+    if name.startswith("enemy_shape_"):
+        colors["dark"] = tuple(int(c * 0.75 * 255) for c in color) + (255,)
+    return colors
+
+
+def _shape_with(shape: int, color: tuple) -> Image.Image:
+    from export_pixel_assets import enemy_shape_sprite
+
+    return enemy_shape_sprite(shape, template_colors(f"enemy_shape_{shape}", color))
+
+
+@functools.lru_cache(maxsize=None)
+def sprite_defs() -> dict:
+    """规格名 → SpriteDef，名称与 pixel_generator.gd 中的查找一致。"""
+    import export_pixel_assets as pixel_assets
+
+    defs = {}
+    for i, pal in enumerate(pixel_assets.PLAYER_PALETTES):
+        defs[f"player_scheme_{i}"] = SpriteDef(functools.partial(pixel_assets.player_sprite, i), pal)
+    for etype, name in enumerate(pixel_assets.ENEMY_NAMES):
+        defs[name] = SpriteDef(functools.partial(pixel_assets.enemy_sprite, etype), pixel_assets.ENEMY_PALETTES[etype])
+    for shape in range(pixel_assets.ENEMY_SHAPE_COUNT):
+        defs[f"enemy_shape_{shape}"] = SpriteDef(
+            functools.partial(pixel_assets.enemy_shape_sprite, shape), pixel_assets.ENEMY_SHAPE_PALETTE,
+            functools.partial(_shape_with, shape))
+    defs["bullet_player"] = SpriteDef(functools.partial(pixel_assets.bullet_sprite, False))
+    defs["bullet_enemy"] = SpriteDef(functools.partial(pixel_assets.bullet_sprite, True))
+    for btype in pixel_assets.BULLET_TYPES:
+        render_with = functools.partial(pixel_assets.bullet_by_type, btype)
+        defs[f"bullet_{btype}"] = SpriteDef(functools.partial(render_with, (1.0, 1.0, 1.0)),
+                                            {"body": (255, 255, 255, 255)}, render_with)
+    defs["pickup_coin"] = SpriteDef(functools.partial(pixel_assets.pickup_sprite, False))
+    defs["pickup_heal"] = SpriteDef(functools.partial(pixel_assets.pickup_sprite, True))
+    return defs
+
+
+def mask_rects(mask: Image.Image) -> list:
+    """把 L 遮罩的非零像素分解为矩形 (x, y, w, h)：逐行取连续跨度，上下相邻行跨度相同时合并为一个矩形。"""
+    w, h = mask.size
+    data = mask.tobytes()
+    open_rects = {}  # (x0, x1) -> [x, y, w, h]，上一行仍可向下延伸的矩形
+    rects = []
+    for y in range(h):
+        row = data[y * w:(y + 1) * w]
+        spans = []
+        x = 0
+        while x < w:
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < w and row[x]:
+                x += 1
+            spans.append((start, x))
+        current = {}
+        for span in spans:
+            rect = open_rects.pop(span, None)
+            if rect is None:
+                rect = [span[0], y, span[1] - span[0], 0]
+                rects.append(rect)
+            rect[3] += 1
+            current[span] = rect
+        open_rects = current
+    return [tuple(r) for r in rects]
+
+
+def compile_sprite(img: Image.Image, palette: dict | None = None, template: bool = False) -> dict:
+    """精灵图像 → 规格项。palette 为 None 时按颜色值排序命名为 c0、c1…（全透明像素不参与）。"""
+    from palette_swap import index_by_roles
+
+    if palette is None:
+        rgba = img.convert("RGBA")
+        colors = sorted(color for _, color in rgba.getcolors(rgba.width * rgba.height) if color[3])
+        palette = {f"c{i}": color for i, color in enumerate(colors)}
+    sprite = index_by_roles(img, palette)
+    flat = []
+    for i in range(len(sprite.roles)):
+        mask = sprite.image.point([255 if v == i + 1 else 0 for v in range(256)], "L")
+        for rect in mask_rects(mask):
+            flat.extend(rect + (i,))
+    entry = {"size": list(img.size), "roles": list(sprite.roles), "colors": [list(c) for c in sprite.colors],
+             "rects": flat}
+    if template:
+        entry["template"] = True
+    return entry
+
+
+def build_spec() -> dict:
+    sprites = {}
+    for name, sdef in sprite_defs().items():
+        sprites[name] = compile_sprite(sdef.render(), sdef.palette, sdef.render_with is not None)
+    return {"version": SPEC_VERSION, "sprites": sprites}
+
+
+def render_spec(entry: dict, colors: dict | None = None) -> Image.Image:
+    """按运行时语义渲染规格项：透明画布上逐个 fill_rect；colors 覆盖角色色（角色名 → RGBA）。"""
+    from raster import fill_rect, new_canvas
+
+    colors = colors or {}
+    role_colors = [tuple(colors.get(role, entry["colors"][i])) for i, role in enumerate(entry["roles"])]
+    img = new_canvas(*entry["size"])
+    rects = entry["rects"]
+    for i in range(0, len(rects), 5):
+        x, y, w, h, role = rects[i:i + 5]
+        fill_rect(img, x, y, x + w, y + h, role_colors[role])
+    return img
+
+
+def _diff_pixels(a: Image.Image, b: Image.Image) -> int:
+    """两张同尺寸 RGBA 图中任一通道不同的像素数。"""
+    from PIL import ImageChops
+
+    mask = None
+    for band in ImageChops.difference(a, b).split():
+        mask = band if mask is None else ImageChops.lighter(mask, band)
+    return a.width * a.height - mask.histogram()[0]
+
+
+def check(spec: dict) -> list:
+    """逐项比对规格渲染结果与导出器渲染结果，返回问题描述列表（空表示一致）。"""
+    problems = []
+    defs = sprite_defs()
+    sprites = spec.get("sprites", {})
+    if spec.get("version") != SPEC_VERSION:
+        problems.append(f"规格版本 {spec.get('version')} != {SPEC_VERSION}")
+    for name in sorted(set(sprites) ^ set(defs)):
+        problems.append(f"{name}: {'规格中多余' if name in sprites else '规格中缺失'}")
+    for name, sdef in defs.items():
+        entry = sprites.get(name)
+        if entry is None:
+            continue
+        cases = [(sdef.render(), None)]
+        if sdef.render_with is not None:
+            cases += [(sdef.render_with(c), template_colors(name, c)) for c in TEMPLATE_CHECK_COLORS]
+        for expected, colors in cases:
+            got = render_spec(entry, colors)
+            if got.size != expected.size:
+                problems.append(f"{name}: 尺寸 {got.size} != {expected.size}")
+                break
+            diff = _diff_pixels(got, expected.convert("RGBA"))
+            if diff:
+                problems.append(f"{name}{'' if colors is None else ' ' + str(colors['body'])}: {diff} 像素不一致")
+    return problems
+
+
+def main(argv=None) -> None:
+    import argparse
+    import json
+    import sys
+    import time
+    from pathlib import Path
+
+    from export_pixel_assets import PROJECT_ROOT
+
+    parser = argparse.ArgumentParser(description="编译 pixel_generator.gd 使用的绘制指令规格，或检查规格与导出器是否一致")
+    parser.add_argument("--check", action="store_true", help="只检查，不写文件；不一致时退出码 1")
+    parser.add_argument("--out", default=str(PROJECT_ROOT / SPEC_REL), help=f"规格文件（默认 {SPEC_REL}）")
+    opts = parser.parse_args(argv)
+    out = Path(opts.out)
+    t0 = time.perf_counter()
+    if opts.check:
+        if not out.is_file():
+            print(f"规格文件不存在: {out}，请先运行 python scripts/tools/draw_ops.py")
+            sys.exit(1)
+        spec = json.loads(out.read_text(encoding="utf-8"))
+        problems = check(spec)
+        if json.dumps(spec, sort_keys=True) != json.dumps(build_spec(), sort_keys=True):
+            problems.append("规格已过期（导出器定义有变化），请重新运行 python scripts/tools/draw_ops.py")
+        for p in problems:
+            print(f"  {p}")
+        print(f"{len(spec.get('sprites', {}))} 个精灵，{len(problems)} 处不一致（{time.perf_counter() - t0:.2f}s）")
+        sys.exit(1 if problems else 0)
+    spec = build_spec()
+    problems = check(spec)
+    if problems:
+        for p in problems:
+            print(f"  {p}")
+        sys.exit(1)
+    data = json.dumps(spec, separators=(",", ":")) + "\n"
+    if not (out.is_file() and out.read_text(encoding="utf-8") == data):
+        out.write_text(data, encoding="utf-8")
+    sprites = spec["sprites"].values()
+    rects = sum(len(e["rects"]) // 5 for e in sprites)
+    pixels = sum(e["size"][0] * e["size"][1] for e in sprites)
+    print(f"{len(spec['sprites'])} 个精灵：fill_rect {rects} 次（逐像素绘制需遍历 {pixels} 像素） -> {out}"
+          f"（{time.perf_counter() - t0:.2f}s）")
+
+
+if __name__ == "__main__":
+    main()
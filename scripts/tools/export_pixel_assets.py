@@ -1,342 +1,385 @@
 #!/usr/bin/env python3
-"""导出像素美术资源到 assets/ 目录。运行: python scripts/tools/export_pixel_assets.py"""
-
+"""导出像素美术资源到 assets/ 目录。
+运行: python scripts/tools/export_pixel_assets.py [--incremental] [--jobs N] [--out DIR] [--encoder SPEC] [--watch] [--profile REPORT.jsonl]
+--incremental：按任务哈希跳过未变化的资源（不渲染、不写盘），避免 Godot 重新导入整棵资源树。
+--jobs N：用 N 个进程并行渲染与编码（0 表示按 CPU 核数）；写盘与日志仍按任务列表顺序进行。
+--out DIR：导出到其他目录（默认 assets/），用于基准测试或与已提交资源对比。
+--encoder SPEC：编码后端（默认 png，见 asset_encode.get_encoder），如 png:level=6,strategy=rle、webp、raw；
+  非 PNG 后端会改变文件后缀，而场景与配置引用的是 .png 路径，因此只能配合 --out 导出到其他目录。
+--watch：常驻监视生成器源码与输入 PNG，变化后重新加载并只重建任务哈希变化的资源（--poll / --debounce 调节）。
+--profile REPORT.jsonl：逐资源记录渲染/不透明化/编码/写盘耗时、像素数与字节数（另有 --cprofile、--profile-top，见 asset_profile.py）。
+
+也可作为库使用（不写盘、不建目录）：
+    import export_pixel_assets as pixel_assets
+    pixel_assets.asset_ids()                                    # ["characters/player_scheme_0", ...]
+    img = pixel_assets.render("enemies/enemy_tank_sheet")       # PIL.Image（已按任务不透明化）
+    data = pixel_assets.render("weapons/dagger", encoded=True)  # 与导出文件一致的 PNG 字节
+    pixel_assets.render_many(["bullets/bullet_orb", "pickups/coin"], encoded=True, workers=2)
+Pillow、进程池、清单哈希等依赖在首次渲染/运行 main 时才导入，仅列出资源 ID 不加载 Pillow。"""
+
+from __future__ import annotations
+
+import functools
+import os
+import time
 from pathlib import Path
-from PIL import Image
+from typing import TYPE_CHECKING, Callable, NamedTuple
 
-PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
-ASSETS = PROJECT_ROOT / "assets"
+from alpha_ops import force_opaque
+from asset_encode import baseline_png_size, encode_png as encode_optimized_png, get_encoder
+from asset_profile import AssetProfiler, StageTimer, add_profile_args
+from palette_swap import index_by_roles, recolor, tint_palette
+from raster import diamond, disc, fill_rect, fill_where, hline, new_canvas, outline_rect, vline
+from sheet_builder import STATES, CellTransform, SheetCell, build_sheet, direction_rows
 
+if TYPE_CHECKING:
+    from PIL import Image
 
-def ensure_dirs():
-    for sub in ["characters", "enemies", "weapons", "bullets", "pickups", "terrain"]:
-        (ASSETS / sub).mkdir(parents=True, exist_ok=True)
+TOOLS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = TOOLS_DIR.parent.parent
+ASSETS = PROJECT_ROOT / "assets"
+# 导出工具版本：编码方式等生成函数之外的输出逻辑变化时递增，使清单中所有任务失效
+# 2：索引色 + optimize 编码
+TOOL_VERSION = "2"
 
 
-def force_opaque(img: Image.Image) -> Image.Image:
-    """将非空白像素的 alpha 设为 255，确保非透明区域完全不透明。"""
-    img = img.copy()
-    for x in range(img.width):
-        for y in range(img.height):
-            r, g, b, a = img.getpixel((x, y))
-            if a > 0:
-                img.putpixel((x, y), (r, g, b, 255))
-    return img
+def ensure_dirs(root: Path = ASSETS):
+    for sub in ["characters", "enemies", "weapons", "bullets", "pickups", "terrain"]:
+        (root / sub).mkdir(parents=True, exist_ok=True)
 
 
-def save_png(img: Image.Image, path: Path, make_opaque: bool = True):
+def encode_png(img: Image.Image, make_opaque: bool = True, encoder: str = "png") -> bytes:
+    """按 save_png 的规则（可选不透明化）编码；默认低色数图无损写为索引色 PNG，encoder 见 asset_encode.get_encoder。"""
     if make_opaque:
         img = force_opaque(img)
-    img.save(path)
+    return encode_optimized_png(img) if encoder == "png" else get_encoder(encoder).encode(img)
+
+
+def save_png(img: Image.Image, path: Path, make_opaque: bool = True, encoder: str = "png"):
+    path.write_bytes(encode_png(img, make_opaque, encoder))
     print(f"  Saved: {path.relative_to(PROJECT_ROOT)}")
 
 
+class AssetJob(NamedTuple):
+    """单个资源导出任务：输出路径（相对 assets/）、生成函数及其参数、是否不透明化、输入文件。
+
+    inputs 为生成函数读取的文件（相对项目根目录，如参考 PNG），其内容计入任务哈希，--watch 时也会被监视。
+    """
+    rel: str
+    generator: Callable
+    args: tuple = ()
+    make_opaque: bool = True
+    inputs: tuple = ()
+
+
+def render_job(job: AssetJob, encoder: str = "png") -> tuple:
+    """渲染并编码单个任务（在工作进程中执行，不触碰文件系统）；encoder 为编码后端规格字符串。
+
+    返回 (编码字节, 默认 32 位 RGBA 编码字节数, 各阶段耗时, 像素数)；字节数用于节省报告，耗时供 --profile 使用。
+    """
+    timer = StageTimer()
+    with timer.stage("render"):
+        img = job.generator(*job.args)
+    if job.make_opaque:
+        with timer.stage("opaque"):
+            img = force_opaque(img)
+    with timer.stage("encode"):
+        data = get_encoder(encoder).encode(img)
+    with timer.stage("baseline"):
+        baseline = baseline_png_size(img)
+    return data, baseline, timer.stages, img.width * img.height
+
+
+# 玩家配色方案（角色 → RGBA）：0 蓝、1 橙。精灵只按方案 0 绘制一次，其余方案由 palette_swap 换色得到
+PLAYER_PALETTES = [
+    {"body": (51, 178, 255, 255), "dark": (38, 133, 191, 255), "outline": (20, 90, 140, 255),
+     "highlight": (100, 200, 255, 255), "belt": (60, 60, 70, 255)},
+    {"body": (255, 140, 51, 255), "dark": (191, 105, 38, 255), "outline": (180, 90, 20, 255),
+     "highlight": (255, 180, 100, 255), "belt": (60, 60, 70, 255)},
+]
+
+
+# 玩家动画姿态：stand / walk1（左腿前、右臂前摆）/ walk2（右腿前、左臂前摆）
+PLAYER_POSES = {
+    "stand": {},
+    "walk1": {"dy_head": 0, "dy_body": 1, "arm_left": 1, "arm_right": -1, "leg_left": 1, "leg_right": -1},
+    "walk2": {"dy_head": -1, "dy_body": 0, "arm_left": -1, "arm_right": 1, "leg_left": -1, "leg_right": 1},
+}
+
+
+def _player_frame(pal: dict, dy_head: int = 0, dy_body: int = 0, arm_left: int = 0, arm_right: int = 0,
+                  leg_left: int = 0, leg_right: int = 0) -> Image.Image:
+    """精灵图中的单个 24x24 姿态帧。"""
+    img = new_canvas(24, 24)
+    body, dark, outline, highlight, belt = pal["body"], pal["dark"], pal["outline"], pal["highlight"], pal["belt"]
+    hy = dy_head
+    by = dy_body
+    # 头部轮廓
+    outline_rect(img, 7, hy + 2, 17, hy + 11, outline)
+    # 头部
+    fill_rect(img, 8, hy + 3, 16, hy + 10, body)
+    # 眼睛
+    hline(img, 10, 11, hy + 5, outline)
+    hline(img, 13, 14, hy + 5, outline)
+    hline(img, 10, 11, hy + 6, highlight)
+    hline(img, 13, 14, hy + 6, highlight)
+    # 身体轮廓
+    outline_rect(img, 5, by + 9, 19, by + 21, outline)
+    # 身体（覆盖底边轮廓，与原逐像素绘制顺序一致）
+    fill_rect(img, 6, by + 10, 18, by + 21, body)
+    # 衣领（身体顶部略深）
+    hline(img, 7, 17, by + 10, dark)
+    # 腰带
+    hline(img, 7, 17, by + 16, belt)
+    # 左臂（带轮廓）
+    fill_rect(img, 2 + arm_left, 11, 7 + arm_left, 18, dark)
+    vline(img, 7 + arm_left, 11, 18, outline)
+    # 右臂
+    fill_rect(img, 17 + arm_right, 11, 22 + arm_right, 18, dark)
+    vline(img, 16 + arm_right, 11, 18, outline)
+    # 腿部轮廓（脚部）
+    hline(img, 8 + leg_left, 12 + leg_left, by + 20, outline)
+    hline(img, 12 + leg_right, 16 + leg_right, by + 20, outline)
+    return img
+
+
+@functools.lru_cache(maxsize=None)
+def _player_sheet_indexed():
+    pal = PLAYER_PALETTES[0]
+    # 每个姿态只绘制一次，各方向列共用
+    frames = {state: _player_frame(pal, **PLAYER_POSES[state]) for state in STATES}
+    return index_by_roles(build_sheet(frames, direction_rows([SheetCell(state) for state in STATES]), 24, 24), pal)
+
+
 def player_sprite_sheet(scheme: int) -> Image.Image:
     """8 方向精灵图：8 列 x 3 行（站立、行走帧1、行走帧2），每格 24x24。方向顺序：E, SE, S, SW, W, NW, N, NE"""
-    fw, fh = 24, 24
-    w, h = fw * 8, fh * 3
-    img = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-    body = (51, 178, 255, 255) if scheme == 0 else (255, 140, 51, 255)
-    dark = (38, 133, 191, 255) if scheme == 0 else (191, 105, 38, 255)
-    outline = (20, 90, 140, 255) if scheme == 0 else (180, 90, 20, 255)
-    highlight = (100, 200, 255, 255) if scheme == 0 else (255, 180, 100, 255)
-    belt = (60, 60, 70, 255)
-
-    def draw_frame(ox: int, oy: int, dy_head: int = 0, dy_body: int = 0, arm_left: int = 0, arm_right: int = 0,
-                  leg_left: int = 0, leg_right: int = 0) -> None:
-        # 头部轮廓
-        for x in range(7, 17):
-            img.putpixel((ox + x, oy + 2 + dy_head), outline)
-        for y in range(3, 11):
-            img.putpixel((ox + 7, oy + y + dy_head), outline)
-            img.putpixel((ox + 16, oy + y + dy_head), outline)
-        for x in range(7, 17):
-            img.putpixel((ox + x, oy + 10 + dy_head), outline)
-        # 头部
-        for x in range(8, 16):
-            for y in range(3, 10):
-                img.putpixel((ox + x, oy + y + dy_head), body)
-        # 眼睛
-        img.putpixel((ox + 10, oy + 5 + dy_head), outline)
-        img.putpixel((ox + 13, oy + 5 + dy_head), outline)
-        img.putpixel((ox + 10, oy + 6 + dy_head), highlight)
-        img.putpixel((ox + 13, oy + 6 + dy_head), highlight)
-        # 身体轮廓
-        for x in range(5, 19):
-            img.putpixel((ox + x, oy + 9 + dy_body), outline)
-        for y in range(10, 21):
-            img.putpixel((ox + 5, oy + y + dy_body), outline)
-            img.putpixel((ox + 18, oy + y + dy_body), outline)
-        for x in range(5, 19):
-            img.putpixel((ox + x, oy + 20 + dy_body), outline)
-        # 身体
-        for x in range(6, 18):
-            for y in range(10, 21):
-                img.putpixel((ox + x, oy + y + dy_body), body)
-        # 衣领（身体顶部略深）
-        for x in range(7, 17):
-            img.putpixel((ox + x, oy + 10 + dy_body), dark)
-        # 腰带
-        for x in range(7, 17):
-            img.putpixel((ox + x, oy + 16 + dy_body), belt)
-        # 左臂（带轮廓）
-        for x in range(2, 7):
-            for y in range(11, 18):
-                img.putpixel((ox + x + arm_left, oy + y), dark)
-        for y in range(11, 18):
-            img.putpixel((ox + 7 + arm_left, oy + y), outline)
-        # 右臂
-        for x in range(17, 22):
-            for y in range(11, 18):
-                img.putpixel((ox + x + arm_right, oy + y), dark)
-        for y in range(11, 18):
-            img.putpixel((ox + 16 + arm_right, oy + y), outline)
-        # 腿部轮廓（脚部）
-        for x in range(8, 12):
-            img.putpixel((ox + x + leg_left, oy + 20 + dy_body), outline)
-        for x in range(12, 16):
-            img.putpixel((ox + x + leg_right, oy + 20 + dy_body), outline)
-
-    for dir_idx in range(8):
-        ox = dir_idx * fw
-        # 行 0：站立
-        draw_frame(ox, 0)
-        # 行 1：行走帧1（左腿前、右臂前摆）
-        draw_frame(ox, fh, dy_head=0, dy_body=1, arm_left=1, arm_right=-1, leg_left=1, leg_right=-1)
-        # 行 2：行走帧2（右腿前、左臂前摆）
-        draw_frame(ox, fh * 2, dy_head=-1, dy_body=0, arm_left=-1, arm_right=1, leg_left=-1, leg_right=1)
-    return img
+    return recolor(_player_sheet_indexed(), PLAYER_PALETTES[scheme])
 
 
 def enemy_sprite_sheet(etype: int) -> Image.Image:
     """8 方向敌人精灵图：8 列 x 3 行（站立、行走帧1、行走帧2），每格 18x18"""
-    fw, fh = 18, 18
-    w, h = fw * 8, fh * 3
-    img = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-    stand = enemy_sprite(etype)
-    for dir_idx in range(8):
-        ox = dir_idx * fw
+    cells = [
         # 行 0：站立
-        for x in range(18):
-            for y in range(18):
-                img.putpixel((ox + x, y), stand.getpixel((x, y)))
+        SheetCell("stand"),
         # 行 1：行走帧1（整体下移 1 像素，模拟脚着地）
-        for x in range(18):
-            for y in range(17):
-                img.putpixel((ox + x, fh + 1 + y), stand.getpixel((x, y)))
+        SheetCell("stand", CellTransform(dy=1)),
         # 行 2：行走帧2（整体上移 1 像素，模拟抬脚）
-        for x in range(18):
-            for y in range(1, 18):
-                img.putpixel((ox + x, fh * 2 + y - 1), stand.getpixel((x, y)))
-    return img
+        SheetCell("stand", CellTransform(dy=-1)),
+    ]
+    return build_sheet({"stand": enemy_sprite(etype)}, direction_rows(cells), 18, 18)
 
 
 def player_sprite(scheme: int) -> Image.Image:
     """单帧玩家精灵，与 player_sprite_sheet 细节一致。"""
-    img = Image.new("RGBA", (24, 24), (0, 0, 0, 0))
-    body = (51, 178, 255, 255) if scheme == 0 else (255, 140, 51, 255)
-    dark = (38, 133, 191, 255) if scheme == 0 else (191, 105, 38, 255)
-    outline = (20, 90, 140, 255) if scheme == 0 else (180, 90, 20, 255)
-    highlight = (100, 200, 255, 255) if scheme == 0 else (255, 180, 100, 255)
-    belt = (60, 60, 70, 255)
+    return recolor(_player_sprite_indexed(), PLAYER_PALETTES[scheme])
+
+
+@functools.lru_cache(maxsize=None)
+def _player_sprite_indexed():
+    img = new_canvas(24, 24)
+    pal = PLAYER_PALETTES[0]
+    body, dark, outline, highlight, belt = pal["body"], pal["dark"], pal["outline"], pal["highlight"], pal["belt"]
     # 头部轮廓
-    for x in range(7, 17):
-        img.putpixel((x, 2), outline)
-    for y in range(3, 11):
-        img.putpixel((7, y), outline)
-        img.putpixel((16, y), outline)
-    for x in range(7, 17):
-        img.putpixel((x, 10), outline)
+    outline_rect(img, 7, 2, 17, 11, outline)
     # 头部
-    for x in range(8, 16):
-        for y in range(3, 10):
-            img.putpixel((x, y), body)
+    fill_rect(img, 8, 3, 16, 10, body)
     # 眼睛
-    img.putpixel((10, 5), outline)
-    img.putpixel((13, 5), outline)
-    img.putpixel((10, 6), highlight)
-    img.putpixel((13, 6), highlight)
+    hline(img, 10, 11, 5, outline)
+    hline(img, 13, 14, 5, outline)
+    hline(img, 10, 11, 6, highlight)
+    hline(img, 13, 14, 6, highlight)
     # 身体轮廓
-    for x in range(5, 19):
-        img.putpixel((x, 9), outline)
-    for y in range(10, 21):
-        img.putpixel((5, y), outline)
-        img.putpixel((18, y), outline)
-    for x in range(5, 19):
-        img.putpixel((x, 20), outline)
+    outline_rect(img, 5, 9, 19, 21, outline)
     # 身体
-    for x in range(6, 18):
-        for y in range(10, 21):
-            img.putpixel((x, y), body)
+    fill_rect(img, 6, 10, 18, 21, body)
     # 衣领
-    for x in range(7, 17):
-        img.putpixel((x, 10), dark)
+    hline(img, 7, 17, 10, dark)
     # 腰带
-    for x in range(7, 17):
-        img.putpixel((x, 16), belt)
+    hline(img, 7, 17, 16, belt)
     # 左臂
-    for x in range(3, 6):
-        for y in range(11, 18):
-            img.putpixel((x, y), dark)
-    img.putpixel((7, 11), outline)
-    img.putpixel((7, 12), outline)
+    fill_rect(img, 3, 11, 6, 18, dark)
+    vline(img, 7, 11, 13, outline)
     # 右臂
-    for x in range(18, 21):
-        for y in range(11, 18):
-            img.putpixel((x, y), dark)
-    img.putpixel((16, 11), outline)
-    img.putpixel((16, 12), outline)
+    fill_rect(img, 18, 11, 21, 18, dark)
+    vline(img, 16, 11, 13, outline)
     # 腿部轮廓
-    for x in range(8, 12):
-        img.putpixel((x, 20), outline)
-    for x in range(12, 16):
-        img.putpixel((x, 20), outline)
-    return img
+    hline(img, 8, 16, 20, outline)
+    return index_by_roles(img, pal)
+
+
+# 敌人基础配色（角色 → RGBA），下标同 etype：melee, ranged, tank, boss, aquatic, dasher
+ENEMY_PALETTES = [
+    {"body": (217, 51, 51, 255)},
+    {"body": (179, 46, 217, 255), "highlight": (255, 255, 255, 255)},
+    {"body": (51, 166, 64, 255), "outline": (37, 120, 46, 255)},
+    {"body": (179, 31, 46, 255), "highlight": (255, 255, 255, 255)},
+    {"body": (51, 191, 217, 255)},
+    {"body": (255, 115, 38, 255), "highlight": (255, 140, 70, 255)},
+]
+
+# 敌人档位：档位名 → (混入颜色, 比例)。整套配色向该色插值、描边保持原色，由 palette_swap 批量换色生成
+ENEMY_TIERS = {
+    "elite": ((255, 215, 64, 255), 0.4),
+    "frost": ((140, 210, 255, 255), 0.5),
+    "shadow": ((40, 24, 64, 255), 0.5),
+}
 
 
 def enemy_sprite(etype: int) -> Image.Image:
-    img = Image.new("RGBA", (18, 18), (0, 0, 0, 0))
+    img = new_canvas(18, 18)
+    pal = ENEMY_PALETTES[etype]
+    c = pal["body"]
     if etype == 0:  # melee
-        c = (217, 51, 51, 255)
-        for x in range(3, 15):
-            for y in range(3, 15):
-                img.putpixel((x, y), c)
-        img.putpixel((4, 2), c)
-        img.putpixel((13, 2), c)
+        fill_rect(img, 3, 3, 15, 15, c)
+        hline(img, 4, 5, 2, c)
+        hline(img, 13, 14, 2, c)
     elif etype == 1:  # ranged
-        c = (179, 46, 217, 255)
-        for x in range(1, 17):
-            for y in range(1, 17):
-                if abs(x - 8) + abs(y - 8) <= 7:
-                    img.putpixel((x, y), c)
-        img.putpixel((7, 7), (255, 255, 255, 255))
-        img.putpixel((8, 7), (255, 255, 255, 255))
+        diamond(img, 8, 8, 7, c, clip=(1, 1, 17, 17))
+        hline(img, 7, 9, 7, pal["highlight"])
     elif etype == 2:  # tank
-        c = (51, 166, 64, 255)
-        edge = (37, 120, 46, 255)
-        for x in range(2, 16):
-            for y in range(2, 16):
-                img.putpixel((x, y), c if 2 < x < 15 and 2 < y < 15 else edge)
+        fill_rect(img, 2, 2, 16, 16, pal["outline"])
+        fill_rect(img, 3, 3, 15, 15, c)
     elif etype == 4:  # aquatic
-        c = (51, 191, 217, 255)
-        for x in range(4, 14):
-            for y in range(5, 13):
-                img.putpixel((x, y), c)
-        for y in range(6, 12):
-            img.putpixel((2, y), c)
-        for y in range(7, 11):
-            img.putpixel((15, y), c)
+        fill_rect(img, 4, 5, 14, 13, c)
+        vline(img, 2, 6, 12, c)
+        vline(img, 15, 7, 11, c)
     elif etype == 5:  # dasher
-        c = (255, 115, 38, 255)
-        for x in range(1, 17):
-            for y in range(1, 17):
-                if abs(x - 8) + abs(y - 8) <= 6:
-                    img.putpixel((x, y), c)
-        img.putpixel((8, 8), (255, 140, 70, 255))
+        diamond(img, 8, 8, 6, c, clip=(1, 1, 17, 17))
+        hline(img, 8, 9, 8, pal["highlight"])
     else:  # boss
-        c = (179, 31, 46, 255)
-        for x in range(18):
-            for y in range(18):
-                if abs(x - 8.5) + abs(y - 8.5) <= 9:
-                    img.putpixel((x, y), c)
-        for px, py in [(8, 8), (9, 8), (8, 9), (9, 9)]:
-            img.putpixel((px, py), (255, 255, 255, 255))
+        diamond(img, 8.5, 8.5, 9, c)
+        fill_rect(img, 8, 8, 10, 10, pal["highlight"])
+    return img
+
+
+def enemy_tier_palette(etype: int, tier: str) -> dict:
+    target, amount = ENEMY_TIERS[tier]
+    return tint_palette(ENEMY_PALETTES[etype], target, amount, keep=("outline",))
+
+
+@functools.lru_cache(maxsize=None)
+def _enemy_indexed(etype: int, sheet: bool):
+    img = enemy_sprite_sheet(etype) if sheet else enemy_sprite(etype)
+    return index_by_roles(img, ENEMY_PALETTES[etype])
+
+
+def clear_render_caches() -> None:
+    """清空按进程缓存的索引化基础图（玩家单帧 / 精灵图、敌人基础图），下次渲染重新绘制。基准测试用。"""
+    for cached in (_player_sheet_indexed, _player_sprite_indexed, _enemy_indexed):
+        cached.cache_clear()
+
+
+def enemy_tier_sprite(etype: int, tier: str) -> Image.Image:
+    """敌人档位单帧：基础精灵索引化一次（按进程缓存），之后每个档位只换调色板。"""
+    return recolor(_enemy_indexed(etype, False), enemy_tier_palette(etype, tier))
+
+
+def enemy_tier_sheet(etype: int, tier: str) -> Image.Image:
+    """敌人档位精灵图，布局同 enemy_sprite_sheet。"""
+    return recolor(_enemy_indexed(etype, True), enemy_tier_palette(etype, tier))
+
+
+# 按 enemy_id 的占位敌人形状，下标同 PixelGenerator.generate_enemy_sprite_by_id 的 shape_type：
+# 0=方, 1=菱, 2=重甲, 3=圆, 4=鱼, 5=流线, 6=六边, 7=椭圆。运行时按 enemy_id 传入 body（dark 为其压暗 25%）
+ENEMY_SHAPE_COUNT = 8
+ENEMY_SHAPE_PALETTE = {"body": (255, 255, 255, 255), "dark": (191, 191, 191, 255)}
+
+
+def enemy_shape_sprite(shape: int, pal: dict = ENEMY_SHAPE_PALETTE) -> Image.Image:
+    img = new_canvas(18, 18)
+    c, dark = pal["body"], pal["dark"]
+    cx = cy = 8.5
+    if shape == 1:  # 菱形
+        diamond(img, cx, cy, 7, c, clip=(1, 1, 17, 17))
+    elif shape == 2:  # 重甲方块
+        fill_rect(img, 2, 2, 16, 16, dark)
+        fill_rect(img, 3, 3, 15, 15, c)
+    elif shape == 3:  # 圆形（Boss 用）
+        disc(img, cx, cy, 81, c)
+    elif shape == 4:  # 鱼形
+        fill_rect(img, 4, 5, 14, 13, c)
+        vline(img, 2, 6, 12, c)
+        vline(img, 15, 7, 11, c)
+    elif shape == 5:  # 流线菱形
+        diamond(img, cx, cy, 6, c, clip=(1, 1, 17, 17))
+    elif shape == 6:  # 六边形
+        fill_where(img, lambda x, y: abs(x - cx) + abs(y - cy) * 0.6 <= 7, c, clip=(2, 2, 16, 16))
+    elif shape == 7:  # 椭圆（蛇形）
+        fill_where(img, lambda x, y: (x - cx) * (x - cx) / 36.0 + (y - cy) * (y - cy) / 16.0 <= 1.0, c,
+                   clip=(2, 5, 16, 13))
+    else:  # 方形
+        fill_rect(img, 3, 3, 15, 15, c)
     return img
 
 
 def bullet_sprite(is_enemy: bool) -> Image.Image:
-    img = Image.new("RGBA", (4, 4), (0, 0, 0, 0))
+    img = new_canvas(4, 4)
     c = (255, 77, 77, 255) if is_enemy else (255, 255, 102, 255)
-    for x in range(4):
-        for y in range(4):
-            if abs(x - 1.5) + abs(y - 1.5) <= 2:
-                img.putpixel((x, y), c)
+    diamond(img, 1.5, 1.5, 2, c)
     return img
 
 
 def enemy_bullet_sprite() -> Image.Image:
     """敌人专用子弹：10x10 像素，个头更大，偏红色。"""
     size = 10
-    img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    img = new_canvas(size, size)
     c = (255, 77, 77, 255)
     cx = (size - 1) * 0.5
     cy = (size - 1) * 0.5
     r = 4.5
-    for x in range(size):
-        for y in range(size):
-            if (x - cx) ** 2 + (y - cy) ** 2 <= r * r:
-                img.putpixel((x, y), c)
+    disc(img, cx, cy, r * r, c)
     return img
 
 
+BULLET_TYPES = ["pistol", "shotgun", "rifle", "laser", "firearm", "orb"]
+
+
 def bullet_by_type(btype: str, color: tuple) -> Image.Image:
-    """3 种子弹类型：firearm(4x4)、laser(12x2)、orb(8x8)"""
+    """子弹类型：pistol / firearm(4x4 菱形)、shotgun(6x6 圆)、rifle(8x2)、laser(12x2)、orb(8x8 圆)；导出 firearm、laser、orb"""
     r, g, b = int(color[0] * 255), int(color[1] * 255), int(color[2] * 255)
     c = (r, g, b, 255)
-    if btype == "firearm":
-        img = Image.new("RGBA", (4, 4), (0, 0, 0, 0))
-        for x in range(4):
-            for y in range(4):
-                if abs(x - 1.5) + abs(y - 1.5) <= 2:
-                    img.putpixel((x, y), c)
+    if btype in ("firearm", "pistol"):
+        img = new_canvas(4, 4)
+        diamond(img, 1.5, 1.5, 2, c)
+    elif btype == "shotgun":
+        img = new_canvas(6, 6)
+        disc(img, 2.5, 2.5, 6.25, c)
+    elif btype == "rifle":
+        img = new_canvas(8, 2)
+        fill_rect(img, 0, 0, 8, 2, c)
     elif btype == "laser":
-        img = Image.new("RGBA", (12, 2), (0, 0, 0, 0))
-        for x in range(12):
-            for y in range(2):
-                img.putpixel((x, y), c)
+        img = new_canvas(12, 2)
+        fill_rect(img, 0, 0, 12, 2, c)
     elif btype == "orb":
-        img = Image.new("RGBA", (8, 8), (0, 0, 0, 0))
-        for x in range(8):
-            for y in range(8):
-                if (x - 3.5) ** 2 + (y - 3.5) ** 2 <= 12:
-                    img.putpixel((x, y), c)
+        img = new_canvas(8, 8)
+        disc(img, 3.5, 3.5, 12, c)
     else:
         img = bullet_sprite(False)
     return img
 
 
+# 地形 tile 纯色：floor/obstacle/boundary 不透明，grass/water 半透明叠加层
+TERRAIN_TILE_COLORS = {
+    "floor_a": (199, 199, 204, 255),  # 0.78, 0.78, 0.80
+    "floor_b": (184, 184, 189, 255),  # 0.72, 0.72, 0.74
+    "floor_seaside_a": (166, 199, 209, 255),  # 0.65, 0.78, 0.82
+    "floor_seaside_b": (140, 179, 191, 255),  # 0.55, 0.70, 0.75
+    "floor_mountain_a": (140, 133, 122, 255),  # 0.55, 0.52, 0.48
+    "floor_mountain_b": (122, 115, 107, 255),  # 0.48, 0.45, 0.42
+    "grass": (51, 115, 46, 115),  # 0.2, 0.45, 0.18, 0.45
+    "shallow_water": (61, 140, 204, 122),  # 0.24, 0.55, 0.80, 0.48
+    "deep_water": (20, 51, 107, 143),  # 0.08, 0.20, 0.42, 0.56
+    "obstacle": (41, 41, 51, 255),  # 0.16, 0.16, 0.20
+    "boundary": (84, 84, 89, 255),  # 0.33, 0.33, 0.35
+}
+
+
 def terrain_tile(tile_id: str) -> Image.Image:
-    """32x32 地形 tile"""
-    img = Image.new("RGBA", (32, 32), (0, 0, 0, 0))
-    if tile_id == "floor_a":
-        c = (199, 199, 204, 255)  # 0.78, 0.78, 0.80
-        img.paste(Image.new("RGBA", (32, 32), c), (0, 0))
-    elif tile_id == "floor_b":
-        c = (184, 184, 189, 255)  # 0.72, 0.72, 0.74
-        img.paste(Image.new("RGBA", (32, 32), c), (0, 0))
-    elif tile_id == "floor_seaside_a":
-        c = (166, 199, 209, 255)  # 0.65, 0.78, 0.82
-        img.paste(Image.new("RGBA", (32, 32), c), (0, 0))
-    elif tile_id == "floor_seaside_b":
-        c = (140, 179, 191, 255)  # 0.55, 0.70, 0.75
-        img.paste(Image.new("RGBA", (32, 32), c), (0, 0))
-    elif tile_id == "floor_mountain_a":
-        c = (140, 133, 122, 255)  # 0.55, 0.52, 0.48
-        img.paste(Image.new("RGBA", (32, 32), c), (0, 0))
-    elif tile_id == "floor_mountain_b":
-        c = (122, 115, 107, 255)  # 0.48, 0.45, 0.42
-        img.paste(Image.new("RGBA", (32, 32), c), (0, 0))
-    elif tile_id == "grass":
-        c = (51, 115, 46, 115)  # 0.2, 0.45, 0.18, 0.45
-        for x in range(32):
-            for y in range(32):
-                img.putpixel((x, y), c)
-    elif tile_id == "shallow_water":
-        c = (61, 140, 204, 122)  # 0.24, 0.55, 0.80, 0.48
-        for x in range(32):
-            for y in range(32):
-                img.putpixel((x, y), c)
-    elif tile_id == "deep_water":
-        c = (20, 51, 107, 143)  # 0.08, 0.20, 0.42, 0.56
-        for x in range(32):
-            for y in range(32):
-                img.putpixel((x, y), c)
-    elif tile_id == "obstacle":
-        c = (41, 41, 51, 255)  # 0.16, 0.16, 0.20
-        img.paste(Image.new("RGBA", (32, 32), c), (0, 0))
-    elif tile_id == "boundary":
-        c = (84, 84, 89, 255)  # 0.33, 0.33, 0.35
-        img.paste(Image.new("RGBA", (32, 32), c), (0, 0))
+    """32x32 地形 tile；未知 tile_id 返回全透明 tile"""
+    img = new_canvas(32, 32)
+    c = TERRAIN_TILE_COLORS.get(tile_id)
+    if c is not None:
+        fill_rect(img, 0, 0, 32, 32, c)
     return img
 
 
@@ -349,7 +392,7 @@ def terrain_atlas() -> Image.Image:
     # 第 2 行：mountain_a, mountain_b，其余复用 row0
     row2 = ["floor_mountain_a", "floor_mountain_b", "grass", "shallow_water", "deep_water", "obstacle", "boundary"]
     w, h = 32 * 7, 32 * 3
-    img = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    img = new_canvas(w, h)
     for i, tid in enumerate(row0):
         img.paste(terrain_tile(tid), (i * 32, 0))
     for i, tid in enumerate(row1):
@@ -359,165 +402,75 @@ def terrain_atlas() -> Image.Image:
     return img
 
 
-def swing_visual(weapon_id: str, color: tuple) -> Image.Image:
-    """近战挥击视觉 24x8"""
-    img = Image.new("RGBA", (24, 8), (0, 0, 0, 0))
+# 挥击图形状：按顺序绘制的 (颜色角色, x0, y0, x1, y1) 矩形，c=主色、dark=暗色（主色 ×0.7）
+SWING_SHAPES = {
+    "blade_short": [("c", 4, 2, 20, 6), ("dark", 6, 3, 18, 5)],
+    # 刺刀：细长尖刺，比 blade_short 更窄
+    "dagger": [("c", 6, 2, 18, 6), ("dark", 8, 3, 16, 5)],
+    # 长矛：细长枪尖，延伸更远
+    "spear": [("c", 2, 3, 22, 5), ("dark", 4, 3, 20, 5)],
+    # 链锯：锯齿状刀刃（每 3 像素一齿，齿宽 2）
+    "chainsaw": [("c", 4, 2, 20, 6)] + [("dark", x, 3, min(x + 2, 18), 5) for x in range(6, 18, 3)],
+    "hammer_heavy": [("c", 2, 1, 22, 7), ("dark", 4, 2, 20, 6)],
+}
+
+
+def _shade_colors(color: tuple) -> dict:
+    """由 0..1 浮点 RGB 得到主色 c 与暗色 dark（RGBA 整数）。"""
     r, g, b = int(color[0] * 255), int(color[1] * 255), int(color[2] * 255)
-    c = (r, g, b, 255)
-    dark = (int(r * 0.7), int(g * 0.7), int(b * 0.7), 255)
-    if weapon_id == "blade_short":
-        for x in range(4, 20):
-            for y in range(2, 6):
-                img.putpixel((x, y), c)
-        for x in range(6, 18):
-            for y in range(3, 5):
-                img.putpixel((x, y), dark)
-    elif weapon_id == "dagger":
-        # 刺刀：细长尖刺，比 blade_short 更窄
-        for x in range(6, 18):
-            for y in range(2, 6):
-                img.putpixel((x, y), c)
-        for x in range(8, 16):
-            for y in range(3, 5):
-                img.putpixel((x, y), dark)
-    elif weapon_id == "spear":
-        # 长矛：细长枪尖，延伸更远
-        for x in range(2, 22):
-            for y in range(3, 5):
-                img.putpixel((x, y), c)
-        for x in range(4, 20):
-            for y in range(3, 5):
-                img.putpixel((x, y), dark)
-    elif weapon_id == "chainsaw":
-        # 链锯：锯齿状刀刃
-        for x in range(4, 20):
-            for y in range(2, 6):
-                img.putpixel((x, y), c)
-        for x in range(6, 18):
-            if (x - 6) % 3 < 2:
-                img.putpixel((x, 3), dark)
-                img.putpixel((x, 4), dark)
-    else:  # hammer_heavy
-        for x in range(2, 22):
-            for y in range(1, 7):
-                img.putpixel((x, y), c)
-        for x in range(4, 20):
-            for y in range(2, 6):
-                img.putpixel((x, y), dark)
+    return {"c": (r, g, b, 255), "dark": (int(r * 0.7), int(g * 0.7), int(b * 0.7), 255)}
+
+
+def swing_visual(weapon_id: str, color: tuple) -> Image.Image:
+    """近战挥击视觉 24x8；未登记的 weapon_id 按 hammer_heavy 绘制"""
+    img = new_canvas(24, 8)
+    colors = _shade_colors(color)
+    for role, x0, y0, x1, y1 in SWING_SHAPES.get(weapon_id, SWING_SHAPES["hammer_heavy"]):
+        fill_rect(img, x0, y0, x1, y1, colors[role])
     return img
 
 
 def pickup_sprite(is_heal: bool) -> Image.Image:
-    img = Image.new("RGBA", (8, 8), (0, 0, 0, 0))
+    img = new_canvas(8, 8)
     if is_heal:
         c = (242, 51, 89, 255)
-        for x in range(2, 6):
-            img.putpixel((x, 1), c)
-            img.putpixel((x, 6), c)
-        for y in range(2, 6):
-            img.putpixel((1, y), c)
-            img.putpixel((6, y), c)
-        for x in range(2, 6):
-            for y in range(2, 6):
-                img.putpixel((x, y), c)
+        hline(img, 2, 6, 1, c)
+        hline(img, 2, 6, 6, c)
+        vline(img, 1, 2, 6, c)
+        vline(img, 6, 2, 6, c)
+        fill_rect(img, 2, 2, 6, 6, c)
     else:
         c = (255, 217, 56, 255)
-        for x in range(1, 7):
-            for y in range(1, 7):
-                if abs(x - 3.5) + abs(y - 3.5) <= 4:
-                    img.putpixel((x, y), c)
+        diamond(img, 3.5, 3.5, 4, c, clip=(1, 1, 7, 7))
     return img
 
 
+# 武器图标形状：按顺序绘制的 (颜色角色, x0, y0, x1, y1) 矩形；未登记的 weapon_id 绘制居中圆
+WEAPON_ICON_SHAPES = {
+    "blade_short": [("c", 36, 42, 60, 54), ("dark", 38, 44, 58, 52)],
+    "hammer_heavy": [("c", 32, 28, 64, 44), ("dark", 44, 44, 52, 72)],
+    "pistol_basic": [("c", 28, 40, 68, 56), ("dark", 32, 44, 48, 52)],
+    "shotgun_wide": [("c", 24, 42, 72, 54), ("dark", 40, 44, 56, 52)],
+    "rifle_long": [("c", 16, 44, 80, 52), ("dark", 36, 46, 60, 50)],
+    "wand_focus": [("dark", 44, 24, 52, 72), ("c", 38, 20, 58, 40)],
+    "dagger": [("c", 40, 42, 56, 54), ("dark", 42, 44, 54, 52)],
+    "spear": [("c", 28, 44, 68, 52), ("dark", 36, 46, 60, 50)],
+    "chainsaw": [("c", 32, 36, 64, 60), ("dark", 38, 42, 58, 54)],
+    "sniper": [("c", 12, 44, 84, 52), ("dark", 36, 46, 60, 50)],
+    "orb_wand": [("dark", 40, 24, 56, 72), ("c", 42, 32, 54, 48)],
+}
+
+
 def weapon_icon(weapon_id: str, color: tuple) -> Image.Image:
-    img = Image.new("RGBA", (96, 96), (0, 0, 0, 0))
-    r, g, b = int(color[0] * 255), int(color[1] * 255), int(color[2] * 255)
-    c = (r, g, b, 255)
-    dark = (int(r * 0.7), int(g * 0.7), int(b * 0.7), 255)
-    cx, cy = 48, 48
-
-    if weapon_id == "blade_short":
-        for x in range(36, 60):
-            for y in range(42, 54):
-                img.putpixel((x, y), c)
-        for x in range(38, 58):
-            for y in range(44, 52):
-                img.putpixel((x, y), dark)
-    elif weapon_id == "hammer_heavy":
-        for x in range(32, 64):
-            for y in range(28, 44):
-                img.putpixel((x, y), c)
-        for x in range(44, 52):
-            for y in range(44, 72):
-                img.putpixel((x, y), dark)
-    elif weapon_id == "pistol_basic":
-        for x in range(28, 68):
-            for y in range(40, 56):
-                img.putpixel((x, y), c)
-        for x in range(32, 48):
-            for y in range(44, 52):
-                img.putpixel((x, y), dark)
-    elif weapon_id == "shotgun_wide":
-        for x in range(24, 72):
-            for y in range(42, 54):
-                img.putpixel((x, y), c)
-        for x in range(40, 56):
-            for y in range(44, 52):
-                img.putpixel((x, y), dark)
-    elif weapon_id == "rifle_long":
-        for x in range(16, 80):
-            for y in range(44, 52):
-                img.putpixel((x, y), c)
-        for x in range(36, 60):
-            for y in range(46, 50):
-                img.putpixel((x, y), dark)
-    elif weapon_id == "wand_focus":
-        for x in range(44, 52):
-            for y in range(24, 72):
-                img.putpixel((x, y), dark)
-        for x in range(38, 58):
-            for y in range(20, 40):
-                img.putpixel((x, y), c)
-    elif weapon_id == "dagger":
-        for x in range(40, 56):
-            for y in range(42, 54):
-                img.putpixel((x, y), c)
-        for x in range(42, 54):
-            for y in range(44, 52):
-                img.putpixel((x, y), dark)
-    elif weapon_id == "spear":
-        for x in range(28, 68):
-            for y in range(44, 52):
-                img.putpixel((x, y), c)
-        for x in range(36, 60):
-            for y in range(46, 50):
-                img.putpixel((x, y), dark)
-    elif weapon_id == "chainsaw":
-        for x in range(32, 64):
-            for y in range(36, 60):
-                img.putpixel((x, y), c)
-        for x in range(38, 58):
-            for y in range(42, 54):
-                img.putpixel((x, y), dark)
-    elif weapon_id == "sniper":
-        for x in range(12, 84):
-            for y in range(44, 52):
-                img.putpixel((x, y), c)
-        for x in range(36, 60):
-            for y in range(46, 50):
-                img.putpixel((x, y), dark)
-    elif weapon_id == "orb_wand":
-        for x in range(40, 56):
-            for y in range(24, 72):
-                img.putpixel((x, y), dark)
-        for x in range(42, 54):
-            for y in range(32, 48):
-                img.putpixel((x, y), c)
-    else:
-        for x in range(96):
-            for y in range(96):
-                if (x - cx) ** 2 + (y - cy) ** 2 < 32 ** 2:
-                    img.putpixel((x, y), c)
+    img = new_canvas(96, 96)
+    colors = _shade_colors(color)
+    shapes = WEAPON_ICON_SHAPES.get(weapon_id)
+    if shapes is None:
+        # 整数坐标下 (x-48)² + (y-48)² < 32² 等价于 <= 32² - 1
+        disc(img, 48, 48, 32 ** 2 - 1, colors["c"])
+        return img
+    for role, x0, y0, x1, y1 in shapes:
+        fill_rect(img, x0, y0, x1, y1, colors[role])
     return img
 
 
@@ -536,33 +489,273 @@ WEAPON_DEFS = [
 ]
 
 
-def main():
-    ensure_dirs()
+# 挥击图：(weapon_id, 颜色)，颜色与 WEAPON_DEFS 中同名武器一致
+SWING_DEFS = [
+    ("blade_short", (0.95, 0.30, 0.30)),
+    ("hammer_heavy", (0.90, 0.58, 0.24)),
+    ("dagger", (0.60, 0.65, 0.75)),
+    ("spear", (0.55, 0.60, 0.70)),
+    ("chainsaw", (0.35, 0.38, 0.40)),
+]
+
+ENEMY_NAMES = ["enemy_melee", "enemy_ranged", "enemy_tank", "enemy_boss", "enemy_aquatic", "enemy_dasher"]
+
+TERRAIN_EXPORT_TILES = ["floor_a", "floor_b", "grass", "shallow_water", "deep_water", "obstacle", "boundary"]
+
+
+def build_jobs() -> list:
+    """声明式导出任务列表；顺序即写盘与日志顺序。新增角色/敌人/武器时在此追加。"""
+    jobs = []
     for i in range(2):
-        save_png(player_sprite(i), ASSETS / "characters" / f"player_scheme_{i}.png")
-        save_png(player_sprite_sheet(i), ASSETS / "characters" / f"player_scheme_{i}_sheet.png")
-    names = ["enemy_melee", "enemy_ranged", "enemy_tank", "enemy_boss", "enemy_aquatic", "enemy_dasher"]
-    for i, name in enumerate(names):
-        save_png(enemy_sprite(i), ASSETS / "enemies" / f"{name}.png")
-        save_png(enemy_sprite_sheet(i), ASSETS / "enemies" / f"{name}_sheet.png")
+        jobs.append(AssetJob(f"characters/player_scheme_{i}.png", player_sprite, (i,)))
+        jobs.append(AssetJob(f"characters/player_scheme_{i}_sheet.png", player_sprite_sheet, (i,)))
+    for i, name in enumerate(ENEMY_NAMES):
+        jobs.append(AssetJob(f"enemies/{name}.png", enemy_sprite, (i,)))
+        jobs.append(AssetJob(f"enemies/{name}_sheet.png", enemy_sprite_sheet, (i,)))
     for wid, color in WEAPON_DEFS:
-        save_png(weapon_icon(wid, color), ASSETS / "weapons" / f"{wid}.png")
-    save_png(swing_visual("blade_short", (0.95, 0.30, 0.30)), ASSETS / "weapons" / "swing_blade_short.png")
-    save_png(swing_visual("hammer_heavy", (0.90, 0.58, 0.24)), ASSETS / "weapons" / "swing_hammer_heavy.png")
-    save_png(swing_visual("dagger", (0.60, 0.65, 0.75)), ASSETS / "weapons" / "swing_dagger.png")
-    save_png(swing_visual("spear", (0.55, 0.60, 0.70)), ASSETS / "weapons" / "swing_spear.png")
-    save_png(swing_visual("chainsaw", (0.35, 0.38, 0.40)), ASSETS / "weapons" / "swing_chainsaw.png")
-    save_png(bullet_by_type("firearm", (1.0, 1.0, 0.4)), ASSETS / "bullets" / "bullet_firearm.png")
-    save_png(bullet_by_type("laser", (0.88, 0.46, 0.95)), ASSETS / "bullets" / "bullet_laser.png")
-    save_png(bullet_by_type("orb", (0.88, 0.46, 0.95)), ASSETS / "bullets" / "bullet_orb.png")
-    save_png(bullet_sprite(False), ASSETS / "bullets" / "player_bullet.png")
-    save_png(enemy_bullet_sprite(), ASSETS / "bullets" / "enemy_bullet.png")
-    save_png(pickup_sprite(False), ASSETS / "pickups" / "coin.png")
-    save_png(pickup_sprite(True), ASSETS / "pickups" / "heal.png")
-    for tid in ["floor_a", "floor_b", "grass", "shallow_water", "deep_water", "obstacle", "boundary"]:
-        save_png(terrain_tile(tid), ASSETS / "terrain" / f"{tid}.png")
-    save_png(terrain_atlas(), ASSETS / "terrain" / "terrain_atlas.png")
-    print(f"Pixel assets exported to {ASSETS}")
+        jobs.append(AssetJob(f"weapons/{wid}.png", weapon_icon, (wid, color)))
+    for wid, color in SWING_DEFS:
+        jobs.append(AssetJob(f"weapons/swing_{wid}.png", swing_visual, (wid, color)))
+    jobs += [
+        AssetJob("bullets/bullet_firearm.png", bullet_by_type, ("firearm", (1.0, 1.0, 0.4))),
+        AssetJob("bullets/bullet_laser.png", bullet_by_type, ("laser", (0.88, 0.46, 0.95))),
+        AssetJob("bullets/bullet_orb.png", bullet_by_type, ("orb", (0.88, 0.46, 0.95))),
+        AssetJob("bullets/player_bullet.png", bullet_sprite, (False,)),
+        AssetJob("bullets/enemy_bullet.png", enemy_bullet_sprite),
+        AssetJob("pickups/coin.png", pickup_sprite, (False,)),
+        AssetJob("pickups/heal.png", pickup_sprite, (True,)),
+    ]
+    for tid in TERRAIN_EXPORT_TILES:
+        jobs.append(AssetJob(f"terrain/{tid}.png", terrain_tile, (tid,)))
+    jobs.append(AssetJob("terrain/terrain_atlas.png", terrain_atlas))
+    return jobs
+
+
+def asset_id(rel: str) -> str:
+    """资源 ID：相对 assets/ 的路径去掉 .png 后缀，如 enemies/enemy_tank_sheet。"""
+    return rel[: -len(".png")] if rel.endswith(".png") else rel
+
+
+def asset_registry() -> dict:
+    """资源 ID → AssetJob（按 build_jobs() 顺序）。"""
+    return {asset_id(job.rel): job for job in build_jobs()}
+
+
+def asset_ids() -> list:
+    return list(asset_registry())
+
+
+def _lookup(registry: dict, asset: str) -> AssetJob:
+    job = registry.get(asset_id(asset))
+    if job is None:
+        raise KeyError(f"未知资源 ID: {asset!r}")
+    return job
+
+
+def _render(job: AssetJob, encoded: bool):
+    img = job.generator(*job.args)
+    if job.make_opaque:
+        img = force_opaque(img)
+    return encode_optimized_png(img) if encoded else img
+
+
+def render(asset: str, encoded: bool = False):
+    """在内存中渲染单个资源，不触碰文件系统。
+
+    asset 为资源 ID（也接受带 .png 的相对路径）；encoded=False 返回 RGBA 图，True 返回与导出文件一致的 PNG 字节。
+    未知 ID 抛出 KeyError。
+    """
+    return _render(_lookup(asset_registry(), asset), encoded)
+
+
+def render_many(assets: list | None = None, encoded: bool = False, workers: int = 1) -> dict:
+    """批量渲染，返回 {资源 ID: 图或 PNG 字节}，顺序与 assets 一致；assets 为 None 时渲染全部。
+
+    workers > 1 时用进程池并行（结果经 pickle 传回）。
+    """
+    registry = asset_registry()
+    jobs = {asset_id(a): _lookup(registry, a) for a in (registry if assets is None else assets)}
+    fn = functools.partial(_render, encoded=encoded)
+    if workers <= 1 or len(jobs) <= 1:
+        return {key: fn(job) for key, job in jobs.items()}
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return dict(zip(jobs, pool.map(fn, jobs.values())))
+
+
+def run_jobs(jobs: list, workers: int = 1, encoder: str = "png") -> list:
+    """渲染任务列表，返回与 jobs 顺序一致的 render_job 结果列表；workers > 1 时使用进程池。"""
+    fn = functools.partial(render_job, encoder=encoder)
+    if workers <= 1 or len(jobs) <= 1:
+        return [fn(job) for job in jobs]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        # map 按提交顺序返回结果，与完成先后无关，保证输出确定
+        return list(pool.map(fn, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def _saving(baseline: int, size: int) -> str:
+    return f"{(size - baseline) / baseline:+.0%}" if baseline else "n/a"
+
+
+def export_once(opts) -> None:
+    """按已解析的命令行选项导出一次（main 与 --watch 的每轮重建共用）。"""
+    from asset_manifest import BuildManifest, job_hash, refresh_asset_index
+
+    profiler = AssetProfiler.from_args(opts)
+    profiler.start()
+    workers = opts.jobs if opts.jobs > 0 else (os.cpu_count() or 1)
+    root = opts.out.resolve()
+    ensure_dirs(root)
+    manifest = BuildManifest(root)
+    encoder = get_encoder(opts.encoder)
+    # 默认 png 后端沿用原有哈希，已有清单不失效；其他后端的规格计入哈希，切换后端即全部重建
+    version = TOOL_VERSION if encoder.spec == "png" else f"{TOOL_VERSION}+{encoder.spec}"
+    jobs = build_jobs()
+    rels = [str(Path(job.rel).with_suffix(encoder.suffix).as_posix()) for job in jobs]
+    hashes = [job_hash(job.generator, job.args, job.make_opaque, version, job.inputs) for job in jobs]
+    pending = [i for i in range(len(jobs)) if not (opts.incremental and manifest.is_fresh(rels[i], hashes[i]))]
+    rendered = dict(zip(pending, run_jobs([jobs[i] for i in pending], workers, encoder.spec)))
+
+    stats = {"built": 0, "skipped": 0}
+    baseline_total = written_total = 0
+    written = {}
+    for i, rel in enumerate(rels):
+        if i not in rendered:
+            stats["skipped"] += 1
+            continue
+        data, baseline, stages, pixels = rendered[i]
+        path = root / rel
+        manifest.record(rel, hashes[i], data)
+        # 增量模式下字节未变则不写盘，保持 mtime 不变
+        if opts.incremental and path.is_file() and path.read_bytes() == data:
+            stats["skipped"] += 1
+            profiler.add(rel, stages, pixels, 0, status="unchanged")
+            continue
+        t0 = time.perf_counter()
+        path.write_bytes(data)
+        written[rel] = data
+        profiler.add(rel, {**stages, "write": time.perf_counter() - t0}, pixels, len(data), status="built")
+        stats["built"] += 1
+        baseline_total += baseline
+        written_total += len(data)
+        print(f"  Saved: {path.relative_to(root.parent)} ({baseline} -> {len(data)} B, {_saving(baseline, len(data))})")
+    # 清单中已不再导出的资源：删除其上次写出的文件（被手动替换过的文件保留）
+    removed = manifest.prune(set(rels))
+    for rel in removed:
+        print(f"  Removed: {rel}")
+    manifest.save()
+    # 重写过的文件在资源索引中的哈希、trim 偏移与 compact 帧表已过期，按新内容刷新
+    refreshed = refresh_asset_index(root, written)
+    if refreshed:
+        print(f"  asset_index.json: refreshed {refreshed} entries (trim/frames dropped)")
+    print(f"Pixel assets exported to {root}: built {stats['built']}, skipped {stats['skipped']}, "
+          f"removed {len(removed)}")
+    if stats["built"]:
+        print(f"Encoded size vs 32-bit RGBA: {baseline_total} -> {written_total} B "
+              f"({_saving(baseline_total, written_total)})")
+    profiler.finish()
+
+
+# --watch 时按依赖顺序重新加载的工具模块（被依赖者在前）；未导入的模块跳过
+WATCH_RELOAD_ORDER = ["raster", "alpha_ops", "asset_encode", "asset_manifest", "asset_profile", "palette_swap",
+                      "sheet_builder", "export_pixel_assets"]
+
+
+def _watched_files(exporter) -> dict:
+    """监视对象 → mtime：tools 目录下已导入模块的源文件，以及各任务的输入 PNG。"""
+    import sys
+
+    files = set()
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and Path(path).resolve().parent == TOOLS_DIR:
+            files.add(Path(path).resolve())
+    for job in exporter.build_jobs():
+        files.update(PROJECT_ROOT / rel for rel in job.inputs)
+    return {f: (f.stat().st_mtime_ns if f.exists() else None) for f in files}
+
+
+def _reload_tools():
+    """按依赖顺序重新加载工具模块，返回新的 export_pixel_assets 模块。"""
+    import importlib
+    import linecache
+    import sys
+
+    linecache.checkcache()
+    importlib.import_module("export_pixel_assets")
+    for name in WATCH_RELOAD_ORDER:
+        if name in sys.modules:
+            importlib.reload(sys.modules[name])
+    return sys.modules["export_pixel_assets"]
+
+
+def watch(opts) -> None:
+    """常驻进程：轮询生成器源码与输入 PNG 的 mtime，变化平息 debounce 秒后重新加载并增量重建。
+
+    仅用标准库轮询；每轮重建沿用 --incremental 语义，只渲染、写入任务哈希变化的资源。Ctrl+C 退出。
+    """
+    import importlib
+    import traceback
+
+    opts.incremental = True
+    exporter = importlib.import_module("export_pixel_assets")
+    exporter.export_once(opts)
+    snapshot = _watched_files(exporter)
+    print(f"Watching {len(snapshot)} files (poll {opts.poll}s, debounce {opts.debounce}s); Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(opts.poll)
+            current = _watched_files(exporter)
+            if current == snapshot:
+                continue
+            # 去抖：连续保存期间持续等待，直到 debounce 秒内不再变化
+            while True:
+                time.sleep(opts.debounce)
+                settled = _watched_files(exporter)
+                if settled == current:
+                    break
+                current = settled
+            changed = sorted(f.name for f in set(current) | set(snapshot) if current.get(f) != snapshot.get(f))
+            print(f"Changed: {', '.join(changed)}")
+            try:
+                exporter = _reload_tools()
+                exporter.export_once(opts)
+            except Exception:
+                # 编辑中途的语法错误等：打印后继续监视，下次保存再试
+                traceback.print_exc()
+            snapshot = _watched_files(exporter)
+    except KeyboardInterrupt:
+        print("Watch stopped")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="导出像素美术资源到 assets/ 目录")
+    parser.add_argument("--incremental", action="store_true", help="跳过任务哈希与磁盘内容均未变化的资源")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N", help="并行渲染进程数，0 表示按 CPU 核数（默认 1）")
+    parser.add_argument("--out", type=Path, default=ASSETS, metavar="DIR", help="输出目录（默认 assets/）")
+    parser.add_argument("--watch", action="store_true", help="常驻监视生成器源码与输入 PNG，变化后只重建受影响的资源")
+    parser.add_argument("--poll", type=float, default=0.5, metavar="SEC", help="--watch 轮询间隔（默认 0.5 秒）")
+    parser.add_argument("--debounce", type=float, default=0.3, metavar="SEC", help="--watch 去抖时间（默认 0.3 秒）")
+    parser.add_argument("--encoder", default="png", metavar="SPEC",
+                        help="编码后端：png[:level=0..9,strategy=default|filtered|huffman|rle|fixed,indexed=0|1]、"
+                             "webp[:method=0..6]（无损）、raw（RGBA 转储）；默认 png")
+    add_profile_args(parser)
+    opts = parser.parse_args(argv)
+    try:
+        encoder = get_encoder(opts.encoder)
+    except ValueError as e:
+        parser.error(str(e))
+    if encoder.suffix != ".png" and opts.out.resolve() == ASSETS.resolve():
+        parser.error(f"{opts.encoder} 输出 {encoder.suffix} 文件，场景与配置引用的是 .png 路径，请用 --out 导出到其他目录")
+    if opts.watch:
+        watch(opts)
+    else:
+        export_once(opts)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
-"""批量将 assets/ 下所有 PNG 的非空白像素设为不透明。运行: python scripts/tools/make_opaque.py"""
+"""批量将 assets/ 下 PNG 的非空白像素设为不透明。
+运行: python scripts/tools/make_opaque.py [--dry-run] [--jobs N] [--include GLOB] [--exclude GLOB] [--profile REPORT.jsonl]
+先做 alpha 直方图检查，已完全不透明或仅二值 alpha 的文件原样保留（不重写、不触发 Godot 重新导入）。"""
 
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 try:
@@ -9,41 +14,86 @@ except ImportError:
     print("需要安装 Pillow: pip install Pillow")
     raise SystemExit(1)
 
+from alpha_ops import force_opaque, has_partial_alpha
+from asset_encode import encode_png
+from asset_profile import AssetProfiler, StageTimer, add_profile_args
+from asset_select import select_pngs
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 ASSETS = PROJECT_ROOT / "assets"
 
 
-def force_opaque(img: Image.Image) -> Image.Image:
-    """将非空白像素的 alpha 设为 255。"""
-    img = img.copy()
-    for x in range(img.width):
-        for y in range(img.height):
-            px = img.getpixel((x, y))
-            if len(px) == 4:
-                r, g, b, a = px
-                if a > 0:
-                    img.putpixel((x, y), (r, g, b, 255))
-            else:
-                # RGB 模式无需处理
-                pass
-    return img
+def process_png(png: Path, dry_run: bool = False) -> tuple:
+    """处理单个文件，返回 (状态, 原字节数, 新字节数, 错误信息, 各阶段耗时, 像素数)；状态为 modified / clean / error。"""
+    timer = StageTimer()
+    try:
+        old_size = png.stat().st_size
+        with timer.stage("decode"), Image.open(png) as src:
+            src.load()
+            pixels = src.width * src.height
+            if not has_partial_alpha(src):
+                return "clean", old_size, old_size, "", timer.stages, pixels
+            img = src.convert("RGBA")
+        with timer.stage("opaque"):
+            img = force_opaque(img)
+        with timer.stage("encode"):
+            data = encode_png(img)
+        if not dry_run:
+            with timer.stage("write"):
+                png.write_bytes(data)
+        return "modified", old_size, len(data), "", timer.stages, pixels
+    except Exception as e:
+        return "error", 0, 0, str(e), timer.stages, 0
+
 
+def _process_args(args: tuple) -> tuple:
+    return process_png(*args)
 
-def main():
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批量将 assets/ 下 PNG 的非空白像素设为不透明")
+    parser.add_argument("--dry-run", action="store_true", help="只统计将被修改的文件，不写盘")
+    parser.add_argument("--jobs", type=int, default=0, metavar="N", help="并行进程数，0 表示按 CPU 核数（默认 0）")
+    parser.add_argument("--include", action="append", default=[], metavar="GLOB",
+                        help="仅处理匹配的文件（相对 assets/，可重复，如 weapons/*.png）")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB", help="跳过匹配的文件（可重复）")
+    add_profile_args(parser)
+    opts = parser.parse_args(argv)
+    profiler = AssetProfiler.from_args(opts)
+    profiler.start()
     if not ASSETS.exists():
         print(f"assets 目录不存在: {ASSETS}")
         return
-    count = 0
-    for png in ASSETS.rglob("*.png"):
-        try:
-            img = Image.open(png).convert("RGBA")
-            out = force_opaque(img)
-            out.save(png)
-            count += 1
-            print(f"  {png.relative_to(PROJECT_ROOT)}")
-        except Exception as e:
-            print(f"  跳过 {png}: {e}")
-    print(f"已处理 {count} 个 PNG 文件")
+    # 文件选择与 asset_pipeline.py 共用 asset_select
+    pngs = [ASSETS / rel for rel in select_pngs(opts.include, opts.exclude)]
+    workers = min(opts.jobs if opts.jobs > 0 else (os.cpu_count() or 1), max(len(pngs), 1))
+    tasks = [(png, opts.dry_run) for png in pngs]
+    if workers <= 1:
+        results = [_process_args(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map 按提交顺序返回，日志顺序与文件排序一致
+            results = list(pool.map(_process_args, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    modified = skipped = errors = 0
+    old_total = new_total = 0
+    for png, (status, old_size, new_size, err, stages, pixels) in zip(pngs, results):
+        rel = png.relative_to(PROJECT_ROOT)
+        profiler.add(png.relative_to(ASSETS).as_posix(), stages, pixels,
+                     new_size if status == "modified" and not opts.dry_run else 0, status=status)
+        if status == "modified":
+            modified += 1
+            old_total += old_size
+            new_total += new_size
+            print(f"  {'将修改' if opts.dry_run else '已修改'} {rel} ({old_size} -> {new_size} B)")
+        elif status == "clean":
+            skipped += 1
+        else:
+            errors += 1
+            print(f"  跳过 {rel}: {err}")
+    print(f"扫描 {len(pngs)} 个 PNG：修改 {modified}，跳过 {skipped}（已不透明/二值 alpha），出错 {errors}；"
+          f"字节变化 {old_total} -> {new_total} ({new_total - old_total:+d} B)" + ("  [dry-run]" if opts.dry_run else ""))
+    profiler.finish()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""将 assets/ 下选定分组的小图打包为 2 的幂尺寸图集，并写出区域表。
+在 export_pixel_assets.py 之后运行: python scripts/tools/pack_atlas.py [--group combat] [--padding 2] [--extrude 1] [--trim]
+--trim 先在内存中裁掉每张小图四周的全透明边再装箱，margins 补回原尺寸与偏移（摆放不变，图集更小）；
+已被 asset_pipeline.py trim 阶段原地裁过的文件无论是否 --trim 都按 assets/trim_index.json 还原到最初尺寸。
+
+输出（以 combat 组为例）：
+- assets/atlas/combat.png   图集
+- assets/atlas/combat.json  区域表：regions 原 res:// 路径 → [x, y, w, h]；margins 路径 → [左, 上, 补宽, 补高]；
+                            sources 路径 → 打包时源 PNG 的 sha256
+asset_pipeline.py index 把区域并入资源索引（源文件哈希一致时），VisualAssetRegistry.get_texture_cached
+对这些路径返回指向图集的 AtlasTexture，脚本与场景仍引用原 PNG 路径。
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+from pathlib import Path
+
+from PIL import Image
+
+from alpha_ops import trim_box
+from raster import new_canvas
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+ASSETS = PROJECT_ROOT / "assets"
+ATLAS_DIR = ASSETS / "atlas"
+MAX_ATLAS_SIZE = 4096
+TRIM_INDEX = ASSETS / "trim_index.json"
+# 精灵表按固定帧格切 region_rect，由角色/敌人脚本直接加载，不进图集
+SPRITE_EXCLUDE = ["*_sheet.png"]
+
+# 图集分组：组名 → 相对 assets/ 的 glob 列表（* 不跨目录，enemies/*.png 不含 enemies/tiers/）。
+# 战斗中同屏大量出现的小图放在同一组，减少纹理切换
+ATLAS_GROUPS = {
+    "combat": [
+        "bullets/*.png",
+        "pickups/*.png",
+        "enemies/*.png",
+        "weapons/swing_*.png",
+    ],
+}
+
+
+def _match(rel: str, pattern: str) -> bool:
+    """glob 匹配，但要求目录层数相同（fnmatch 的 * 会跨越 /）。"""
+    return rel.count("/") == pattern.count("/") and fnmatch.fnmatch(rel, pattern)
+
+
+def collect_sprites(patterns: list) -> list:
+    """按 glob 收集 PNG（相对 assets/ 的路径，排序保证结果确定），跳过精灵表与图集输出。"""
+    rels = set()
+    for png in ASSETS.rglob("*.png"):
+        rel = png.relative_to(ASSETS).as_posix()
+        if rel.startswith("atlas/") or any(fnmatch.fnmatch(rel, pat) for pat in SPRITE_EXCLUDE):
+            continue
+        if any(_match(rel, pat) for pat in patterns):
+            rels.add(rel)
+    return sorted(rels)
+
+
+def _skyline_pack(sizes: list, width: int, height: int) -> dict | None:
+    """天际线（bottom-left）装箱：按高度降序逐个放到使其顶边最低的位置。
+
+    sizes 为 (索引, w, h)；返回 {索引: (x, y)}，放不下返回 None。
+    天际线为按 x 排列的 [x, y, w] 段列表，表示每段当前已占用到的高度。
+    """
+    skyline = [[0, 0, width]]
+    placed = {}
+    for idx, w, h in sorted(sizes, key=lambda s: (-s[2], -s[1], s[0])):
+        best = None  # (顶边 y, x, 起始段下标)
+        for i, (sx, _, _) in enumerate(skyline):
+            if sx + w > width:
+                break
+            # 从第 i 段开始向右覆盖 w 宽度，所需高度为覆盖段中的最高者
+            y, covered, j = 0, 0, i
+            while covered < w:
+                y = max(y, skyline[j][1])
+                covered += skyline[j][2] - (sx - skyline[j][0] if j == i else 0)
+                j += 1
+            if y + h <= height and (best is None or (y + h, sx) < (best[0] + h, best[1])):
+                best = (y, sx, i)
+        if best is None:
+            return None
+        y, x, i = best
+        placed[idx] = (x, y)
+        # 更新天际线：插入新段，并截掉被其覆盖的旧段
+        new_seg = [x, y + h, w]
+        rest = []
+        for seg in skyline[i:]:
+            seg_end = seg[0] + seg[2]
+            if seg_end <= x + w:
+                continue
+            if seg[0] < x + w:
+                seg = [x + w, seg[1], seg_end - (x + w)]
+            rest.append(seg)
+        merged = []
+        for seg in skyline[:i] + [new_seg] + rest:
+            if merged and merged[-1][1] == seg[1]:
+                merged[-1][2] += seg[2]
+            else:
+                merged.append(list(seg))
+        skyline = merged
+    return placed
+
+
+def pack(sizes: list) -> tuple:
+    """为 (w, h) 列表寻找能容纳全部矩形的最小 2 的幂图集，返回 ((W, H), [(x, y), ...])。"""
+    area = sum(w * h for w, h in sizes)
+    side = 1
+    while side * side < area:
+        side *= 2
+    width, height = side, max(side // 2, 1)
+    indexed = [(i, w, h) for i, (w, h) in enumerate(sizes)]
+    while width <= MAX_ATLAS_SIZE and height <= MAX_ATLAS_SIZE:
+        placed = _skyline_pack(indexed, width, height)
+        if placed is not None:
+            return (width, height), [placed[i] for i in range(len(sizes))]
+        # 交替扩大高、宽，保持接近正方形
+        if height < width:
+            height *= 2
+        else:
+            width *= 2
+    raise SystemExit(f"图集超过 {MAX_ATLAS_SIZE}x{MAX_ATLAS_SIZE}，请拆分分组")
+
+
+def _extrude(atlas: Image.Image, img: Image.Image, x: int, y: int, n: int) -> None:
+    """把 img 贴到 (x, y)，并将四条边缘像素向外复制 n 像素，防止缩放/过滤时采样到相邻小图。"""
+    w, h = img.size
+    atlas.paste(img, (x, y))
+    if n <= 0:
+        return
+    edges = [
+        (img.crop((0, 0, w, 1)).resize((w, n)), (x, y - n)),
+        (img.crop((0, h - 1, w, h)).resize((w, n)), (x, y + h)),
+        (img.crop((0, 0, 1, h)).resize((n, h)), (x - n, y)),
+        (img.crop((w - 1, 0, w, h)).resize((n, h)), (x + w, y)),
+    ]
+    corners = [((0, 0), (x - n, y - n)), ((w - 1, 0), (x + w, y - n)),
+               ((0, h - 1), (x - n, y + h)), ((w - 1, h - 1), (x + w, y + h))]
+    for band, pos in edges:
+        atlas.paste(band, pos)
+    for src, pos in corners:
+        atlas.paste(img.getpixel(src), (pos[0], pos[1], pos[0] + n, pos[1] + n))
+
+
+def load_trim_index(path: Path = TRIM_INDEX) -> dict:
+    return json.loads(path.read_text(encoding="utf-8")) if path.is_file() else {}
+
+
+def trim_sprite(rel: str, im: Image.Image, trim_index: dict, crop: bool = True) -> tuple:
+    """裁掉四周全透明边，返回 (裁后图, margin)；margin 相对最初尺寸（含原地裁边记录），无需补回时为 None。
+
+    crop=False 时不再裁边，只按 trim_index 补回 trim 阶段原地裁掉的偏移，否则这些小图在图集中会丢失原摆放。
+    """
+    box = trim_box(im) if crop else (0, 0, im.width, im.height)
+    if box is None:
+        return im, None
+    ox, oy, (sw, sh) = 0, 0, im.size
+    entry = trim_index.get(res_path(ASSETS / rel))
+    if entry and entry.get("sha256") == hashlib.sha256((ASSETS / rel).read_bytes()).hexdigest():
+        (ox, oy), (sw, sh) = entry["offset"], entry["source_size"]
+    if box != (0, 0, im.width, im.height):
+        im = im.crop(box)
+    margin = (ox + box[0], oy + box[1], sw - im.width, sh - im.height)
+    return im, margin if any(margin) else None
+
+
+def res_path(path: Path) -> str:
+    return "res://" + path.relative_to(PROJECT_ROOT).as_posix()
+
+
+def build_atlas(group: str, patterns: list, padding: int, extrude: int, trim: bool = False) -> dict:
+    """打包一个分组并写出图集与区域表，返回统计信息。"""
+    rels = collect_sprites(patterns)
+    if not rels:
+        return {"group": group, "sprites": 0}
+    raws = [(ASSETS / rel).read_bytes() for rel in rels]
+    images = [Image.open(ASSETS / rel).convert("RGBA") for rel in rels]
+    trim_index = load_trim_index()
+    images, margins = map(list, zip(*(trim_sprite(rel, im, trim_index, trim) for rel, im in zip(rels, images))))
+    # 每个矩形占位：原尺寸 + 两侧外扩 + 右/下间距
+    margin = 2 * extrude + padding
+    (aw, ah), positions = pack([(im.width + margin, im.height + margin) for im in images])
+    atlas = new_canvas(aw, ah)
+    atlas_png = ATLAS_DIR / f"{group}.png"
+    ATLAS_DIR.mkdir(parents=True, exist_ok=True)
+    regions = {}
+    margin_map = {}
+    for rel, im, margin, (px, py) in zip(rels, images, margins, positions):
+        x, y = px + extrude, py + extrude
+        _extrude(atlas, im, x, y, extrude)
+        region = (x, y, im.width, im.height)
+        regions[res_path(ASSETS / rel)] = list(region)
+        if margin:
+            margin_map[res_path(ASSETS / rel)] = list(margin)
+    # 旧版本为每张小图写出的 AtlasTexture（.tres）已由 VisualAssetRegistry 按区域表构建取代，删除以免指向失效区域
+    out_dir = ATLAS_DIR / group
+    stale = sorted(out_dir.glob("*.tres")) if out_dir.is_dir() else []
+    for tres in stale:
+        tres.unlink()
+    if out_dir.is_dir() and not any(out_dir.iterdir()):
+        out_dir.rmdir()
+    atlas.save(atlas_png)
+    index = {"atlas": res_path(atlas_png), "size": [aw, ah], "padding": padding, "extrude": extrude,
+             "regions": regions,
+             "sources": {res_path(ASSETS / rel): hashlib.sha256(raw).hexdigest() for rel, raw in zip(rels, raws)}}
+    if margin_map:
+        index["margins"] = margin_map
+    (ATLAS_DIR / f"{group}.json").write_text(json.dumps(index, indent=1) + "\n", encoding="utf-8")
+    used = sum(im.width * im.height for im in images)
+    return {"group": group, "sprites": len(images), "size": (aw, ah), "used": used, "efficiency": used / (aw * ah),
+            "pruned": len(stale)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="打包小图为 2 的幂图集并写出区域表")
+    parser.add_argument("--group", action="append", choices=sorted(ATLAS_GROUPS), help="仅打包指定分组（可重复）")
+    parser.add_argument("--padding", type=int, default=2, help="小图之间的间距（像素，默认 2）")
+    parser.add_argument("--extrude", type=int, default=1, help="边缘外扩像素数（默认 1）")
+    parser.add_argument("--trim", action="store_true", help="装箱前裁掉透明边，区域表以 margins 保持原尺寸")
+    opts = parser.parse_args(argv)
+    print(f"{'group':<10} {'sprites':>7} {'atlas':>11} {'used px':>9} {'efficiency':>10}")
+    for group in opts.group or sorted(ATLAS_GROUPS):
+        stats = build_atlas(group, ATLAS_GROUPS[group], opts.padding, opts.extrude, opts.trim)
+        if not stats["sprites"]:
+            print(f"{group:<10} {0:>7}  (无匹配文件，跳过)")
+            continue
+        aw, ah = stats["size"]
+        print(f"{group:<10} {stats['sprites']:>7} {f'{aw}x{ah}':>11} {stats['used']:>9} {stats['efficiency']:>9.1%}")
+        if stats["pruned"]:
+            print(f"{'':<10} 删除旧版 AtlasTexture（.tres）{stats['pruned']} 个")
+
+
+if __name__ == "__main__":
+    main()
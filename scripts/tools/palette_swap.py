@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""调色板替换：精灵按角色色（body / dark / outline / highlight 等）绘制一次并转为角色索引图，
+之后每个配色变体只替换调色板（查找表）再展开为 RGBA，像素数据不动，不再逐像素重绘。
+export_pixel_assets.py 的玩家配色方案与敌人档位（精英 / 染色）均由此生成。
+
+批量导出敌人档位变体（默认全部档位，输出到 assets/enemies/tiers/）:
+    python scripts/tools/palette_swap.py [--tier elite] [--out DIR]
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+class IndexedSprite(NamedTuple):
+    """角色索引图：image 为 P 模式，索引 0 为全透明，i 对应 roles[i - 1]；colors 为绘制时的基础配色。"""
+    image: Image.Image
+    roles: tuple
+    colors: tuple
+
+
+def color_mask(img: Image.Image, color: tuple) -> Image.Image:
+    """RGBA 精确等于 color 的像素为 255，其余为 0。"""
+    from PIL import ImageChops
+
+    mask = None
+    for band, value in zip(img.split(), color):
+        m = band.point([255 if v == value else 0 for v in range(256)])
+        mask = m if mask is None else ImageChops.multiply(mask, m)
+    return mask
+
+
+def index_by_roles(img: Image.Image, palette: dict) -> IndexedSprite:
+    """将按 palette（角色名 → RGBA）绘制的图转为角色索引图。
+
+    非透明像素必须都是 palette 中的颜色，且各角色颜色互不相同，否则 ValueError；全透明像素归入索引 0。
+    """
+    from PIL import Image
+
+    roles = tuple(palette)
+    colors = tuple(tuple(palette[role]) for role in roles)
+    if len(set(colors)) != len(colors):
+        raise ValueError(f"角色颜色重复，无法区分: {dict(zip(roles, colors))}")
+    if len(roles) > 255:
+        raise ValueError(f"角色数 {len(roles)} 超过 255")
+    rgba = img.convert("RGBA")
+    used = {color for _, color in rgba.getcolors(rgba.width * rgba.height) if color[3]}
+    unknown = used - set(colors)
+    if unknown:
+        raise ValueError(f"图中含有调色板外的颜色: {sorted(unknown)[:4]}")
+    index = Image.new("L", rgba.size, 0)
+    for i, color in enumerate(colors, 1):
+        index.paste(i, (0, 0, rgba.width, rgba.height), color_mask(rgba, color))
+    return IndexedSprite(Image.frombytes("P", rgba.size, index.tobytes()), roles, colors)
+
+
+def recolor(sprite: IndexedSprite, palette: dict) -> Image.Image:
+    """按角色换色并展开为 RGBA；palette 中未给出的角色保持基础配色。全透明像素展开为 (0, 0, 0, 0)。"""
+    lut = [0, 0, 0, 0]
+    for role, base in zip(sprite.roles, sprite.colors):
+        lut.extend(palette.get(role, base))
+    img = sprite.image.copy()
+    img.putpalette(bytes(lut), "RGBA")
+    return img.convert("RGBA")
+
+
+def mix(color: tuple, target: tuple, amount: float) -> tuple:
+    """RGB 向 target 线性插值 amount（0..1），alpha 保持不变。"""
+    return tuple(round(c + (t - c) * amount) for c, t in zip(color[:3], target[:3])) + tuple(color[3:])
+
+
+def shade(color: tuple, factor: float) -> tuple:
+    """RGB 各通道乘 factor（>1 提亮、<1 压暗），截断到 0..255，alpha 保持不变。"""
+    return tuple(min(255, max(0, round(c * factor))) for c in color[:3]) + tuple(color[3:])
+
+
+def tint_palette(palette: dict, target: tuple, amount: float, keep: tuple = ()) -> dict:
+    """整套配色向 target 插值；keep 中的角色（如描边）保持原色，便于辨认轮廓。"""
+    return {role: color if role in keep else mix(color, target, amount) for role, color in palette.items()}
+
+
+def main(argv=None) -> None:
+    import argparse
+    import time
+    from pathlib import Path
+
+    import export_pixel_assets as pixel_assets
+    from asset_manifest import refresh_asset_index
+
+    parser = argparse.ArgumentParser(description="按调色板批量生成敌人档位变体（单帧 + 精灵图）")
+    parser.add_argument("--tier", action="append", choices=sorted(pixel_assets.ENEMY_TIERS),
+                        help="仅生成指定档位（可重复，默认全部）")
+    parser.add_argument("--out", type=Path, default=pixel_assets.ASSETS / "enemies" / "tiers",
+                        help="输出目录（默认 assets/enemies/tiers）")
+    opts = parser.parse_args(argv)
+    tiers = opts.tier or sorted(pixel_assets.ENEMY_TIERS)
+    opts.out.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    count = 0
+    written = {}
+    for etype, name in enumerate(pixel_assets.ENEMY_NAMES):
+        for tier in tiers:
+            outputs = {
+                f"{name}_{tier}.png": pixel_assets.enemy_tier_sprite(etype, tier),
+                f"{name}_{tier}_sheet.png": pixel_assets.enemy_tier_sheet(etype, tier),
+            }
+            for filename, img in outputs.items():
+                data = pixel_assets.encode_png(img)
+                path = opts.out / filename
+                if not (path.is_file() and path.read_bytes() == data):
+                    path.write_bytes(data)
+                    written[path] = data
+                count += 1
+    # 重写过的精灵图在资源索引中的 trim / compact 帧表已过期（同 export_pixel_assets.py）
+    assets = pixel_assets.ASSETS
+    refresh_asset_index(assets, {p.resolve().relative_to(assets).as_posix(): d for p, d in written.items()
+                                 if p.resolve().is_relative_to(assets)})
+    print(f"{len(pixel_assets.ENEMY_NAMES)} 种敌人 × {len(tiers)} 个档位：{count} 张 -> {opts.out}"
+          f"（{time.perf_counter() - t0:.2f}s）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""像素绘制原语：按整块区域/整行跨度光栅化（Image.paste），替代逐像素 putpixel 循环。
+坐标约定与 range() 一致：矩形为左闭右开 [x0, x1) × [y0, y1)。
+Pillow 在首次创建画布时才导入，仅导入本模块不会加载 Pillow。"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+TRANSPARENT = (0, 0, 0, 0)
+
+
+def new_canvas(w: int, h: int) -> Image.Image:
+    """新建全透明 RGBA 画布。"""
+    from PIL import Image
+
+    return Image.new("RGBA", (w, h), TRANSPARENT)
+
+
+def fill_rect(img: Image.Image, x0: int, y0: int, x1: int, y1: int, color: tuple) -> None:
+    """填充矩形 [x0, x1) × [y0, y1)，直接覆盖原像素（含 alpha），空矩形忽略。"""
+    if x1 > x0 and y1 > y0:
+        img.paste(color, (x0, y0, x1, y1))
+
+
+def hline(img: Image.Image, x0: int, x1: int, y: int, color: tuple) -> None:
+    """水平线：y 行的 [x0, x1)。"""
+    fill_rect(img, x0, y, x1, y + 1, color)
+
+
+def vline(img: Image.Image, x: int, y0: int, y1: int, color: tuple) -> None:
+    """垂直线：x 列的 [y0, y1)。"""
+    fill_rect(img, x, y0, x + 1, y1, color)
+
+
+def outline_rect(img: Image.Image, x0: int, y0: int, x1: int, y1: int, color: tuple) -> None:
+    """矩形 [x0, x1) × [y0, y1) 的 1 像素边框。"""
+    hline(img, x0, x1, y0, color)
+    hline(img, x0, x1, y1 - 1, color)
+    vline(img, x0, y0, y1, color)
+    vline(img, x1 - 1, y0, y1, color)
+
+
+def _clip_box(img: Image.Image, clip: tuple | None) -> tuple:
+    """裁剪框与画布求交，clip 为 (x0, y0, x1, y1) 或 None（整张画布）。"""
+    x0, y0, x1, y1 = clip if clip is not None else (0, 0, img.width, img.height)
+    return max(x0, 0), max(y0, 0), min(x1, img.width), min(y1, img.height)
+
+
+def diamond(img: Image.Image, cx: float, cy: float, r: float, color: tuple, clip: tuple | None = None) -> None:
+    """曼哈顿菱形：填充满足 |x-cx| + |y-cy| <= r 的像素，每行一次跨度填充。"""
+    x0, y0, x1, y1 = _clip_box(img, clip)
+    for y in range(y0, y1):
+        rem = r - abs(y - cy)
+        if rem < 0:
+            continue
+        fill_rect(img, max(math.ceil(cx - rem), x0), y, min(math.floor(cx + rem) + 1, x1), y + 1, color)
+
+
+def disc(img: Image.Image, cx: float, cy: float, r2: float, color: tuple, clip: tuple | None = None) -> None:
+    """圆盘：填充满足 (x-cx)² + (y-cy)² <= r2 的像素，每行一次跨度填充。"""
+    x0, y0, x1, y1 = _clip_box(img, clip)
+    for y in range(y0, y1):
+        dy2 = (y - cy) ** 2
+        if dy2 > r2:
+            continue
+        half = math.sqrt(r2 - dy2)
+        lo, hi = math.ceil(cx - half), math.floor(cx + half)
+        # sqrt 存在舍入误差：用原始不等式把跨度两端各校正一步，保证与逐像素判定完全一致
+        if (lo - 1 - cx) ** 2 + dy2 <= r2:
+            lo -= 1
+        elif (lo - cx) ** 2 + dy2 > r2:
+            lo += 1
+        if (hi + 1 - cx) ** 2 + dy2 <= r2:
+            hi += 1
+        elif (hi - cx) ** 2 + dy2 > r2:
+            hi -= 1
+        fill_rect(img, max(lo, x0), y, min(hi + 1, x1), y + 1, color)
+
+
+def fill_where(img: Image.Image, inside, color: tuple, clip: tuple | None = None) -> None:
+    """填充裁剪框内满足 inside(x, y) 的像素：逐行找出连续跨度后整段填充（凸形状每行一次）。
+    用于菱形/圆盘之外、只给出判定式的形状（如六边形、椭圆），判定式与逐像素版本完全相同。"""
+    x0, y0, x1, y1 = _clip_box(img, clip)
+    for y in range(y0, y1):
+        x = x0
+        while x < x1:
+            if not inside(x, y):
+                x += 1
+                continue
+            start = x
+            while x < x1 and inside(x, y):
+                x += 1
+            fill_rect(img, start, y, x, y + 1, color)
+
+
+def blit_mask(img: Image.Image, mask: Image.Image, color: tuple, offset: tuple = (0, 0)) -> None:
+    """按遮罩把纯色贴到 offset 处：遮罩非零处覆盖为 color（"1"/"L" 遮罩均可）。"""
+    if mask.mode != "L":
+        mask = mask.convert("L")
+    # 二值化，避免 L 遮罩的中间值产生混合色
+    mask = mask.point([0] + [255] * 255)
+    img.paste(color, (offset[0], offset[1], offset[0] + mask.width, offset[1] + mask.height), mask)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""精灵图组装：由少量关键帧 + 每格变换（平移、水平镜像、90° 旋转、调色板替换）拼出整张精灵图。
+所有格子按区域 paste 到一块预分配画布，相同 (帧, 变换) 只计算一次。
+compact_sheet / expand_sheet 在网格精灵图与「唯一帧横条 + 帧表」之间互转（asset_pipeline.py 的 compact 阶段）。"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from palette_swap import color_mask
+from raster import new_canvas
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# 8 方向列顺序与 3 行动画状态，与 player.gd / enemy_base.gd 按 region_rect 取帧的布局一致
+DIRECTIONS = ["E", "SE", "S", "SW", "W", "NW", "N", "NE"]
+STATES = ["stand", "walk1", "walk2"]
+
+
+class CellTransform(NamedTuple):
+    """单格变换，按 调色板 → 镜像 → 旋转 → 平移 的顺序应用。"""
+    dx: int = 0  # 水平平移（像素），移出格子的部分被裁掉
+    dy: int = 0  # 垂直平移（像素），正值向下
+    mirror: bool = False  # 水平镜像
+    rotate: int = 0  # 逆时针旋转 90° 的次数（0..3），要求帧为正方形
+    palette: tuple = ()  # ((源 RGBA, 目标 RGBA), ...) 精确颜色替换
+
+
+class SheetCell(NamedTuple):
+    """精灵图中的一格：引用的关键帧名 + 变换。"""
+    frame: str
+    transform: CellTransform = CellTransform()
+
+
+def _shift(img: Image.Image, dx: int, dy: int) -> Image.Image:
+    """整体平移并裁剪到原尺寸，空出部分为全透明。"""
+    out = new_canvas(img.width, img.height)
+    src = img.crop((max(-dx, 0), max(-dy, 0), img.width - max(dx, 0), img.height - max(dy, 0)))
+    out.paste(src, (max(dx, 0), max(dy, 0)))
+    return out
+
+
+def apply_transform(frame: Image.Image, t: CellTransform) -> Image.Image:
+    """对关键帧应用单格变换，返回新图（不修改 frame）。"""
+    from PIL import Image
+
+    img = frame
+    if t.palette:
+        img = img.copy()
+        # 先基于原图算出全部遮罩再替换，保证 a→b、b→a 互换时不串色
+        masks = [(color_mask(frame, src), dst) for src, dst in t.palette]
+        for mask, dst in masks:
+            img.paste(dst, (0, 0, img.width, img.height), mask)
+    if t.mirror:
+        img = img.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+    if t.rotate % 4:
+        img = img.transpose((None, Image.Transpose.ROTATE_90, Image.Transpose.ROTATE_180,
+                             Image.Transpose.ROTATE_270)[t.rotate % 4])
+    if t.dx or t.dy:
+        img = _shift(img, t.dx, t.dy)
+    return img
+
+
+def build_sheet(frames: dict, cells: list, cell_w: int, cell_h: int) -> Image.Image:
+    """按 cells（行列表，每行为 SheetCell 列表）组装精灵图。
+
+    frames：关键帧名 → 尺寸为 cell_w x cell_h 的 RGBA 图。
+    每格直接覆盖（含 alpha）对应区域，与逐像素拷贝结果一致。
+    """
+    cols = max(len(row) for row in cells)
+    sheet = new_canvas(cols * cell_w, len(cells) * cell_h)
+    cache = {}
+    for r, row in enumerate(cells):
+        for c, cell in enumerate(row):
+            img = cache.get(cell)
+            if img is None:
+                img = cache[cell] = apply_transform(frames[cell.frame], cell.transform)
+            sheet.paste(img, (c * cell_w, r * cell_h))
+    return sheet
+
+
+def direction_rows(state_cells: list, columns: int = len(DIRECTIONS)) -> list:
+    """每个动画状态一行、各方向列共用同一格，得到 build_sheet 的 cells。"""
+    return [[cell] * columns for cell in state_cells]
+
+
+def compact_sheet(sheet: Image.Image, columns: int = len(DIRECTIONS), rows: int = len(STATES)) -> tuple | None:
+    """把 columns x rows 网格精灵图压缩为只含唯一帧的横条，返回 (横条图, 帧表)。
+
+    逐格按像素内容去重，唯一帧按首次出现顺序（逐行从左到右）排成一行；帧表 frames[行][列] 为该格在横条中的帧序号。
+    尺寸不能整除网格或格子非正方形（如已压缩过的横条）时返回 None。
+    """
+    w, h = sheet.size
+    if w % columns or h % rows or w // columns != h // rows:
+        return None
+    cell = w // columns
+    rgba = sheet.convert("RGBA")
+    unique = {}  # 格子像素字节 -> 帧序号
+    tiles = []
+    frames = []
+    for r in range(rows):
+        row = []
+        for c in range(columns):
+            tile = rgba.crop((c * cell, r * cell, (c + 1) * cell, (r + 1) * cell))
+            key = tile.tobytes()
+            if key not in unique:
+                unique[key] = len(tiles)
+                tiles.append(tile)
+            row.append(unique[key])
+        frames.append(row)
+    strip = new_canvas(len(tiles) * cell, cell)
+    for i, tile in enumerate(tiles):
+        strip.paste(tile, (i * cell, 0))
+    return strip, frames
+
+
+def expand_sheet(strip: Image.Image, frames: list, cell_w: int, cell_h: int) -> Image.Image:
+    """compact_sheet 的逆过程：按帧表把横条中的帧摆回网格。"""
+    rgba = strip.convert("RGBA")
+    tiles = [rgba.crop((i * cell_w, 0, (i + 1) * cell_w, cell_h)) for i in range(rgba.width // cell_w)]
+    sheet = new_canvas(max(len(row) for row in frames) * cell_w, len(frames) * cell_h)
+    for r, row in enumerate(frames):
+        for c, index in enumerate(row):
+            sheet.paste(tiles[index], (c * cell_w, r * cell_h))
+    return sheet
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""程序化地形瓦片：按种子生成可平铺的分形值噪声，整图着色后得到
+- 每种地板（flat / seaside / mountain）N 个噪声变体，铺大地图时按格随机选取，避免明显重复；
+- 草地、浅水、深水各一套 47 块 blob 自动拼接瓦片（8 邻域掩码），作为叠加层画在地板之上。
+全部打包到网格图集 assets/terrain/biome_atlas.png，并写出区域索引 biome_atlas.json 供 game.gd 使用。
+叠加瓦片含半透明像素，图集列在 asset_select.SKIP_GLOBS 中，process / make_opaque.py 不会将其不透明化。
+噪声、着色、边缘均为 Pillow 整图运算（resize / point / ImageChops / 形态学滤波），不逐像素 putpixel。
+
+运行: python scripts/tools/terrain_gen.py [--variants 4] [--seed 2026] [--columns 16] [--out-dir assets/terrain]
+索引格式见 ART_ASSET_REPLACEMENT_GUIDE.md「程序化地形」。
+"""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+TILE = 32
+
+# blob 掩码位：N=1, NE=2, E=4, SE=8, S=16, SW=32, W=64, NW=128（与 game.gd 自动拼接一致）
+N, NE, E, SE, S, SW, W, NW = 1, 2, 4, 8, 16, 32, 64, 128
+# 对角位只在相邻两条边都连通时才有意义：(对角位, 边 1, 边 2)
+CORNERS = ((NE, N, E), (SE, S, E), (SW, S, W), (NW, N, W))
+
+
+class FloorStyle(NamedTuple):
+    """地板变体风格：两个基础色之间随机取色，噪声明暗幅度与档数，亮/暗斑点颜色偏移与密度。"""
+    color_a: str  # TERRAIN_TILE_COLORS 键
+    color_b: str
+    amplitude: int = 10
+    levels: int = 4
+    speckle_light: int = 14
+    speckle_dark: int = -16
+    density: float = 0.03
+
+
+class BlobStyle(NamedTuple):
+    """blob 叠加层风格：填充色取 TERRAIN_TILE_COLORS，rim 为边缘 2 像素的颜色偏移与不透明度增量。"""
+    color: str
+    amplitude: int = 12
+    rim_shift: int = 40
+    rim_alpha: int = 60
+    inset: int = 8  # 未连通一侧的内缩像素
+
+
+FLOOR_STYLES = {
+    "flat": FloorStyle("floor_a", "floor_b"),
+    "seaside": FloorStyle("floor_seaside_a", "floor_seaside_b", amplitude=8, speckle_light=22, density=0.05),
+    "mountain": FloorStyle("floor_mountain_a", "floor_mountain_b", amplitude=14, levels=5, speckle_dark=-24),
+}
+
+BLOB_STYLES = {
+    "grass": BlobStyle("grass", rim_shift=-30),
+    "shallow_water": BlobStyle("shallow_water", amplitude=10),
+    "deep_water": BlobStyle("deep_water", amplitude=8, rim_shift=30),
+}
+
+
+def canonical_mask(mask: int) -> int:
+    """去掉相邻两边未同时连通的对角位；256 种 8 邻域组合因此归并为 47 种。"""
+    for corner, a, b in CORNERS:
+        if mask & corner and not (mask & a and mask & b):
+            mask &= ~corner
+    return mask
+
+
+BLOB_MASKS = sorted({canonical_mask(m) for m in range(256)})
+
+
+def value_noise(size: int, cells: int, rng: random.Random, octaves: int = 3, persistence: float = 0.5) -> Image.Image:
+    """可平铺的分形值噪声（L 模式，已拉伸到 0..255）。
+
+    每个八度为 n×n 随机格点（n = cells·2^k），3×3 平铺后双三次放大再取中间一块，左右、上下边缘因此连续；
+    各八度按振幅 persistence^k 逐层 blend。
+    """
+    from PIL import Image, ImageOps
+
+    acc, weight, amp = None, 0.0, 1.0
+    for k in range(octaves):
+        n = cells * 2 ** k
+        if n > size:
+            break
+        grid = Image.frombytes("L", (n, n), rng.randbytes(n * n))
+        tiled = Image.new("L", (3 * n, 3 * n))
+        for i in range(3):
+            for j in range(3):
+                tiled.paste(grid, (i * n, j * n))
+        layer = tiled.resize((3 * size, 3 * size), Image.Resampling.BICUBIC).crop((size, size, 2 * size, 2 * size))
+        acc = layer if acc is None else Image.blend(acc, layer, amp / (weight + amp))
+        weight += amp
+        amp *= persistence
+    return ImageOps.autocontrast(acc)
+
+
+def _clamp(v: int) -> int:
+    return 0 if v < 0 else 255 if v > 255 else v
+
+
+def colorize(noise: Image.Image, color: tuple, amplitude: int, levels: int = 4) -> Image.Image:
+    """噪声映射为同色系明暗：量化到 levels 档、偏移 ±amplitude，逐通道查找表，alpha 取 color[3]。"""
+    from PIL import Image
+
+    steps = [round(v * (levels - 1) / 255) for v in range(256)]
+    offsets = [round((s / (levels - 1) * 2 - 1) * amplitude) for s in steps]
+    bands = [noise.point([_clamp(c + off) for off in offsets]) for c in color[:3]]
+    return Image.merge("RGBA", bands + [Image.new("L", noise.size, color[3])])
+
+
+def _shift_color(color: tuple, delta: int, alpha_delta: int = 0) -> tuple:
+    return tuple(_clamp(c + delta) for c in color[:3]) + (_clamp(color[3] + alpha_delta),)
+
+
+def _speckles(size: int, rng: random.Random, density: float) -> Image.Image:
+    """白噪声阈值化得到的稀疏斑点遮罩（L，255 为斑点）。"""
+    from PIL import Image
+
+    cut = round(255 * (1 - density))
+    return Image.frombytes("L", (size, size), rng.randbytes(size * size)).point(lambda v: 255 if v > cut else 0)
+
+
+def floor_variant(style: FloorStyle, colors: dict, rng: random.Random) -> Image.Image:
+    """一个地板变体：两个基础色之间随机取色，叠低频明暗与亮/暗斑点。"""
+    from palette_swap import mix
+
+    base = mix(colors[style.color_a], colors[style.color_b], rng.random())
+    img = colorize(value_noise(TILE, 4, rng), base, style.amplitude, style.levels)
+    img.paste(_shift_color(base, style.speckle_light), (0, 0, TILE, TILE), _speckles(TILE, rng, style.density / 2))
+    img.paste(_shift_color(base, style.speckle_dark), (0, 0, TILE, TILE), _speckles(TILE, rng, style.density / 2))
+    return img
+
+
+def blob_shape(mask: int, inset: int) -> Image.Image:
+    """blob 瓦片的覆盖区域（L，255 为地形）。按四个象限拼：两边都连通时填满（缺对角则在角上挖内凹四分之一圆），
+    只连通一边时从另一边内缩 inset，两边都不连通时为带圆角的外角。"""
+    from PIL import Image, ImageDraw
+
+    half = TILE // 2
+    shape = Image.new("L", (TILE, TILE), 0)
+    draw = ImageDraw.Draw(shape)
+    # 象限：(x0, y0, 竖向边位, 横向边位, 对角位, 角点坐标)
+    quads = ((0, 0, N, W, NW, (0, 0)), (half, 0, N, E, NE, (TILE, 0)),
+             (0, half, S, W, SW, (0, TILE)), (half, half, S, E, SE, (TILE, TILE)))
+    for x0, y0, vbit, hbit, cbit, (cx, cy) in quads:
+        x1, y1 = x0 + half, y0 + half
+        box = [x0, y0, x1 - 1, y1 - 1]
+        # 未连通一侧内缩：横向（W/E）不连通则收 x，竖向（N/S）不连通则收 y
+        if not mask & hbit:
+            box[0 if cx == 0 else 2] = (inset if cx == 0 else TILE - inset - 1)
+        if not mask & vbit:
+            box[1 if cy == 0 else 3] = (inset if cy == 0 else TILE - inset - 1)
+        draw.rectangle(box, fill=255)
+        if mask & vbit and mask & hbit and not mask & cbit:
+            # 内凹角：以瓦片角点为圆心挖去半径 inset 的四分之一圆
+            draw.ellipse([cx - inset, cy - inset, cx + inset - 1, cy + inset - 1], fill=0)
+        elif not mask & vbit and not mask & hbit:
+            # 外角：矩形外角上 r×r 的直角换成四分之一圆
+            r = inset // 2
+            sx, sy = (1 if cx == 0 else -1), (1 if cy == 0 else -1)
+            ix, iy = box[0 if cx == 0 else 2], box[1 if cy == 0 else 3]
+            draw.rectangle([min(ix, ix + sx * (r - 1)), min(iy, iy + sy * (r - 1)),
+                            max(ix, ix + sx * (r - 1)), max(iy, iy + sy * (r - 1))], fill=0)
+            ox, oy = ix + sx * r, iy + sy * r
+            draw.ellipse([ox - r, oy - r, ox + r, oy + r], fill=255)
+    return shape
+
+
+def blob_tiles(style: BlobStyle, colors: dict, rng: random.Random) -> dict:
+    """一套 47 块 blob 瓦片：canonical 掩码 → RGBA。所有瓦片共用同一张可平铺纹理，相邻瓦片纹理连续；
+    形状边缘 2 像素为 rim（水岸泡沫 / 草丛深边）。"""
+    from PIL import Image, ImageChops, ImageFilter
+
+    color = colors[style.color]
+    fill = colorize(value_noise(TILE, 4, rng), color, style.amplitude)
+    rim_color = _shift_color(color, style.rim_shift, style.rim_alpha)
+    tiles = {}
+    for mask in BLOB_MASKS:
+        shape = blob_shape(mask, style.inset)
+        # 5×5 腐蚀：形状内距边界 2 像素内为 rim；滤波在瓦片外沿按边缘像素延拓，连通的边不会出现 rim
+        rim = ImageChops.subtract(shape, shape.filter(ImageFilter.MinFilter(5)))
+        tile = Image.new("RGBA", (TILE, TILE), (0, 0, 0, 0))
+        tile.paste(fill, (0, 0), shape)
+        tile.paste(rim_color, (0, 0, TILE, TILE), rim)
+        tiles[mask] = tile
+    return tiles
+
+
+def build_biome(variants: int = 4, seed: int = 2026, columns: int = 16) -> tuple:
+    """生成全部地板变体与 blob 瓦片并按网格打包，返回 (图集, 索引)。
+
+    每组从新的一行开始（组内超过 columns 块时换行）；各组用 "种子:组名" 派生独立随机源，
+    增减某组变体数不影响其他组的结果。索引中的坐标以瓦片为单位（像素区域 = 坐标 × tile_size）。
+    """
+    from export_pixel_assets import TERRAIN_TILE_COLORS
+    from raster import new_canvas
+
+    groups = []
+    for name, style in FLOOR_STYLES.items():
+        rng = random.Random(f"{seed}:floor:{name}")
+        groups.append(("floors", name, [(i, floor_variant(style, TERRAIN_TILE_COLORS, rng)) for i in range(variants)]))
+    for name, style in BLOB_STYLES.items():
+        rng = random.Random(f"{seed}:blob:{name}")
+        groups.append(("blob", name, list(blob_tiles(style, TERRAIN_TILE_COLORS, rng).items())))
+    rows = sum(-(-len(tiles) // columns) for _, _, tiles in groups)
+    atlas = new_canvas(columns * TILE, rows * TILE)
+    index = {"tile_size": TILE, "columns": columns, "seed": seed, "floors": {}, "blob": {}}
+    row = 0
+    for kind, name, tiles in groups:
+        coords = [] if kind == "floors" else {}
+        for i, (key, tile) in enumerate(tiles):
+            x, y = i % columns, row + i // columns
+            atlas.paste(tile, (x * TILE, y * TILE))
+            if kind == "floors":
+                coords.append([x, y])
+            else:
+                coords[str(key)] = [x, y]
+        index[kind][name] = coords
+        row += -(-len(tiles) // columns)
+    return atlas, index
+
+
+def main(argv=None) -> None:
+    import argparse
+    import json
+    import time
+    from pathlib import Path
+
+    from asset_encode import encode_png
+
+    project_root = Path(__file__).resolve().parent.parent.parent
+    parser = argparse.ArgumentParser(description="生成地板噪声变体与 blob 自动拼接瓦片图集")
+    parser.add_argument("--variants", type=int, default=4, help="每种地板的变体数（默认 4）")
+    parser.add_argument("--seed", type=int, default=2026, help="随机种子（默认 2026）")
+    parser.add_argument("--columns", type=int, default=16, help="图集每行瓦片数（默认 16）")
+    parser.add_argument("--out-dir", type=Path, default=project_root / "assets" / "terrain",
+                        help="输出目录（默认 assets/terrain）")
+    opts = parser.parse_args(argv)
+    t0 = time.perf_counter()
+    atlas, index = build_biome(opts.variants, opts.seed, opts.columns)
+    out_png = opts.out_dir / "biome_atlas.png"
+    out_dir = opts.out_dir.resolve()
+    index["atlas"] = ("res://" + (out_dir / out_png.name).relative_to(project_root).as_posix()
+                      if out_dir.is_relative_to(project_root) else out_png.name)
+    opts.out_dir.mkdir(parents=True, exist_ok=True)
+    data = encode_png(atlas)
+    if not (out_png.is_file() and out_png.read_bytes() == data):
+        out_png.write_bytes(data)
+    (opts.out_dir / "biome_atlas.json").write_text(json.dumps(index, indent=1) + "\n", encoding="utf-8")
+    tiles = sum(len(v) for group in ("floors", "blob") for v in index[group].values())
+    print(f"{tiles} 块瓦片（地板 {len(FLOOR_STYLES)}×{opts.variants}，blob {len(BLOB_STYLES)}×{len(BLOB_MASKS)}）"
+          f" -> {out_png}（{atlas.width}x{atlas.height}，{time.perf_counter() - t0:.2f}s）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""UI 预烘焙：把主题用到的九宫格面板框与纯色占位图一次画进一张图集，并写出按键名查找的区域索引。
+VisualAssetRegistry 读到索引后直接取图集区域，打开界面时不再在主线程逐像素画边框、逐个新建 Image。
+
+颜色取自 resources/ui_theme.tres（未写出的属性取 ui_theme_config.gd 中的默认值），另含 HUD 与占位图中写死的颜色。
+8 位通道值与 GDScript 一致：float32 通道 × 255 后截断（同 make_color_texture 的键与 Image.fill 的结果）。
+
+键名：
+    纯色占位图  "r,g,b,a:WxH"                  与 make_color_texture 的缓存键相同
+    面板框      "背景 r,g,b,a/边框 r,g,b,a/边框宽:WxH"  尺寸、边框宽按 make_panel_frame_texture 的规则（边长至少 32）归一化
+
+输出：
+    assets/ui_baked/ui_baked.png   图集（各区域四周外扩 1 像素边缘色，拉伸过滤时不会采样到相邻区域）
+    assets/ui_baked/ui_baked.json  {version, atlas, size, swatches: {键: [x, y, w, h]}, panels: {键: [x, y, w, h]}}
+
+运行:
+    python scripts/tools/ui_bake.py            # 重新烘焙（内容未变时不重写）
+    python scripts/tools/ui_bake.py --check    # 图集按运行时逐像素语义比对，与当前主题不一致时退出码 1
+主题颜色或下方列表变化后重新运行；asset_pipeline.py process 与 make_opaque.py 都按
+asset_select.SKIP_GLOBS 跳过 assets/ui_baked/，不会改动图集。
+"""
+
+from __future__ import annotations
+
+import re
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+THEME_TRES = PROJECT_ROOT / "resources" / "ui_theme.tres"
+THEME_SCRIPT = PROJECT_ROOT / "resources" / "ui_theme_config.gd"
+UI_BAKED_DIR = "assets/ui_baked"
+ATLAS_REL = f"{UI_BAKED_DIR}/ui_baked.png"
+INDEX_REL = f"{UI_BAKED_DIR}/ui_baked.json"
+INDEX_VERSION = 1
+EXTRUDE = 1
+
+# 面板框：(边长, 背景, 边框, 边框宽)；颜色为主题属性名或 0..1 浮点 RGBA，与各调用处的参数一致
+THEME_PANELS = [
+    (64, "modal_panel_bg", "modal_panel_bg", 2),  # UiThemeConfig.get_modal_panel_stylebox
+    (64, "content_panel_bg", "content_panel_bg", 2),  # get_panel_stylebox_borderless（背包 ContentPanel）
+    (64, "detail_panel_bg", "detail_panel_bg", 2),  # get_panel_stylebox_borderless（背包 DetailPanel）
+    (64, "content_panel_bg", "modal_panel_border", 2),  # get_panel_stylebox_for_bg
+    (64, "detail_panel_bg", "modal_panel_border", 2),
+    (48, (0.08, 0.09, 0.12, 0.85), (0.25, 0.26, 0.30, 0.9), 2),  # hud.gd _make_hud_panel_style
+]
+
+# 纯色占位图：(颜色, 边长)；运行时按参数动态取色的调用（如 color_hint）不在此列，仍按需生成
+THEME_SWATCHES = [
+    ("placeholder", 48),  # BackpackSlot 缺图占位（SLOT_SIZE）
+    ("placeholder", 56),  # 图鉴缺图占位（ENTRY_ICON_SIZE）
+    ((0.5, 0.5, 0.55, 1.0), 32),  # HUD 魔法槽缺图
+    ((0.68, 0.68, 0.74, 1.0), 96),  # HUD 升级选项缺图
+    ((0.8, 0.8, 0.8, 1.0), 96),  # HUD 商店选项默认色
+    ((0.7, 0.7, 0.7, 1.0), 4),  # enemy_base 未知元素图标
+    ((0.8, 0.3, 0.2, 1.0), 4),  # enemy_base 元素图标缺图
+]
+
+# 不属于 UiThemeConfig 但被占位图引用的命名颜色
+EXTRA_COLORS = {"placeholder": (0.5, 0.55, 0.6, 1.0)}  # BackpackSlot.PLACEHOLDER_COLOR
+
+_SCRIPT_COLOR = re.compile(r"^@export var (\w+): Color = Color\(([^)]*)\)", re.M)
+_TRES_COLOR = re.compile(r"^(\w+) = Color\(([^)]*)\)", re.M)
+
+
+class BakedRegion(NamedTuple):
+    """图集中的一个区域：键名、尺寸与绘制参数（面板的 border 为 None 时即纯色占位图）。"""
+    key: str
+    width: int
+    height: int
+    fill: tuple
+    border: tuple | None = None
+    border_width: int = 0
+
+
+def _parse_colors(pattern: re.Pattern, text: str) -> dict:
+    colors = {}
+    for name, args in pattern.findall(text):
+        values = [float(v) for v in args.split(",")]
+        colors[name] = tuple(values) + (1.0,) * (4 - len(values))
+    return colors
+
+
+def theme_colors() -> dict:
+    """主题颜色：ui_theme_config.gd 的默认值，被 ui_theme.tres 中写出的属性覆盖。"""
+    colors = dict(EXTRA_COLORS)
+    colors.update(_parse_colors(_SCRIPT_COLOR, THEME_SCRIPT.read_text(encoding="utf-8")))
+    if THEME_TRES.is_file():
+        colors.update(_parse_colors(_TRES_COLOR, THEME_TRES.read_text(encoding="utf-8")))
+    return colors
+
+
+def color8(color: tuple) -> tuple:
+    """0..1 浮点 RGBA → 8 位：先按 float32 存储再 × 255 截断，与 GDScript int(color.r * 255) 及 Image.fill 一致。"""
+    return tuple(min(max(int(struct.unpack("f", struct.pack("f", c))[0] * 255), 0), 255) for c in color)
+
+
+def color_key(rgba: tuple) -> str:
+    return ",".join(str(c) for c in rgba)
+
+
+def swatch_key(rgba: tuple, width: int, height: int) -> str:
+    return f"{color_key(rgba)}:{width}x{height}"
+
+
+def panel_key(bg: tuple, border: tuple, border_width: int, width: int, height: int) -> str:
+    return f"{color_key(bg)}/{color_key(border)}/{border_width}:{width}x{height}"
+
+
+def baked_regions(colors: dict | None = None) -> tuple:
+    """按列表与主题颜色展开为 (面板区域列表, 占位图区域列表)，同键去重、顺序确定。"""
+    colors = theme_colors() if colors is None else colors
+
+    def resolve(c):
+        return color8(colors[c] if isinstance(c, str) else c)
+
+    panels = {}
+    for edge, bg, border, border_width in THEME_PANELS:
+        # 与 make_panel_frame_texture 相同的归一化：边长至少 32，边框宽不超过短边一半
+        w = h = max(32, edge)
+        bw = min(border_width, min(w, h) // 2)
+        bg8, border8 = resolve(bg), resolve(border)
+        key = panel_key(bg8, border8, bw, w, h)
+        panels.setdefault(key, BakedRegion(key, w, h, bg8, border8, bw))
+    swatches = {}
+    for color, edge in THEME_SWATCHES:
+        rgba = resolve(color)
+        key = swatch_key(rgba, edge, edge)
+        swatches.setdefault(key, BakedRegion(key, edge, edge, rgba))
+    return list(panels.values()), list(swatches.values())
+
+
+def paint_region(atlas: Image.Image, region: BakedRegion, x: int, y: int, extrude: int = EXTRUDE) -> None:
+    """在 (x, y) 画一个区域：整块区域（连同外扩边）先填边缘色，面板再填内部背景。两次整块填充，不逐像素。"""
+    edge = region.border if region.border is not None and region.border_width > 0 else region.fill
+    atlas.paste(edge, (x - extrude, y - extrude, x + region.width + extrude, y + region.height + extrude))
+    bw = region.border_width if region.border is not None else 0
+    if bw and region.width > 2 * bw and region.height > 2 * bw:
+        atlas.paste(region.fill, (x + bw, y + bw, x + region.width - bw, y + region.height - bw))
+
+
+def reference_region(region: BakedRegion) -> Image.Image:
+    """按 make_panel_frame_texture / make_color_texture 的运行时语义逐像素绘制（仅供 --check 比对）。"""
+    from raster import new_canvas
+
+    img = new_canvas(region.width, region.height)
+    bw = region.border_width if region.border is not None else 0
+    for y in range(region.height):
+        for x in range(region.width):
+            on_border = x < bw or x >= region.width - bw or y < bw or y >= region.height - bw
+            img.putpixel((x, y), region.border if on_border else region.fill)
+    return img
+
+
+def bake(colors: dict | None = None) -> tuple:
+    """烘焙图集，返回 (图集, 索引)。各区域按外扩后的尺寸装箱到最小的 2 的幂图集。"""
+    from pack_atlas import pack
+    from raster import new_canvas
+
+    panels, swatches = baked_regions(colors)
+    regions = panels + swatches
+    (aw, ah), positions = pack([(r.width + 2 * EXTRUDE, r.height + 2 * EXTRUDE) for r in regions])
+    atlas = new_canvas(aw, ah)
+    rects = {}
+    for region, (px, py) in zip(regions, positions):
+        x, y = px + EXTRUDE, py + EXTRUDE
+        paint_region(atlas, region, x, y)
+        rects[region.key] = [x, y, region.width, region.height]
+    index = {
+        "version": INDEX_VERSION,
+        "atlas": f"res://{ATLAS_REL}",
+        "size": [aw, ah],
+        "extrude": EXTRUDE,
+        "panels": {r.key: rects[r.key] for r in panels},
+        "swatches": {r.key: rects[r.key] for r in swatches},
+    }
+    return atlas, index
+
+
+def check(atlas: Image.Image, index: dict, colors: dict | None = None) -> list:
+    """比对已烘焙的图集与索引：键集合与当前主题一致，且每个区域与运行时逐像素绘制结果相同。"""
+    from PIL import ImageChops
+
+    problems = []
+    if index.get("version") != INDEX_VERSION:
+        problems.append(f"索引版本 {index.get('version')} != {INDEX_VERSION}")
+    panels, swatches = baked_regions(colors)
+    for kind, expected in (("panels", panels), ("swatches", swatches)):
+        table = index.get(kind, {})
+        for key in sorted(set(table) - {r.key for r in expected}):
+            problems.append(f"{kind} {key}: 主题中已不再使用")
+        for region in expected:
+            rect = table.get(region.key)
+            if rect is None:
+                problems.append(f"{kind} {region.key}: 缺失")
+                continue
+            x, y, w, h = rect
+            if (w, h) != (region.width, region.height):
+                problems.append(f"{kind} {region.key}: 区域尺寸 {w}x{h} 与键不符")
+                continue
+            diff = ImageChops.difference(atlas.crop((x, y, x + w, y + h)), reference_region(region))
+            bbox = diff.getbbox(alpha_only=False)
+            if bbox:
+                problems.append(f"{kind} {region.key}: 区域内 {bbox} 与运行时绘制不一致")
+    return problems
+
+
+def main(argv=None) -> None:
+    import argparse
+    import json
+    import sys
+    import time
+
+    from asset_encode import encode_png
+
+    parser = argparse.ArgumentParser(description="预烘焙主题用到的九宫格面板框与纯色占位图到单张图集")
+    parser.add_argument("--check", action="store_true", help="只检查，不写文件；与当前主题或运行时绘制不一致时退出码 1")
+    opts = parser.parse_args(argv)
+    atlas_path, index_path = PROJECT_ROOT / ATLAS_REL, PROJECT_ROOT / INDEX_REL
+    t0 = time.perf_counter()
+    if opts.check:
+        from PIL import Image
+
+        if not (atlas_path.is_file() and index_path.is_file()):
+            print(f"未找到 {ATLAS_REL} / {INDEX_REL}，请先运行 python scripts/tools/ui_bake.py")
+            sys.exit(1)
+        with Image.open(atlas_path) as img:
+            atlas = img.convert("RGBA")
+        problems = check(atlas, json.loads(index_path.read_text(encoding="utf-8")))
+        for p in problems:
+            print(f"  {p}")
+        print(f"ui_bake: {len(problems)} 处不一致（{time.perf_counter() - t0:.2f}s）")
+        sys.exit(1 if problems else 0)
+    atlas, index = bake()
+    problems = check(atlas, index)
+    if problems:
+        for p in problems:
+            print(f"  {p}")
+        sys.exit(1)
+    atlas_path.parent.mkdir(parents=True, exist_ok=True)
+    data = encode_png(atlas)
+    text = json.dumps(index, indent=1) + "\n"
+    if not (atlas_path.is_file() and atlas_path.read_bytes() == data):
+        atlas_path.write_bytes(data)
+    if not (index_path.is_file() and index_path.read_text(encoding="utf-8") == text):
+        index_path.write_text(text, encoding="utf-8")
+    aw, ah = index["size"]
+    print(f"ui_bake: 面板框 {len(index['panels'])}、占位图 {len(index['swatches'])} -> {ATLAS_REL}（{aw}x{ah}，{len(data)} B）"
+          f"（{time.perf_counter() - t0:.2f}s）")
+
+
+if __name__ == "__main__":
+    main()
@@ -43,7 +43,7 @@ func configure(icon_path: String, color: Color, tip: String, _tooltip_popup = nu
 	_icon_rect = TextureRect.new()
 	var tex: Texture2D = null
 	if icon_path != "":
-		tex = VisualAssetRegistry.get_texture_cached(icon_path)
+		tex = VisualAssetRegistry.get_texture_for_size(icon_path, SLOT_SIZE)
 	if tex == null:
 		tex = VisualAssetRegistry.make_color_texture(color, Vector2i(SLOT_SIZE, SLOT_SIZE))
 	_icon_rect.texture = tex
@@ -91,7 +91,7 @@ func _add_entry(vbox: VBoxContainer, title: String, details: String, icon_path:
 	var icon_rect := TextureRect.new()
 	var tex: Texture2D = null
 	if icon_path != "":
-		tex = VisualAssetRegistry.get_texture_cached(icon_path)
+		tex = VisualAssetRegistry.get_texture_for_size(icon_path, ENTRY_ICON_SIZE)
 	if tex == null:
 		tex = VisualAssetRegistry.make_color_texture(BackpackSlot.PLACEHOLDER_COLOR, Vector2i(ENTRY_ICON_SIZE, ENTRY_ICON_SIZE))
 	icon_rect.texture = tex
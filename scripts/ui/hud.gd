@@ -126,7 +126,7 @@ func _apply_hud_module_backgrounds() -> void:
 
 ## [自定义] 返回 HUD 用 Panel 的 StyleBox（圆角边框+半透明背景），供 TopRow、金币等复用。
 func _make_hud_panel_style() -> StyleBox:
-	var tex := VisualAssetRegistry.make_panel_frame_texture(
+	var style := VisualAssetRegistry.make_panel_frame_stylebox(
 		Vector2i(48, 48),
 		Color(0.08, 0.09, 0.12, 0.85),
 		Color(0.25, 0.26, 0.30, 0.9),
@@ -134,8 +134,6 @@ func _make_hud_panel_style() -> StyleBox:
 		6
 	)
 	var theme_cfg := UiThemeConfig.load_theme()
-	var style := StyleBoxTexture.new()
-	style.texture = tex
 	style.expand_margin_left = theme_cfg.style_expand_margin_hud
 	style.expand_margin_right = theme_cfg.style_expand_margin_hud
 	style.expand_margin_top = theme_cfg.style_expand_margin_hud
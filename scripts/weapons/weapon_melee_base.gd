@@ -141,9 +141,9 @@ func _build_swing_visual() -> void:
 	var spr := Sprite2D.new()
 	spr.name = "SwingVisual"
 	var tex: Texture2D = null
-	# 动态加载：swing_texture_path 来自 @export 或 def，ResourceLoader.exists 校验后 load()，失败则用色块
-	if swing_texture_path != "" and ResourceLoader.exists(swing_texture_path):
-		tex = load(swing_texture_path) as Texture2D
+	# swing_texture_path 来自 @export 或 def，经 VisualAssetRegistry 缓存与资源索引加载，失败则用色块
+	if swing_texture_path != "":
+		tex = VisualAssetRegistry.get_texture_cached(swing_texture_path)
 	if tex == null:
 		tex = VisualAssetRegistry.make_color_texture(color_hint, swing_frame_size)
 	spr.texture = tex